@@ -1,14 +1,60 @@
-"""Exemplo básico de uso do Sales Agents usando Strands Agents."""
+"""Exemplo básico de uso do Sales Agents usando Strands Agents.
 
-import asyncio
+Invariante de cache de prompt: o prefixo enviado ao modelo (system prompt
+de cada agente + lista de tools) é montado uma única vez na criação do
+Swarm e não recebe dados por turno. Cada mensagem abaixo é enviada apenas
+como a tarefa do usuário, ao final do prompt, para que o cache de prefixo
+do provedor seja reaproveitado entre as mensagens. Ao alterar este exemplo,
+não interpole dados da conversa nos system prompts.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.config.settings import get_settings
+from src.models.conversation import ConversationStage
 from src.orchestrator.swarm_orchestrator import SwarmOrchestrator
+from src.utils.event_loop import run
 from src.utils.logger import configure_logging
-
-
-async def main():
-    """Exemplo de uso básico do sistema usando Strands Agents Swarm."""
+from src.utils.semantic_cache import SemanticCache
+
+
+@dataclass(slots=True)
+class TurnView:
+    """Visão tipada do resultado de um turno, extraída uma única vez."""
+
+    conversation_id: str
+    agent_id: str
+    stage: str
+    response: str
+    agents_used: Tuple[str, ...]
+    handoffs: int
+    cached: bool
+
+
+def _unpack_result(result: Dict[str, Any]) -> TurnView:
+    """Converte o dicionário retornado pelo orquestrador em um TurnView."""
+    metadata = result.get("metadata") or {}
+    telemetry = metadata.get("telemetry") or {}
+    return TurnView(
+        conversation_id=result.get("conversation_id", ""),
+        agent_id=result.get("agent_id", "unknown"),
+        stage=result.get("stage", "unknown"),
+        response=result.get("response", "No response"),
+        agents_used=tuple(telemetry.get("agents_used", ())),
+        handoffs=int(telemetry.get("total_handoffs", 0)),
+        cached=bool(result.get("cached")),
+    )
+
+
+async def main(fresh: bool = False):
+    """Exemplo de uso básico do sistema usando Strands Agents Swarm.
+
+    Args:
+        fresh: Descarta as respostas em cache de execuções anteriores
+    """
     # Configurar logging
     configure_logging(log_level="INFO")
 
@@ -18,6 +64,11 @@ async def main():
     # Criar orquestrador usando Strands Agents Swarm
     orchestrator = SwarmOrchestrator(settings=settings)
 
+    # Cache semântico: reexecuções do exemplo reutilizam respostas já geradas
+    cache = SemanticCache(backend="sqlite", threshold=0.95)
+    if fresh:
+        cache.clear()
+
     print("=" * 60)
     print("Sales Agents Ecosystem - Exemplo de Uso")
     print("Framework: Strands Agents")
@@ -34,36 +85,62 @@ async def main():
         "Sim, vamos prosseguir com a compra",
     ]
 
-    conversation_id = None
-
-    for i, message in enumerate(messages, 1):
-        print(f"\n[{i}] Usuário: {message}")
-        print("-" * 60)
-
+    async def run_turn(message: str, conversation_id: Optional[str]) -> Dict[str, Any]:
+        """Processa uma mensagem, consultando o cache semântico antes do Swarm."""
+        conversation = (
+            orchestrator.get_conversation(conversation_id) if conversation_id else None
+        )
+        stage = ConversationStage(
+            conversation.current_stage if conversation else ConversationStage.FAQ
+        ).value
+
+        cached = cache.get(stage, message)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        result = await orchestrator.process_message(
+            message,
+            conversation_id=conversation_id,
+        )
+        if "error" not in result:
+            cache.put(stage, message, result)
+        return result
+
+    # A conversa é criada antes dos turnos, então todos compartilham o mesmo
+    # conversation_id mesmo quando a primeira resposta vem do cache. Os turnos
+    # são sequenciais: cada um depende dos anteriores e o Swarm não aceita
+    # invocações concorrentes
+    conversation_id = (await orchestrator.create_conversation()).id
+    results: List[Any] = []
+    for message in messages:
         try:
-            result = await orchestrator.process_message(
-                message,
-                conversation_id=conversation_id,
-            )
-
-            conversation_id = result.get("conversation_id")
-            print(f"Agente: {result.get('agent_id', 'unknown')}")
-            print(f"Estágio: {result.get('stage', 'unknown')}")
-            print(f"Resposta: {result.get('response', 'No response')}")
+            results.append(await run_turn(message, conversation_id))
+        except Exception as e:
+            results.append(e)
+
+    # Cada turno é escrito de uma vez em vez de um print por linha
+    for i, (message, result) in enumerate(zip(messages, results), 1):
+        lines = [f"\n[{i}] Usuário: {message}", "-" * 60]
+
+        if isinstance(result, Exception):
+            lines.append(f"Erro: {str(result)}")
+        else:
+            view = _unpack_result(result)
+            if view.cached:
+                lines.append("(resposta do cache)")
+            lines += [
+                f"Agente: {view.agent_id}",
+                f"Estágio: {view.stage}",
+                f"Resposta: {view.response}",
+            ]
 
             # Mostrar telemetria do Swarm
-            metadata = result.get("metadata", {})
-            telemetry = metadata.get("telemetry", {})
-            if telemetry:
-                agents_used = telemetry.get("agents_used", [])
-                if agents_used:
-                    print(f"Agentes usados: {', '.join(agents_used)}")
-                handoffs = telemetry.get("total_handoffs", 0)
-                if handoffs > 0:
-                    print(f"Handoffs realizados: {handoffs}")
+            if view.agents_used:
+                lines.append(f"Agentes usados: {', '.join(view.agents_used)}")
+            if view.handoffs > 0:
+                lines.append(f"Handoffs realizados: {view.handoffs}")
 
-        except Exception as e:
-            print(f"Erro: {str(e)}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print("\n" + "=" * 60)
     print("Conversa finalizada!")
@@ -77,6 +154,15 @@ async def main():
     print(f"Vendas fechadas: {metrics.get('closed_sales', 0)}")
     print(f"Taxa de conversão: {metrics.get('sales_conversion_rate', 0):.2f}%")
 
+    await orchestrator.aclose()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="ignora o cache de respostas de execuções anteriores",
+    )
+    args = parser.parse_args()
+    run(main(fresh=args.fresh))
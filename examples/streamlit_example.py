@@ -3,41 +3,18 @@
 import streamlit as st
 import httpx
 import json
-import pandas as pd
 import os
+import socket
+from collections import Counter
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 # Configuração da API
 VERIFY_SSL = os.getenv("VERIFY_SSL", "true").lower() not in ("false", "0", "no", "off")
+DEFAULT_API_BASE_URL = "http://localhost:8000"
 
-def check_server(port: int) -> bool:
-    """Verifica se o servidor está respondendo na porta."""
-    try:
-        response = httpx.get(f"http://localhost:{port}/health", timeout=1.0, verify=VERIFY_SSL)
-        return response.status_code == 200
-    except:
-        return False
-
-def get_api_base_url() -> str:
-    """Detecta automaticamente a porta do servidor."""
-    if check_server(8000):
-        return "http://localhost:8000"
-    elif check_server(8004):
-        return "http://localhost:8004"
-    else:
-        return "http://localhost:8000"  # Default
-
-# Configuração da página
-st.set_page_config(
-    page_title="Sales Agents - Swarm Chat",
-    page_icon="🤖",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-# CSS customizado para melhorar a aparência
-st.markdown("""
+# Conteúdo estático (CSS e descrição dos agentes), definido uma vez no módulo
+_CSS = """
 <style>
     /* Estilo geral */
     .main .block-container {
@@ -104,11 +81,210 @@ st.markdown("""
         margin-top: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_AGENTS_MD = """Este chat utiliza um **Swarm de agentes especializados**:
+
+- **🔍 Researcher**: Coleta informações do cliente automaticamente
+- **💼 Sales Agent**: Agente principal de vendas
+- **✅ Qualification**: Avalia fit usando metodologia BANT
+- **📊 Presentation**: Apresenta soluções personalizadas
+- **🤝 Negotiation**: Trata objeções e negocia termos
+- **🎯 Closing**: Finaliza vendas e coleta informações
+
+Os agentes colaboram **autonomamente** através do Swarm!
+"""
+
+@st.cache_resource
+def get_client(base_url: str) -> httpx.Client:
+    """Cliente HTTP com pool de conexões keep-alive, reutilizado entre reruns."""
+    return httpx.Client(
+        base_url=base_url,
+        verify=VERIFY_SSL,
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+    )
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def fetch_metrics(base_url: str) -> Optional[dict]:
+    """Busca /metrics (None se indisponível), reaproveitando o resultado por 2s."""
+    response = get_client(base_url).get("/metrics", timeout=5.0)
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+@st.cache_data(ttl=5.0, show_spinner=False)
+def check_server(port: int) -> bool:
+    """Verifica se há um servidor escutando na porta (conexão TCP, sem HTTP).
+
+    Erros de saúde do servidor aparecem na primeira requisição real.
+    """
+    try:
+        with socket.create_connection(("localhost", port), timeout=0.1):
+            return True
+    except OSError:
+        return False
+
+@st.cache_data(ttl=5.0, show_spinner=False)
+def get_api_base_url() -> Optional[str]:
+    """Detecta automaticamente a porta do servidor (None se nenhuma responder)."""
+    if check_server(8000):
+        return "http://localhost:8000"
+    elif check_server(8004):
+        return "http://localhost:8004"
+    return None
+
+def stream_chat(payload: dict, final: dict) -> Iterator[str]:
+    """Consome o SSE de /chat/stream, gerando os trechos de texto da resposta.
+
+    O evento final (``done``), com o mesmo conteúdo de /chat, é copiado para ``final``.
+    """
+    with get_client(API_BASE_URL).stream("POST", "/chat/stream", json=payload) as response:
+        if response.is_error:
+            response.read()
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            event_type = event.get("type")
+            if event_type == "delta":
+                yield event.get("delta", "")
+            elif event_type == "done":
+                final.update(event)
+            elif event_type == "error":
+                raise RuntimeError(event.get("error", "Erro ao processar mensagem"))
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def build_dashboard_tables(
+    metrics: dict,
+) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+    """Monta as tabelas do dashboard a partir do payload de /metrics.
+
+    As tabelas são listas de dicts, aceitas diretamente por ``st.dataframe`` e
+    ``st.bar_chart``. Os valores são mantidos numéricos; a formatação
+    (%, segundos) é aplicada apenas na exibição via ``column_config``.
+
+    Returns:
+        Linhas de etapas, agentes, tempo por etapa e transições
+    """
+    conversion_rates = metrics.get("conversion_rates_by_stage", {})
+    stages_rows = [
+        {
+            "Etapa": stage.upper(),
+            "Conversas": count,
+            "Taxa de Conversão": float(conversion_rates.get(stage, 0.0)),
+        }
+        for stage, count in metrics.get("conversations_by_stage", {}).items()
+    ]
+
+    agents_rows = [
+        {"Agente": agent, "Uso": count}
+        for agent, count in Counter(metrics.get("agents_usage", {})).most_common()
+    ]
+
+    time_rows = [
+        {"Etapa": stage.upper(), "Tempo Médio (s)": seconds}
+        for stage, seconds in metrics.get("average_time_by_stage", {}).items()
+    ]
+
+    transitions_rows = [
+        {"Transição": transition, "Ocorrências": count}
+        for transition, count in Counter(metrics.get("stage_transitions", {})).most_common()
+    ]
+
+    return stages_rows, agents_rows, time_rows, transitions_rows
+
+def render_telemetry(telemetry: dict) -> None:
+    """Exibe os detalhes de execução do Swarm para uma resposta do assistente."""
+    with st.expander("📊 Detalhes da Execução", expanded=False):
+        # Informações principais em colunas
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            agent_id = telemetry.get("agent_id", "swarm")
+            st.metric("🤖 Agente", agent_id)
+        
+        with col2:
+            stage = telemetry.get("stage", "N/A")
+            st.metric("📊 Estágio", stage.upper())
+        
+        with col3:
+            status = telemetry.get("status", "completed")
+            status_emoji = "✅" if status == "completed" else "⏳"
+            st.metric("Status", f"{status_emoji} {status}")
+        
+        st.markdown("---")
+        
+        # Agentes envolvidos
+        agents_used = telemetry.get("agents_used", [])
+        if agents_used:
+            st.markdown("**🔄 Agentes Envolvidos:**")
+            agent_badges = " ".join([f"`{agent}`" for agent in agents_used])
+            st.markdown(agent_badges)
+            
+            total_handoffs = telemetry.get("total_handoffs", 0)
+            if total_handoffs > 0:
+                st.caption(f"🔀 **Handoffs realizados:** {total_handoffs}")
+        
+        # Tools usadas
+        tools_used = telemetry.get("tools_used", [])
+        if tools_used:
+            st.markdown("**🔧 Tools Utilizadas:**")
+            tool_badges = " ".join([f"`{tool}`" for tool in tools_used])
+            st.markdown(tool_badges)
+        
+        # Métricas de performance
+        execution_time = telemetry.get("execution_time", 0)
+        execution_count = telemetry.get("execution_count", 0)
+        if execution_time > 0 or execution_count > 0:
+            col_perf1, col_perf2 = st.columns(2)
+            with col_perf1:
+                st.metric("⏱️ Tempo", f"{execution_time}ms")
+            with col_perf2:
+                st.metric("🔄 Iterações", execution_count)
+        
+        # Uso de tokens
+        usage = telemetry.get("accumulated_usage", {})
+        if usage:
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            total_tokens = input_tokens + output_tokens
+            
+            if total_tokens > 0:
+                col_tok1, col_tok2, col_tok3 = st.columns(3)
+                with col_tok1:
+                    st.metric("📥 Input", f"{input_tokens:,}")
+                with col_tok2:
+                    st.metric("📤 Output", f"{output_tokens:,}")
+                with col_tok3:
+                    st.metric("📊 Total", f"{total_tokens:,}")
+        
+        # Node history
+        node_history = telemetry.get("node_history", [])
+        if node_history:
+            st.markdown("**📜 Histórico de Execução:**")
+            for node in node_history:
+                node_id = node.get("node_id", "unknown")
+                node_status = node.get("status", "unknown")
+                status_icon = "✅" if node_status == "completed" else "⏳"
+                st.text(f"{status_icon} {node_id} ({node_status})")
+
+# Configuração da página
+st.set_page_config(
+    page_title="Sales Agents - Swarm Chat",
+    page_icon="🤖",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+# CSS customizado para melhorar a aparência
+st.markdown(_CSS, unsafe_allow_html=True)
 
-# Detectar API
-API_BASE_URL = get_api_base_url()
-server_status = check_server(8000) or check_server(8004)
+# Detectar API (uma única sondagem por rerun, reaproveitada por 5s)
+detected_api_url = get_api_base_url()
+server_status = detected_api_url is not None
+API_BASE_URL = detected_api_url or DEFAULT_API_BASE_URL
 
 # Header principal
 col_header1, col_header2 = st.columns([3, 1])
@@ -165,24 +341,14 @@ with st.sidebar:
     # Informações sobre agentes
     st.markdown("### 🤖 Agentes do Swarm")
     with st.expander("Ver detalhes", expanded=False):
-        st.markdown("""
-        Este chat utiliza um **Swarm de agentes especializados**:
-        
-        - **🔍 Researcher**: Coleta informações do cliente automaticamente
-        - **💼 Sales Agent**: Agente principal de vendas
-        - **✅ Qualification**: Avalia fit usando metodologia BANT
-        - **📊 Presentation**: Apresenta soluções personalizadas
-        - **🤝 Negotiation**: Trata objeções e negocia termos
-        - **🎯 Closing**: Finaliza vendas e coleta informações
-        
-        Os agentes colaboram **autonomamente** através do Swarm!
-        """)
+        st.markdown(_AGENTS_MD)
     
     st.markdown("---")
     
     # Ações rápidas
     st.markdown("### 🔧 Ações")
     if st.button("🔄 Atualizar", use_container_width=True):
+        st.cache_data.clear()
         st.rerun()
     
     if st.button("🗑️ Limpar Chat", use_container_width=True):
@@ -197,7 +363,9 @@ with st.sidebar:
 tab1, tab2 = st.tabs(["💬 Chat", "📊 Dashboard de Métricas"])
 
 # Tab 1: Chat
-with tab1:
+@st.fragment
+def chat_fragment() -> None:
+    """Histórico e input do chat, reexecutados sem recarregar a página inteira."""
     if not server_status:
         st.warning("⚠️ **Servidor não está respondendo**")
         st.info("""
@@ -233,79 +401,7 @@ with tab1:
                     if role == "assistant" and idx in st.session_state.telemetry:
                         telemetry = st.session_state.telemetry[idx]
                         
-                        # Container de telemetria
-                        with st.expander("📊 Detalhes da Execução", expanded=False):
-                            # Informações principais em colunas
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                agent_id = telemetry.get("agent_id", "swarm")
-                                st.metric("🤖 Agente", agent_id)
-                            
-                            with col2:
-                                stage = telemetry.get("stage", "N/A")
-                                st.metric("📊 Estágio", stage.upper())
-                            
-                            with col3:
-                                status = telemetry.get("status", "completed")
-                                status_emoji = "✅" if status == "completed" else "⏳"
-                                st.metric("Status", f"{status_emoji} {status}")
-                            
-                            st.markdown("---")
-                            
-                            # Agentes envolvidos
-                            agents_used = telemetry.get("agents_used", [])
-                            if agents_used:
-                                st.markdown("**🔄 Agentes Envolvidos:**")
-                                agent_badges = " ".join([f"`{agent}`" for agent in agents_used])
-                                st.markdown(agent_badges)
-                                
-                                total_handoffs = telemetry.get("total_handoffs", 0)
-                                if total_handoffs > 0:
-                                    st.caption(f"🔀 **Handoffs realizados:** {total_handoffs}")
-                            
-                            # Tools usadas
-                            tools_used = telemetry.get("tools_used", [])
-                            if tools_used:
-                                st.markdown("**🔧 Tools Utilizadas:**")
-                                tool_badges = " ".join([f"`{tool}`" for tool in tools_used])
-                                st.markdown(tool_badges)
-                            
-                            # Métricas de performance
-                            execution_time = telemetry.get("execution_time", 0)
-                            execution_count = telemetry.get("execution_count", 0)
-                            if execution_time > 0 or execution_count > 0:
-                                col_perf1, col_perf2 = st.columns(2)
-                                with col_perf1:
-                                    st.metric("⏱️ Tempo", f"{execution_time}ms")
-                                with col_perf2:
-                                    st.metric("🔄 Iterações", execution_count)
-                            
-                            # Uso de tokens
-                            usage = telemetry.get("accumulated_usage", {})
-                            if usage:
-                                input_tokens = usage.get("input_tokens", 0)
-                                output_tokens = usage.get("output_tokens", 0)
-                                total_tokens = input_tokens + output_tokens
-                                
-                                if total_tokens > 0:
-                                    col_tok1, col_tok2, col_tok3 = st.columns(3)
-                                    with col_tok1:
-                                        st.metric("📥 Input", f"{input_tokens:,}")
-                                    with col_tok2:
-                                        st.metric("📤 Output", f"{output_tokens:,}")
-                                    with col_tok3:
-                                        st.metric("📊 Total", f"{total_tokens:,}")
-                            
-                            # Node history
-                            node_history = telemetry.get("node_history", [])
-                            if node_history:
-                                st.markdown("**📜 Histórico de Execução:**")
-                                for node in node_history:
-                                    node_id = node.get("node_id", "unknown")
-                                    node_status = node.get("status", "unknown")
-                                    status_icon = "✅" if node_status == "completed" else "⏳"
-                                    st.text(f"{status_icon} {node_id} ({node_status})")
+                        render_telemetry(telemetry)
 
     # Input do usuário
     if prompt := st.chat_input("Digite sua mensagem aqui..."):
@@ -320,28 +416,30 @@ with tab1:
                 st.markdown(prompt)
             
             # Processar com o assistente
+            started_conversation = False
             with st.chat_message("assistant"):
                 with st.spinner("🤖 Processando com Swarm..."):
                     try:
-                        # Chamar API
-                        response = httpx.post(
-                            f"{API_BASE_URL}/chat",
-                            json={
+                        # Chamar API em streaming: o texto aparece conforme é gerado
+                        data: dict = {}
+                        streamed_text = st.write_stream(stream_chat(
+                            {
                                 "message": prompt,
                                 "conversation_id": st.session_state.conversation_id,
                             },
-                            timeout=60.0,
-                            verify=VERIFY_SSL,
-                        )
-                        response.raise_for_status()
-                        data = response.json()
+                            data,
+                        ))
+                        if not data:
+                            raise RuntimeError("Streaming encerrado sem resposta final do servidor")
                         
                         # Atualizar conversation_id
                         if not st.session_state.conversation_id:
                             st.session_state.conversation_id = data["conversation_id"]
+                            started_conversation = True
                         
-                        # Exibir resposta
-                        st.markdown(data["response"])
+                        # Exibir resposta (caso nenhum trecho tenha sido transmitido)
+                        if not streamed_text:
+                            st.markdown(data["response"])
                         
                         # Extrair telemetria
                         metadata = data.get("metadata", {})
@@ -357,12 +455,12 @@ with tab1:
                             "node_history": metadata.get("node_history", []),
                         }
                         
-                        # Extrair tools usadas
-                        tools_used = []
-                        for node in telemetry_data.get("node_history", []):
-                            if "tools" in node:
-                                tools_used.extend(node.get("tools", []))
-                        telemetry_data["tools_used"] = list(set(tools_used))
+                        # Extrair tools usadas (sem duplicatas, na ordem de uso)
+                        telemetry_data["tools_used"] = list(dict.fromkeys(
+                            tool
+                            for node in telemetry_data["node_history"]
+                            for tool in node.get("tools", ())
+                        ))
                         
                         # Adicionar à conversa
                         message_index = len(st.session_state.messages)
@@ -374,8 +472,12 @@ with tab1:
                             "metadata": metadata,
                         })
                         
+                        # A próxima execução do dashboard busca métricas atualizadas
+                        fetch_metrics.clear()
+                        
                         # Armazenar telemetria
                         st.session_state.telemetry[message_index] = telemetry_data
+                        render_telemetry(telemetry_data)
                         
                     except httpx.ConnectError:
                         st.error("❌ **Erro de conexão**")
@@ -394,12 +496,19 @@ with tab1:
                     except Exception as e:
                         st.error(f"❌ **Erro inesperado**")
                         st.exception(e)
-            
-            # Rerun para atualizar a interface
-            st.rerun()
+
+            # A sidebar (ID da conversa, mensagens, "Nova Conversa") fica fora do
+            # fragmento: ao iniciar uma conversa, a página inteira é reexecutada
+            if started_conversation:
+                st.rerun(scope="app")
+
+with tab1:
+    chat_fragment()
 
 # Tab 2: Dashboard de Métricas
-with tab2:
+@st.fragment(run_every="5s")
+def dashboard_fragment() -> None:
+    """Dashboard de métricas, atualizado automaticamente a cada 5 segundos."""
     st.header("📊 Dashboard de Métricas de Conversão")
     st.markdown("Métricas em tempo real do sistema de vendas")
     
@@ -407,17 +516,12 @@ with tab2:
         st.warning("⚠️ Servidor não está disponível. Métricas não podem ser carregadas.")
     else:
         try:
-            # Buscar métricas da API
+            # Busca síncrona com cache curto: o painel sempre mostra o resultado
+            # desta execução, e reexecuções próximas não repetem a requisição
             with st.spinner("Carregando métricas..."):
-                metrics_response = httpx.get(
-                    f"{API_BASE_URL}/metrics",
-                    timeout=5.0,
-                    verify=VERIFY_SSL
-                )
+                metrics = fetch_metrics(API_BASE_URL)
             
-            if metrics_response.status_code == 200:
-                metrics = metrics_response.json()
-                
+            if metrics is not None:
                 # Métricas principais em cards
                 st.markdown("### 📈 Métricas Principais")
                 col1, col2, col3, col4 = st.columns(4)
@@ -457,35 +561,24 @@ with tab2:
                 
                 st.markdown("---")
                 
+                # Tabelas do dashboard (construídas uma vez por snapshot de métricas)
+                stages_rows, agents_rows, time_rows, transitions_rows = build_dashboard_tables(metrics)
+                
                 # Conversões por etapa
                 st.markdown("### 📈 Funil de Conversão por Etapa")
-                conversions_by_stage = metrics.get("conversations_by_stage", {})
-                conversion_rates = metrics.get("conversion_rates_by_stage", {})
                 
-                if conversions_by_stage:
-                    # Tabela
-                    stages_data = []
-                    for stage, count in conversions_by_stage.items():
-                        rate = conversion_rates.get(stage, 0.0)
-                        stages_data.append({
-                            "Etapa": stage.upper(),
-                            "Conversas": count,
-                            "Taxa de Conversão": f"{rate:.1f}%"
-                        })
-                    
-                    df_stages = pd.DataFrame(stages_data)
+                if stages_rows:
                     st.dataframe(
-                        df_stages,
+                        stages_rows,
+                        hide_index=True,
                         use_container_width=True,
-                        hide_index=True
+                        column_config={
+                            "Taxa de Conversão": st.column_config.NumberColumn(format="%.1f%%"),
+                        },
                     )
                     
                     # Gráfico de barras
-                    if len(stages_data) > 0:
-                        chart_data = pd.DataFrame({
-                            "Conversas": [d["Conversas"] for d in stages_data],
-                        }, index=[d["Etapa"] for d in stages_data])
-                        st.bar_chart(chart_data, use_container_width=True)
+                    st.bar_chart(stages_rows, x="Etapa", y="Conversas", use_container_width=True)
                 else:
                     st.info("Nenhuma métrica de etapa disponível ainda.")
                 
@@ -493,29 +586,12 @@ with tab2:
                 
                 # Uso de agentes
                 st.markdown("### 🤖 Uso de Agentes")
-                agents_usage = metrics.get("agents_usage", {})
                 
-                if agents_usage:
-                    agents_data = []
-                    for agent, count in sorted(agents_usage.items(), key=lambda x: x[1], reverse=True):
-                        agents_data.append({
-                            "Agente": agent,
-                            "Uso": count
-                        })
-                    
-                    df_agents = pd.DataFrame(agents_data)
-                    st.dataframe(
-                        df_agents,
-                        use_container_width=True,
-                        hide_index=True
-                    )
+                if agents_rows:
+                    st.dataframe(agents_rows, hide_index=True, use_container_width=True)
                     
                     # Gráfico de barras
-                    if len(agents_data) > 0:
-                        chart_data = pd.DataFrame({
-                            "Uso": [d["Uso"] for d in agents_data],
-                        }, index=[d["Agente"] for d in agents_data])
-                        st.bar_chart(chart_data, use_container_width=True)
+                    st.bar_chart(agents_rows, x="Agente", y="Uso", use_container_width=True)
                 else:
                     st.info("Nenhuma métrica de agente disponível ainda.")
                 
@@ -523,21 +599,15 @@ with tab2:
                 
                 # Tempo médio por etapa
                 st.markdown("### ⏱️ Performance por Etapa")
-                avg_time_by_stage = metrics.get("average_time_by_stage", {})
                 
-                if avg_time_by_stage:
-                    time_data = []
-                    for stage, avg_time in avg_time_by_stage.items():
-                        time_data.append({
-                            "Etapa": stage.upper(),
-                            "Tempo Médio (s)": f"{avg_time:.2f}"
-                        })
-                    
-                    df_time = pd.DataFrame(time_data)
+                if time_rows:
                     st.dataframe(
-                        df_time,
+                        time_rows,
+                        hide_index=True,
                         use_container_width=True,
-                        hide_index=True
+                        column_config={
+                            "Tempo Médio (s)": st.column_config.NumberColumn(format="%.2f"),
+                        },
                     )
                 else:
                     st.info("Nenhuma métrica de tempo disponível ainda.")
@@ -546,22 +616,9 @@ with tab2:
                 
                 # Transições de etapa
                 st.markdown("### 🔄 Transições entre Etapas")
-                transitions = metrics.get("stage_transitions", {})
                 
-                if transitions:
-                    transitions_data = []
-                    for transition, count in sorted(transitions.items(), key=lambda x: x[1], reverse=True):
-                        transitions_data.append({
-                            "Transição": transition,
-                            "Ocorrências": count
-                        })
-                    
-                    df_transitions = pd.DataFrame(transitions_data)
-                    st.dataframe(
-                        df_transitions,
-                        use_container_width=True,
-                        hide_index=True
-                    )
+                if transitions_rows:
+                    st.dataframe(transitions_rows, hide_index=True, use_container_width=True)
                 else:
                     st.info("Nenhuma métrica de transição disponível ainda.")
                 
@@ -586,3 +643,6 @@ with tab2:
         except Exception as e:
             st.error(f"❌ Erro ao buscar métricas: {str(e)}")
             st.info("Métricas disponíveis apenas quando usando Swarm Orchestrator (USE_SWARM=true)")
+
+with tab2:
+    dashboard_fragment()
@@ -1,15 +1,24 @@
 """Test script for Strands Agent integration."""
 
-import asyncio
 from pathlib import Path
 
 from src.agents.strands_agent import StrandsAgentWrapper
 from src.config.settings import get_settings
 from src.models.conversation import Conversation, ConversationStage, MessageRole
+from src.utils.event_loop import run
 from src.utils.llm_client import LLMClient
 from src.utils.logger import configure_logging
 
 
+async def warmup(agent: StrandsAgentWrapper) -> None:
+    """Send a throwaway prompt so one-time client setup is not timed."""
+    await agent.process(
+        ".",
+        Conversation(id="_warm", current_stage=ConversationStage.FAQ),
+        {},
+    )
+
+
 async def test_sales_agent():
     """Test sales agent with sample conversation."""
     configure_logging()
@@ -30,6 +39,12 @@ async def test_sales_agent():
     )
     print(f"✅ Agente carregado: {agent.config.agent_id}")
 
+    # Warm up LLM client (auth, connection pool) before the test messages
+    try:
+        await warmup(agent)
+    except Exception as e:
+        print(f"⚠️  Warmup falhou: {str(e)}")
+
     # Create test conversation
     conversation = Conversation(
         id="test_conv_001",
@@ -53,16 +68,11 @@ async def test_sales_agent():
             print(f"🤖 Agente ({result.get('source', 'unknown')}): {result.get('response', '')}")
             print(f"   Metadata: {result.get('metadata', {})}")
 
-            # Add message to conversation
-            conversation.add_message(
-                role=MessageRole.USER,
-                content=message,
-            )
-            conversation.add_message(
-                role=MessageRole.AGENT,
-                content=result.get("response", ""),
-                agent_id=agent.config.agent_id,
-            )
+            # Add both turns to the conversation at once
+            conversation.add_messages([
+                (MessageRole.USER, message, None),
+                (MessageRole.AGENT, result.get("response", ""), agent.config.agent_id),
+            ])
 
         except Exception as e:
             print(f"❌ Erro: {str(e)}")
@@ -71,5 +81,5 @@ async def test_sales_agent():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_sales_agent())
+    run(test_sales_agent())
 
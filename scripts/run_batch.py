@@ -0,0 +1,63 @@
+"""Script to process sales messages offline through the OpenAI Batch API.
+
+Input is a JSONL file with one {"cnpj": ..., "message": ...} object per line;
+results are written as JSONL, in the same order, to --output (or stdout).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.agents.swarm_sales_agent import SwarmSalesAgent
+from src.config.settings import get_settings
+from src.utils.event_loop import run
+from src.utils.logger import configure_logging
+
+
+def read_items(path: Path) -> List[Tuple[str, str]]:
+    """Read (CNPJ, message) pairs from a JSONL file."""
+    items = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                items.append((record["cnpj"], record["message"]))
+    return items
+
+
+async def main(input_path: Path, output_path: Optional[Path], poll_interval: float) -> None:
+    """Submit the batch, wait for it and write the results."""
+    configure_logging()
+    items = read_items(input_path)
+    print(f"📦 Enviando {len(items)} mensagens para a Batch API...", file=sys.stderr)
+
+    agent = SwarmSalesAgent.get_or_create(get_settings())
+    try:
+        results = await agent.process_batch(items, poll_interval=poll_interval)
+    finally:
+        await agent.release()
+
+    output = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+    if output_path:
+        output_path.write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output)
+
+    failed = sum(result["status"] != "completed" for result in results)
+    print(f"✅ {len(results) - failed} concluídas, {failed} com falha", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="arquivo JSONL com cnpj e message por linha")
+    parser.add_argument("-o", "--output", type=Path, help="arquivo JSONL de saída (padrão: stdout)")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="segundos entre consultas ao status do batch (padrão: 30)",
+    )
+    args = parser.parse_args()
+    run(main(args.input, args.output, args.poll_interval))
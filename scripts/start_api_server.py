@@ -2,47 +2,58 @@
 
 import os
 import socket
+import subprocess
 import sys
-from typing import Tuple
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, Optional, Tuple
 import uvicorn
 
 from src.config.settings import get_settings
 from src.utils.logger import configure_logging
 
 
-def get_port_from_process(port: int) -> str:
-    """Try to identify which process is using the port (Windows)."""
+@lru_cache(maxsize=1)
+def _scan_listening_ports() -> Dict[int, str]:
+    """Map listening TCP ports to PIDs from a single `netstat -ano` run (Windows)."""
+    listening: Dict[int, str] = {}
     try:
-        import subprocess
-        # Try to find process using netstat (Windows)
         result = subprocess.run(
             ["netstat", "-ano"],
             capture_output=True,
             text=True,
             timeout=2
         )
-        for line in result.stdout.split('\n'):
-            if f":{port}" in line and "LISTENING" in line:
-                parts = line.split()
-                if len(parts) > 4:
-                    pid = parts[-1]
-                    try:
-                        # Try to get process name
-                        task_result = subprocess.run(
-                            ["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV", "/NH"],
-                            capture_output=True,
-                            text=True,
-                            timeout=2
-                        )
-                        if task_result.stdout:
-                            proc_name = task_result.stdout.split(',')[0].strip('"')
-                            return f"PID {pid} ({proc_name})"
-                    except:
-                        pass
-                    return f"PID {pid}"
+    except Exception:
+        return listening
+    for line in result.stdout.split('\n'):
+        parts = line.split()
+        if len(parts) > 4 and parts[3] == "LISTENING":
+            _, _, local_port = parts[1].rpartition(":")
+            if local_port.isdigit():
+                listening.setdefault(int(local_port), parts[-1])
+    return listening
+
+
+def get_port_from_process(port: int) -> str:
+    """Try to identify which process is using the port (Windows)."""
+    pid = _scan_listening_ports().get(port)
+    if pid is None:
+        return "processo desconhecido"
+    try:
+        # Try to get process name
+        task_result = subprocess.run(
+            ["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV", "/NH"],
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+        if task_result.stdout:
+            proc_name = task_result.stdout.split(',')[0].strip('"')
+            return f"PID {pid} ({proc_name})"
     except Exception:
         pass
-    return "processo desconhecido"
+    return f"PID {pid}"
 
 
 def is_port_available(port: int) -> Tuple[bool, str]:
@@ -56,8 +67,14 @@ def is_port_available(port: int) -> Tuple[bool, str]:
             return False, process_info
 
 
-def find_available_port(start_port: int, max_attempts: int = 5) -> Tuple[int, str]:
-    """Find an available port starting from start_port."""
+def find_available_port(start_port: int, max_attempts: int = 5) -> Tuple[Optional[int], str]:
+    """Find an available port starting from start_port.
+
+    Each candidate is probed exactly once; a returned port was free when probed.
+    Returns (None, process_info) if no candidate is free, with the process
+    info of the first port.
+    """
+    first_process_info = ""
     for i in range(max_attempts):
         port = start_port + i
         available, process_info = is_port_available(port)
@@ -65,8 +82,8 @@ def find_available_port(start_port: int, max_attempts: int = 5) -> Tuple[int, st
             return port, ""
         if i == 0:
             # Only show process info for the first port
-            return port, process_info
-    return None, ""
+            first_process_info = process_info
+    return None, first_process_info
 
 
 if __name__ == "__main__":
@@ -112,7 +129,7 @@ if __name__ == "__main__":
         
         # Try to find alternative port
         alt_port, _ = find_available_port(8004, max_attempts=3)
-        if alt_port and is_port_available(alt_port)[0]:
+        if alt_port:
             print(f"✅ Usando porta alternativa: {alt_port}")
             port = alt_port
         else:
@@ -128,8 +145,27 @@ if __name__ == "__main__":
         port = default_port
         print(f"✅ Usando porta {port}")
 
+    # Auto-reload só em desenvolvimento (UVICORN_RELOAD=true); em produção,
+    # UVICORN_WORKERS define o número de processos (ignorado com reload)
+    reload = os.getenv("UVICORN_RELOAD", "false").lower() in ("true", "1", "yes", "on")
+    try:
+        workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    except ValueError:
+        print("⚠️  UVICORN_WORKERS inválido, usando 1 worker")
+        workers = 1
+
     print(f"📡 Servidor iniciando em http://localhost:{port}")
     print(f"📚 Documentação disponível em http://localhost:{port}/docs")
+    # Mesma escolha que loop="auto"/http="auto" fazem no uvicorn.run abaixo
+    loop_name = "uvloop" if find_spec("uvloop") else "asyncio"
+    http_name = "httptools" if find_spec("httptools") else "h11"
+    print(f"⚙️  Event loop: {loop_name} | HTTP parser: {http_name}")
+    if loop_name == "asyncio" or http_name == "h11":
+        print('   Para uvloop + httptools: pip install -e ".[server]"')
+    if reload:
+        print("🔄 Auto-reload ativado (UVICORN_RELOAD)")
+    elif workers > 1:
+        print(f"👷 {workers} workers (conversas ficam em memória em cada worker)")
     print("=" * 60)
     
     try:
@@ -137,8 +173,15 @@ if __name__ == "__main__":
             "src.api.server:app",
             host="0.0.0.0",
             port=port,
-            reload=True,
+            reload=reload,
+            workers=None if reload else workers,
             log_level="info",
+            # "auto" usa uvloop e httptools quando instalados e cai para
+            # asyncio/h11 caso contrário (ex.: Windows). Ambos já ativam
+            # TCP_NODELAY nas conexões aceitas, e os workers compartilham o
+            # socket do processo principal, sem precisar de SO_REUSEPORT
+            loop="auto",
+            http="auto",
         )
     except KeyboardInterrupt:
         print("\n\n🛑 Servidor encerrado pelo usuário")
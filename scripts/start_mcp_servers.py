@@ -1,12 +1,14 @@
 """Script to start MCP HTTP servers."""
 
 import asyncio
+import signal
 
 from src.config.settings import get_settings
 from src.mcp_servers.http_server import start_mcp_servers
 from src.mcp_servers.mock_analytics_server import MockAnalyticsServer
 from src.mcp_servers.mock_catalog_server import MockCatalogServer
 from src.mcp_servers.mock_crm_server import MockCRMServer
+from src.utils.event_loop import run
 from src.utils.logger import configure_logging
 
 
@@ -45,10 +47,19 @@ async def main():
     print("\nPress Ctrl+C to stop...")
     print("=" * 60)
 
+    # Keep servers running until SIGINT/SIGTERM
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
     try:
-        # Keep servers running
-        await asyncio.Event().wait()
-    except KeyboardInterrupt:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+    except NotImplementedError:
+        # Windows: Ctrl+C cancels the wait below instead
+        pass
+
+    try:
+        await stop.wait()
+    finally:
         print("\nStopping servers...")
         for server in servers:
             await server.stop()
@@ -56,5 +67,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
 
@@ -1,5 +1,21 @@
 """Sales agents module using Strands Agents."""
 
-from src.agents.swarm_sales_agent import SwarmSalesAgent
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.agents.swarm_sales_agent import SwarmSalesAgent
 
 __all__ = ["SwarmSalesAgent"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import SwarmSalesAgent (and Strands) only when it is first accessed.
+
+    Keeps ``import src.agents.mcp_tools`` and other submodules free of the
+    Strands import cost.
+    """
+    if name == "SwarmSalesAgent":
+        from src.agents.swarm_sales_agent import SwarmSalesAgent
+
+        return SwarmSalesAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,52 @@
 """MCP Tools integration for dynamic tool calls."""
 
+import asyncio
+
 import httpx
+from difflib import get_close_matches
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
+from src.mcp_servers.base_mcp import MCPTransportError
 from src.models.agent_config import MCPTool
 from src.utils.logger import LoggerMixin
 
+# Faster JSON decoding of MCP responses when orjson is installed
+# (pip install -e ".[speedups]")
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# HTTP/2 needs the optional h2 package (pip install -e ".[http2]"); it is
+# negotiated via ALPN, so it only applies to https:// MCP servers
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Mock MCP server registered for each port (see MCPServerFactory)
+_PORT_TO_SERVER: Dict[int, str] = {
+    8001: "mock_crm",
+    8002: "mock_catalog",
+    8003: "mock_analytics",
+    8005: "mock_ifood",
+    8006: "mock_restaurant",
+    8007: "mock_recommendation",
+    8008: "mock_contract",
+    8009: "mock_pricing",
+    8010: "mock_qualification",
+}
+
+
+@lru_cache(maxsize=64)
+def _server_name_for_url(url: str) -> str:
+    """Map an MCP server URL to its server name by port."""
+    try:
+        port = urlsplit(url).port
+    except ValueError:
+        return "unknown"
+    return _PORT_TO_SERVER.get(port, "unknown")
+
 
 class MCPTools(LoggerMixin):
     """Manager for MCP tools integration with support for multiple servers."""
@@ -24,14 +65,56 @@ class MCPTools(LoggerMixin):
             servers: Optional dict of MCP server instances (for direct calls)
         """
         self.tools: Dict[str, MCPTool] = {tool.name: tool for tool in tools}
+        # Lowercase name -> canonical name, for case-insensitive lookups
+        self._tools_lower: Dict[str, str] = {name.lower(): name for name in self.tools}
+        # Default parameters per tool (None when the tool has none)
+        self._tool_defaults: Dict[str, Optional[Dict[str, Any]]] = {
+            name: tool.parameters or None for name, tool in self.tools.items()
+        }
+        # Per-tool routing: direct server name and HTTP endpoint
+        self._server_names: Dict[str, str] = {
+            name: self._get_server_name_from_url(tool.mcp_url) for name, tool in self.tools.items()
+        }
+        self._call_urls: Dict[str, str] = {
+            name: f"{tool.mcp_url}/mcp/call" for name, tool in self.tools.items()
+        }
         self.settings = settings
         self.servers: Dict[str, Any] = servers or {}
         
         # Mock servers don't need SSL verification (they work in-memory)
         self.verify_ssl = True
+
+        # Timeouts resolved once from settings; listing/discovery capped at 10s
+        self._call_timeout: float = getattr(settings, "mcp_timeout", 30.0) if settings else 30.0
+        self._list_timeout: float = min(self._call_timeout, 10.0)
+        self._discover_timeout: float = min(self._call_timeout, 10.0)
+
+        # Shared HTTP client (created on first use) so keep-alive connections
+        # are reused across tool calls; timeouts are passed per request
+        self._client: Optional[httpx.AsyncClient] = None
         
         self.logger.info("MCP tools initialized", tools_count=len(self.tools), servers_count=len(self.servers))
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it if needed.
+
+        Returns:
+            Shared httpx.AsyncClient instance
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                verify=self.verify_ssl,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def call_tool(
         self,
         tool_name: str,
@@ -47,19 +130,26 @@ class MCPTools(LoggerMixin):
             Tool response
 
         Raises:
-            ValueError: If tool not found
+            ValueError: If tool not found or its parameters are rejected
             RuntimeError: If tool call fails
         """
-        if tool_name not in self.tools:
+        tool_name_lower = tool_name.lower()
+        canonical_name = self._tools_lower.get(tool_name_lower)
+        if canonical_name is None:
             # Get available tools for better error message
             available_tools = list(self.tools.keys())
             
-            # Try to find similar tool names
-            similar_tools = []
-            tool_name_lower = tool_name.lower()
-            for available_tool in available_tools:
-                if tool_name_lower in available_tool.lower() or available_tool.lower() in tool_name_lower:
-                    similar_tools.append(available_tool)
+            # Try to find similar tool names: substring matches first, then
+            # close spellings (e.g. a hallucinated "buscar_clientes_ifood")
+            similar_tools = [
+                name
+                for name_lower, name in self._tools_lower.items()
+                if tool_name_lower in name_lower or name_lower in tool_name_lower
+            ]
+            close_matches = get_close_matches(tool_name_lower, self._tools_lower, n=5, cutoff=0.6)
+            for name_lower in close_matches:
+                if self._tools_lower[name_lower] not in similar_tools:
+                    similar_tools.append(self._tools_lower[name_lower])
             
             error_msg = f"Tool '{tool_name}' não encontrada."
             if similar_tools:
@@ -78,12 +168,15 @@ class MCPTools(LoggerMixin):
             
             raise ValueError(error_msg)
 
+        tool_name = canonical_name
         tool = self.tools[tool_name]
-        params = parameters or {}
 
-        # Merge with default parameters if any
-        if tool.parameters:
-            params = {**tool.parameters, **params}
+        # Merge with default parameters only when both sides are non-empty
+        defaults = self._tool_defaults[tool_name]
+        if parameters:
+            params = {**defaults, **parameters} if defaults else parameters
+        else:
+            params = defaults or {}
 
         self.logger.info(
             "Chamando MCP tool",
@@ -92,8 +185,10 @@ class MCPTools(LoggerMixin):
             parameters=params,
         )
 
-        # Try direct server call first (if server instance available)
-        server_name = self._get_server_name_from_url(tool.mcp_url)
+        # Try direct server call first (if server instance available).
+        # Only transport failures fall back to HTTP; tool errors (e.g. missing
+        # parameters) propagate, since the HTTP route would fail the same way
+        server_name = self._server_names[tool_name]
         if server_name in self.servers:
             try:
                 server = self.servers[server_name]
@@ -105,7 +200,7 @@ class MCPTools(LoggerMixin):
                     success=result.get("success", False),
                 )
                 return result
-            except Exception as e:
+            except MCPTransportError as e:
                 self.logger.warning(
                     "Erro ao chamar via servidor direto, tentando HTTP",
                     tool_name=tool_name,
@@ -113,30 +208,27 @@ class MCPTools(LoggerMixin):
                 )
 
         # Fallback to HTTP call
-        # Get timeout from settings if available
-        timeout_value = 30.0
-        if self.settings and hasattr(self.settings, 'mcp_timeout'):
-            timeout_value = self.settings.mcp_timeout
-        
+        timeout_value = self._call_timeout
+
         try:
-            async with httpx.AsyncClient(timeout=timeout_value, verify=self.verify_ssl) as client:
-                response = await client.post(
-                    f"{tool.mcp_url}/mcp/call",
-                    json={
-                        "tool_name": tool_name,
-                        "parameters": params,
-                    },
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await self._get_client().post(
+                self._call_urls[tool_name],
+                json={
+                    "tool_name": tool_name,
+                    "parameters": params,
+                },
+                timeout=timeout_value,
+            )
+            response.raise_for_status()
+            result = _json_loads(response.content)
 
-                self.logger.info(
-                    "MCP tool chamada com sucesso",
-                    tool_name=tool_name,
-                    success=result.get("success", False),
-                )
+            self.logger.info(
+                "MCP tool chamada com sucesso",
+                tool_name=tool_name,
+                success=result.get("success", False),
+            )
 
-                return result
+            return result
 
         except httpx.ConnectError as e:
             self.logger.error(
@@ -193,6 +285,30 @@ class MCPTools(LoggerMixin):
             )
             raise RuntimeError(f"Erro inesperado ao chamar tool {tool_name}: {str(e)}") from e
 
+    async def fetch_client_bundle(self, cnpj: str) -> Dict[str, Any]:
+        """Fetch restaurant and iFood data for a client concurrently.
+
+        Runs ``obter_info_restaurante`` and ``buscar_cliente_ifood`` with
+        ``asyncio.gather``, so the lookup costs one round-trip instead of two.
+        A failing lookup is reported in its own entry without discarding the other.
+
+        Args:
+            cnpj: Client CNPJ
+
+        Returns:
+            Dictionary with "info" (restaurant) and "ifood" (iFood account) results
+        """
+        info, ifood = await asyncio.gather(
+            self.call_tool("obter_info_restaurante", {"cnpj": cnpj}),
+            self.call_tool("buscar_cliente_ifood", {"cnpj": cnpj}),
+            return_exceptions=True,
+        )
+        results = {"info": info, "ifood": ifood}
+        for key, result in results.items():
+            if isinstance(result, Exception):
+                results[key] = {"success": False, "error": str(result)}
+        return results
+
     def _get_server_name_from_url(self, url: str) -> str:
         """Extract server name from URL.
 
@@ -202,28 +318,8 @@ class MCPTools(LoggerMixin):
         Returns:
             Server name
         """
-        # Extract server name from URL pattern
         # e.g., http://localhost:8001 -> mock_crm
-        # This is a simple heuristic - can be improved
-        if "8001" in url:
-            return "mock_crm"
-        elif "8002" in url:
-            return "mock_catalog"
-        elif "8003" in url:
-            return "mock_analytics"
-        elif "8005" in url:
-            return "mock_ifood"
-        elif "8006" in url:
-            return "mock_restaurant"
-        elif "8007" in url:
-            return "mock_recommendation"
-        elif "8008" in url:
-            return "mock_contract"
-        elif "8009" in url:
-            return "mock_pricing"
-        elif "8010" in url:
-            return "mock_qualification"
-        return "unknown"
+        return _server_name_for_url(url)
 
     async def list_tools(self, mcp_url: Optional[str] = None) -> List[str]:
         """List available tools from MCP server.
@@ -235,32 +331,21 @@ class MCPTools(LoggerMixin):
             List of tool names
         """
         if mcp_url:
-            # Try direct server call first
+            # In-process server: answer directly, never over HTTP
             server_name = self._get_server_name_from_url(mcp_url)
-            if server_name in self.servers:
-                try:
-                    server = self.servers[server_name]
-                    tools = server.list_tools()
-                    return [tool["name"] for tool in tools]
-                except Exception as e:
-                    self.logger.warning(
-                        "Erro ao listar tools via servidor direto",
-                        server_name=server_name,
-                        error=str(e),
-                    )
-
-            # Fallback to HTTP call
-            # Use shorter timeout for tool listing
-            list_timeout = 10.0
-            if self.settings and hasattr(self.settings, 'mcp_timeout'):
-                list_timeout = min(self.settings.mcp_timeout, 10.0)  # Cap at 10s for listing
-            
+            if self.servers and server_name in self.servers:
+                return [tool["name"] for tool in self.servers[server_name].list_tools()]
+
+            # Fallback to HTTP call (shorter timeout for tool listing)
+            list_timeout = self._list_timeout
+
             try:
-                async with httpx.AsyncClient(timeout=list_timeout, verify=self.verify_ssl) as client:
-                    response = await client.get(f"{mcp_url}/mcp/tools")
-                    response.raise_for_status()
-                    data = response.json()
-                    return [tool["name"] for tool in data.get("tools", [])]
+                response = await self._get_client().get(
+                    f"{mcp_url}/mcp/tools", timeout=list_timeout
+                )
+                response.raise_for_status()
+                data = _json_loads(response.content)
+                return [tool["name"] for tool in data.get("tools", [])]
             except httpx.ConnectError as e:
                 self.logger.warning(
                     "Erro de conexão ao listar tools do MCP",
@@ -297,30 +382,21 @@ class MCPTools(LoggerMixin):
         Returns:
             List of tool definitions
         """
+        # In-process server: answer directly, never over HTTP
         server_name = self._get_server_name_from_url(mcp_url)
-        if server_name in self.servers:
-            try:
-                server = self.servers[server_name]
-                return server.list_tools()
-            except Exception as e:
-                self.logger.warning(
-                    "Erro ao descobrir tools via servidor direto",
-                    server_name=server_name,
-                    error=str(e),
-                )
+        if self.servers and server_name in self.servers:
+            return self.servers[server_name].list_tools()
+
+        # Fallback to HTTP (shorter timeout for tool discovery)
+        discover_timeout = self._discover_timeout
 
-        # Fallback to HTTP
-        # Use shorter timeout for tool discovery
-        discover_timeout = 10.0
-        if self.settings and hasattr(self.settings, 'mcp_timeout'):
-            discover_timeout = min(self.settings.mcp_timeout, 10.0)  # Cap at 10s for discovery
-        
         try:
-            async with httpx.AsyncClient(timeout=discover_timeout, verify=self.verify_ssl) as client:
-                response = await client.get(f"{mcp_url}/mcp/tools")
-                response.raise_for_status()
-                data = response.json()
-                return data.get("tools", [])
+            response = await self._get_client().get(
+                f"{mcp_url}/mcp/tools", timeout=discover_timeout
+            )
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            return data.get("tools", [])
         except httpx.ConnectError as e:
             self.logger.warning(
                 "Erro de conexão ao descobrir tools do MCP",
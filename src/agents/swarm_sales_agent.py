@@ -1,23 +1,433 @@
 """Sales agent system using Strands Agents Swarm."""
 
+import asyncio
 import json
+import re
+import time
+from functools import lru_cache, partial
+from importlib.util import find_spec
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+import httpx
+import openai
+from openai import AsyncOpenAI
+from pydantic import TypeAdapter
 from strands import Agent
-from strands.multiagent import Swarm
+from strands.agent import AgentResult
+from strands.multiagent import MultiAgentResult, Status, Swarm
+from strands.multiagent.swarm import SwarmNode
+from strands.models import CacheConfig
 from strands.models.openai import OpenAIModel
+from strands.types.tools import ToolResult, ToolUse
 
 from src.config.settings import Settings
 from src.utils.logger import LoggerMixin
 from src.utils.mcp_server_factory import MCPServerFactory
+from src.utils.semantic_cache import SemanticCache
 from src.agents.mcp_tools import MCPTools
 from src.models.agent_config import MCPTool
 
+# Faster config parsing when orjson is installed (pip install -e ".[speedups]")
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Static preamble shared by every agent's system prompt. Prompts are laid out
+# as preamble + role section + tenant data (CNPJ) last, so each agent's prompt
+# prefix stays byte-identical across turns, conversations and tenants.
+SHARED_SYSTEM_PREAMBLE = """Você faz parte de uma equipe de agentes de vendas da Maquinona iFood Pago, organizada em Swarm. Use handoff para passar a conversa ao agente mais adequado.
+
+SOBRE A MAQUINONA:
+A Maquinona combina máquina de pagamento com inteligência de marketing do iFood. Ela ajuda restaurantes a:
+- AUMENTAR VENDAS com campanhas de marketing inteligentes
+- FIDELIZAR CLIENTES com programas de cashback e cupons automáticos via WhatsApp
+- TER DADOS E INSIGHTS sobre o negócio
+- ACEITAR TODAS AS BANDEIRAS (crédito, débito, vale-refeição)
+
+Responda SEMPRE em português brasileiro."""
+
+_RESEARCHER_PROMPT = """Você é um pesquisador especializado em coletar informações sobre clientes restaurantes.
+
+Quando chamado pelo sales_agent, você DEVE:
+1. Usar a tool buscar_dados_cliente com o CNPJ do cliente atual (abaixo); ela traz de uma só vez as informações do restaurante e do cliente iFood
+2. Analisar essas informações e compartilhar um resumo no contexto compartilhado do Swarm
+
+Depois de coletar, faça handoff de volta para o sales_agent com um resumo claro."""
+
+_SALES_PROMPT = """Você é um vendedor especializado da Maquinona iFood Pago.
+
+OBJETIVO: Conduzir a conversa de forma natural e empática, identificando necessidades e CONDUZINDO PARA CONVERSÃO.
+
+INÍCIO DA CONVERSA:
+Quando a conversa iniciar, você DEVE:
+1. Primeiro, fazer handoff para o researcher_agent para buscar informações do cliente atual (CNPJ abaixo)
+2. Aguardar o researcher coletar as informações
+3. Quando o researcher retornar, use essas informações para PERSONALIZAR a conversa
+
+COMO CONDUZIR A CONVERSA:
+1. Use as informações do cliente coletadas pelo researcher
+2. Seja natural e conversacional
+3. Faça perguntas ESTRATÉGICAS para identificar necessidades
+4. ESCUTE ATENTAMENTE e identifique dores reais
+5. CONECTE as necessidades identificadas com os benefícios da Maquinona
+6. Destaque benefícios ESPECÍFICOS que resolvem os problemas mencionados
+
+PROGRESSÃO NATURAL:
+- Comece cumprimentando e mencionando algo específico sobre o restaurante
+- Identifique necessidades através de perguntas naturais
+- Quando identificar interesse, APRESENTE A SOLUÇÃO IMEDIATAMENTE
+- Se o cliente perguntar sobre preço, use calcular_preco_personalizado
+- Se precisar qualificar melhor (BANT), faça handoff para qualification_agent
+- Se precisar apresentar detalhes, faça handoff para presentation_agent
+- Se houver objeções, faça handoff para negotiation_agent
+- Se o cliente mostrar interesse em contratar, faça handoff IMEDIATAMENTE para closing_agent"""
+
+_QUALIFICATION_PROMPT = """Você é um especialista em qualificação de leads usando a metodologia BANT.
+
+Sua função é qualificar leads de forma natural mas EFETIVA:
+- Budget: Entender o orçamento disponível
+- Authority: Identificar quem tem poder de decisão
+- Need: Confirmar a necessidade real do restaurante
+- Timeline: Entender quando precisam da solução
+
+ESTRATÉGIA:
+1. Faça perguntas que confirmem o FIT do restaurante com a Maquinona
+2. Identifique sinais de ALTO POTENCIAL
+3. Use as tools qualificar_lead e calcular_lead_score quando tiver informações suficientes
+4. Se o lead_score for ALTO, recomende avançar para apresentação ou fechamento
+
+Após qualificar, faça handoff de volta para o sales_agent com:
+- Resumo da qualificação (BANT completo)
+- Lead score e justificativa
+- RECOMENDAÇÃO CLARA de próximos passos"""
+
+_PRESENTATION_PROMPT = """Você é um especialista em apresentar soluções personalizadas para restaurantes.
+
+Sua função é criar uma apresentação CONVINCENTE e PERSONALIZADA:
+1. Use as informações do cliente para PERSONALIZAR
+2. Apresente a Maquinona destacando benefícios ESPECÍFICOS para o perfil do restaurante
+3. Use tools como recomendar_produtos e avaliar_fit_produto para personalizar
+4. Seja entusiasta mas autêntico
+5. Use CASOS DE SUCESSO quando apropriado
+6. Destaque BENEFÍCIOS TANGÍVEIS
+
+ESTRUTURA:
+- Comece com o PROBLEMA identificado
+- Apresente a Maquinona como SOLUÇÃO
+- Destaque BENEFÍCIOS que resolvem a dor
+- Termine com um CALL TO ACTION claro
+
+Após apresentar, faça handoff:
+- Para o sales_agent se a apresentação foi bem recebida
+- Para o negotiation_agent se houver objeções
+- Para o closing_agent se o cliente mostrar interesse claro"""
+
+_NEGOTIATION_PROMPT = """Você é um especialista em negociação e tratamento de objeções.
+
+Sua função é resolver objeções de forma empática e construtiva:
+1. Identifique o tipo de objeção (preço, timing, necessidade, concorrência)
+2. Valide a preocupação do cliente
+3. Apresente argumentos sólidos e use tools quando necessário
+4. Negocie termos quando apropriado
+5. CONVERTA objeções em oportunidades
+
+ESTRATÉGIAS POR TIPO DE OBJEÇÃO:
+- PREÇO: Destaque ROI, compare com concorrência, ofereça condições especiais
+- TIMING: Crie urgência se apropriado, mostre que implementação é rápida
+- NECESSIDADE: Reforce os benefícios identificados, use dados do restaurante
+- CONCORRÊNCIA: Destaque diferenciais da Maquinona
+
+Após resolver objeções:
+- Se objeções foram resolvidas e há interesse, faça handoff para o closing_agent
+- Se ainda há dúvidas, faça handoff para o sales_agent"""
+
+_CLOSING_PROMPT = """Você é um especialista em fechar vendas de forma natural e empática.
+
+Sua função é finalizar a venda de forma POSITIVA e EFICIENTE:
+1. Confirme o interesse do cliente de forma natural mas CLARA
+2. Colete informações necessárias de forma CONVERSACIONAL mas DIRETA:
+   - Nome completo, CNPJ, Email, Telefone
+   - Cidade e estado, Número de mesas, Faturamento mensal
+3. Use a tool concluir_compra quando tiver TODAS as informações
+4. Agradeça e explique os próximos passos de forma CLARA
+
+ESTRATÉGIA:
+- Seja EFICIENTE: não prolongue desnecessariamente
+- Seja POSITIVO: celebre o fechamento
+- Seja CLARO: explique exatamente o que acontece a seguir
+- Seja PROFISSIONAL: mostre que o cliente fez uma boa escolha
+
+IMPORTANTE:
+- NÃO perca a venda por não coletar todas as informações necessárias
+- Use a tool concluir_compra assim que tiver todos os dados"""
+
+# Role prompts per agent; researcher and sales also get the client's CNPJ
+_ROLE_PROMPTS: Dict[str, Tuple[str, bool]] = {
+    "researcher": (_RESEARCHER_PROMPT, True),
+    "sales": (_SALES_PROMPT, True),
+    "qualification": (_QUALIFICATION_PROMPT, False),
+    "presentation": (_PRESENTATION_PROMPT, False),
+    "negotiation": (_NEGOTIATION_PROMPT, False),
+    "closing": (_CLOSING_PROMPT, False),
+}
+
+_MCP_TOOL_LIST = TypeAdapter(List[MCPTool])
+
+# Sentinel for attributes a Swarm result may not have
+_MISSING = object()
+
+_USAGE_GETTER = attrgetter("inputTokens", "outputTokens", "totalTokens")
+
+_FALLBACK_RESPONSE = "Desculpe, não consegui gerar uma resposta. Pode repetir sua mensagem?"
+
+# Swarm-level retry of turns that failed on a transient connection error
+_RETRY_ATTEMPTS = 3
+_RETRY_INITIAL_DELAY = 1.0
+_RETRY_MAX_DELAY = 10.0
+_TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+    httpx.TimeoutException,
+    httpx.RemoteProtocolError,
+)
+
+# Batch API: terminal batch states, polled until one is reached
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Semantic cache stage for the first message of a conversation
+_OPENING_STAGE = "opening"
+# Digits (CNPJ, CPF, phone, order numbers) or e-mail addresses identify a
+# customer; messages and replies containing them are never cached
+_IDENTIFIER_RE = re.compile(r"\d|[\w.+-]+@[\w-]+\.[\w.-]+")
+
+# stream(): window for coalescing text chunks, and Swarm event queue bound
+_STREAM_COALESCE_NS = 20_000_000  # 20 ms
+_STREAM_QUEUE_SIZE = 64
+_STREAM_END = object()
+
+# Input schema shared by MCP tools that declare no parameters; already holds
+# every key Strands fills in on registration, so it is never mutated
+_EMPTY_INPUT_SCHEMA: Dict[str, Any] = {
+    "json": {"type": "object", "properties": {}, "required": []},
+}
+
+# Composite researcher tool backed by MCPTools.fetch_client_bundle
+CLIENT_BUNDLE_TOOL = "buscar_dados_cliente"
+_CLIENT_BUNDLE_TOOLS = ("obter_info_restaurante", "buscar_cliente_ifood")
+
+
+@lru_cache(maxsize=4)
+def _load_tools_config(path: Path, mtime: float) -> Tuple[MCPTool, ...]:
+    """Parse the MCP tools of an agent config file.
+
+    Cached per file and modification time, so the file is re-read only when it changes.
+    """
+    config_data = _json_loads(path.read_bytes())
+    return tuple(_MCP_TOOL_LIST.validate_python(config_data.get("tools", [])))
+
+
+@lru_cache(maxsize=32)
+def _build_system_prompts(cnpj: str) -> Mapping[str, str]:
+    """Assemble every agent's system prompt as shared preamble + role section.
+
+    Cached per CNPJ, so instances for the same client share the same strings;
+    the result is a read-only view since every caller gets the same object.
+
+    Args:
+        cnpj: Current client's CNPJ, appended to the prompts that need it
+
+    Returns:
+        System prompt per agent role
+    """
+    prompts = {}
+    for role, (role_prompt, include_client) in _ROLE_PROMPTS.items():
+        system_prompt = f"{SHARED_SYSTEM_PREAMBLE}\n\n{role_prompt}"
+        if include_client:
+            system_prompt += f"\n\nCLIENTE ATUAL:\nCNPJ: {cnpj}"
+        prompts[role] = system_prompt
+    return MappingProxyType(prompts)
+
+
+def _extract_text(result_obj: Any) -> str:
+    """Extract the reply text from a Swarm node result.
+
+    Args:
+        result_obj: Node result (AgentResult, nested MultiAgentResult, str or Exception)
+
+    Returns:
+        Reply text, or an empty string if there is none
+    """
+    if isinstance(result_obj, str):
+        return result_obj
+    if isinstance(result_obj, Exception) or result_obj is None:
+        return ""
+    if isinstance(result_obj, (AgentResult, MultiAgentResult)):
+        # Concatenates the text blocks of the agent's final message
+        return str(result_obj).strip()
+    try:
+        return str(result_obj.text)
+    except AttributeError:
+        content = getattr(result_obj, "content", None)
+        return content if isinstance(content, str) else ""
+
+
+def _stream_text(event: Any) -> Optional[str]:
+    """Return the text chunk of an agent text-stream event, or None."""
+    if isinstance(event, dict) and event.get("type") == "multiagent_node_stream":
+        text = event.get("event", {}).get("data")
+        if isinstance(text, str):
+            return text
+    return None
+
+
+def _is_raw_model_chunk(event: Any) -> bool:
+    """Whether an event only forwards a raw model chunk, already sent as text/tool events."""
+    return (
+        isinstance(event, dict)
+        and event.get("type") == "multiagent_node_stream"
+        and event.get("event", {}).keys() == {"event"}
+    )
+
+
+def _text_event(node_id: Optional[str], chunks: List[str]) -> Dict[str, Any]:
+    """Build one coalesced text-stream event from consecutive chunks."""
+    return {
+        "type": "multiagent_node_stream",
+        "node_id": node_id,
+        "event": {"data": "".join(chunks)},
+    }
+
+
+def _batch_item_result(
+    cnpj: str,
+    message: str,
+    record: Optional[Dict[str, Any]],
+    batch_status: str,
+) -> Dict[str, Any]:
+    """Convert one Batch API output record into a batch item result.
+
+    Args:
+        cnpj: Item CNPJ
+        message: Item message
+        record: Output or error record for the item (None if the batch did not reach it)
+        batch_status: Final batch status
+
+    Returns:
+        Item result with response and status
+    """
+    item = {"cnpj": cnpj, "message": message, "response": "", "status": "failed"}
+    if record is None:
+        item["error"] = f"Sem resultado (batch {batch_status})"
+        return item
+
+    response = record.get("response") or {}
+    if record.get("error") or response.get("status_code") != 200:
+        item["error"] = str(record.get("error") or response.get("body"))
+        return item
+
+    item["response"] = response["body"]["choices"][0]["message"]["content"] or ""
+    item["status"] = "completed"
+    return item
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Whether an error, or any error in its cause chain, is a transient connection error."""
+    while error is not None:
+        if isinstance(error, _TRANSIENT_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _called_tools(result: Any) -> bool:
+    """Whether any agent in a Swarm result called a tool."""
+    for node_result in (getattr(result, "results", None) or {}).values():
+        metrics = getattr(getattr(node_result, "result", None), "metrics", None)
+        if getattr(metrics, "tool_metrics", None):
+            return True
+    return False
+
+
+def _is_retryable_failure(result: Any) -> bool:
+    """Whether a Swarm result failed only because of a transient connection error.
+
+    Turns that reached the closing agent are never retried, since it registers purchases.
+    """
+    if result.status != Status.FAILED:
+        return False
+    if any(node.node_id == "closing_agent" for node in result.node_history):
+        return False
+    return any(
+        isinstance(node_result.result, Exception) and _is_transient_error(node_result.result)
+        for node_result in result.results.values()
+    )
+
+
+class PrefixStableSwarm(Swarm):
+    """Swarm whose node input keeps a stable prefix across handoffs.
+
+    Strands puts the handoff message first in each node's input, so the text
+    right after the (cached) system prompt changes on every hop. Here the parts
+    fixed per node come first, then the turn's user request, then the
+    append-only agent history and shared knowledge, and the handoff message
+    last, so consecutive calls to an agent share the longest possible prefix.
+    """
+
+    def _build_node_input(self, target_node: SwarmNode) -> str:
+        """Build the input text for a node, most stable parts first."""
+        parts = []
+
+        other_nodes = [
+            node for node_id, node in self.nodes.items() if node_id != target_node.node_id
+        ]
+        if other_nodes:
+            lines = ["Other agents available for collaboration:"]
+            for node in other_nodes:
+                line = f"Agent name: {node.node_id}."
+                if node.executor.description:
+                    line += f" Agent description: {node.executor.description}"
+                lines.append(line)
+            parts.append("\n".join(lines))
+        parts.append(
+            "You have access to swarm coordination tools if you need help from other agents. "
+            "If you don't hand off to another agent, the swarm will consider the task complete."
+        )
+
+        task = self.state.task
+        if isinstance(task, str):
+            parts.append(f"User Request: {task}")
+        elif isinstance(task, list):
+            parts.append("User Request: Multi-modal task")
+
+        if self.state.node_history:
+            history = " → ".join(node.node_id for node in self.state.node_history)
+            parts.append(f"Previous agents who worked on this: {history}")
+
+        shared = [
+            f"• {node_id}: {context}"
+            for node_id, context in self.shared_context.context.items()
+            if context
+        ]
+        if shared:
+            parts.append("Shared knowledge from previous agents:\n" + "\n".join(shared))
+
+        if self.state.handoff_message:
+            parts.append(f"Handoff Message: {self.state.handoff_message}")
+
+        return "\n\n".join(parts)
+
 
 class SwarmSalesAgent(LoggerMixin):
     """Sales agent system using Strands Agents Swarm pattern."""
 
+    _instances: Dict[Tuple[str, Optional[str]], "SwarmSalesAgent"] = {}
+    # Number of get_or_create() callers that have not called release() yet
+    _refcounts: Dict[Tuple[str, Optional[str]], int] = {}
+
     def __init__(
         self,
         settings: Settings,
@@ -31,6 +441,7 @@ class SwarmSalesAgent(LoggerMixin):
         """
         self.settings = settings
         self.default_cnpj = default_cnpj or settings.default_client_cnpj
+        self._prompts = _build_system_prompts(self.default_cnpj or "12345678000190")
 
         # Initialize MCP server factory
         MCPServerFactory.initialize(settings)
@@ -41,9 +452,25 @@ class SwarmSalesAgent(LoggerMixin):
         
         # Create Strands tools from MCP tools
         self.strands_tools = self._create_strands_tools()
+        # Immutable tool set shared by all six agents (None when there are no tools)
+        self._agent_tools: Optional[Tuple[Any, ...]] = (
+            tuple(self.strands_tools) if self.strands_tools else None
+        )
         
-        # Create Swarm
+        # Create Swarm. It keeps per-run state and its agents reject concurrent
+        # invocations, so callers sharing this instance take turns on it
         self.swarm = self._create_swarm()
+        self._swarm_lock = asyncio.Lock()
+
+        # Semantic cache of replies to opening messages
+        self._semantic_cache: Optional[SemanticCache] = None
+        if settings.semantic_cache_enabled:
+            self._semantic_cache = SemanticCache(
+                threshold=settings.semantic_cache_threshold,
+                ttl=settings.semantic_cache_ttl,
+            )
+        self._cache_lookups = 0
+        self._cache_hits = 0
         
         self.logger.info(
             "Swarm Sales Agent inicializado",
@@ -51,6 +478,51 @@ class SwarmSalesAgent(LoggerMixin):
             tools_count=len(self.strands_tools),
         )
 
+    @classmethod
+    def get_or_create(
+        cls,
+        settings: Settings,
+        default_cnpj: Optional[str] = None,
+    ) -> "SwarmSalesAgent":
+        """Get the shared instance for a model and CNPJ, creating it on first use.
+
+        Construction builds the MCP servers, tools, six agents and the Swarm, so
+        callers share one instance per (model, CNPJ) instead of rebuilding it.
+        Swarm runs on a shared instance are serialized, one turn at a time.
+        Each caller must call ``release()`` when done instead of ``aclose()``.
+
+        Args:
+            settings: Application settings
+            default_cnpj: Default CNPJ to use for client lookup
+
+        Returns:
+            SwarmSalesAgent instance
+        """
+        cnpj = default_cnpj or settings.default_client_cnpj
+        cache_key = (settings.model_name, cnpj)
+        if cache_key not in cls._instances:
+            cls._instances[cache_key] = cls(settings=settings, default_cnpj=cnpj)
+        cls._refcounts[cache_key] = cls._refcounts.get(cache_key, 0) + 1
+        return cls._instances[cache_key]
+
+    async def release(self) -> None:
+        """Release a reference taken with ``get_or_create()``.
+
+        The last release removes the shared instance and closes it, so a later
+        ``get_or_create()`` builds a new one instead of reusing closed clients.
+        """
+        cache_key = (self.settings.model_name, self.default_cnpj)
+        if self._instances.get(cache_key) is not self:
+            await self.aclose()
+            return
+        remaining = self._refcounts.get(cache_key, 1) - 1
+        if remaining > 0:
+            self._refcounts[cache_key] = remaining
+            return
+        del self._instances[cache_key]
+        self._refcounts.pop(cache_key, None)
+        await self.aclose()
+
     def _initialize_mcp_tools(self) -> MCPTools:
         """Initialize MCP tools from configuration.
 
@@ -59,15 +531,59 @@ class SwarmSalesAgent(LoggerMixin):
         """
         config_path = Path("config/agents/sales_agent.json")
         if config_path.exists():
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = json.load(f)
-            tools_dict = config_data.get("tools", [])
-            tools_config = [MCPTool(**tool) for tool in tools_dict]
+            tools_config = list(_load_tools_config(config_path, config_path.stat().st_mtime))
         else:
             tools_config = []
         
         return MCPTools(tools_config, self.settings, servers=self.mcp_servers)
 
+    async def _dispatch_tool(
+        self,
+        tool_name: str,
+        tool_use: ToolUse,
+        **invocation_state: Any,
+    ) -> ToolResult:
+        """Run an MCP tool for a Strands tool-use request.
+
+        Shared by every Strands tool; each one binds its own tool_name.
+
+        Args:
+            tool_name: MCP tool name
+            tool_use: Tool-use request from the model (input holds the parameters)
+            **invocation_state: Strands invocation state (unused)
+
+        Returns:
+            Strands tool result wrapping the MCP response
+        """
+        result = await self.mcp_tools.call_tool(tool_name, tool_use.get("input") or {})
+        return {
+            "toolUseId": tool_use["toolUseId"],
+            "status": "success",
+            "content": [{"json": result}],
+        }
+
+    async def _dispatch_client_bundle(
+        self,
+        tool_use: ToolUse,
+        **invocation_state: Any,
+    ) -> ToolResult:
+        """Run the composite client lookup for a Strands tool-use request.
+
+        Args:
+            tool_use: Tool-use request from the model (input holds the CNPJ)
+            **invocation_state: Strands invocation state (unused)
+
+        Returns:
+            Strands tool result wrapping both lookups
+        """
+        cnpj = (tool_use.get("input") or {}).get("cnpj") or self.default_cnpj
+        result = await self.mcp_tools.fetch_client_bundle(cnpj)
+        return {
+            "toolUseId": tool_use["toolUseId"],
+            "status": "success",
+            "content": [{"json": result}],
+        }
+
     def _create_strands_tools(self) -> List[Any]:
         """Create Strands tools from MCP tools.
 
@@ -75,95 +591,83 @@ class SwarmSalesAgent(LoggerMixin):
             List of Strands tool functions
         """
         from strands.tools import PythonAgentTool
-        from strands.types.tools import ToolSpec
-        
-        tools = []
-        
-        # Create a tool function for each MCP tool
-        for tool_name, tool_config in self.mcp_tools.tools.items():
-            # Capture tool_name in closure properly
-            def make_tool_func(name: str, config: MCPTool):
-                async def tool_func(**kwargs: Any) -> Dict[str, Any]:
-                    """Tool function wrapper for Strands Agent."""
-                    result = await self.mcp_tools.call_tool(name, kwargs)
-                    return result
-                return tool_func
-            
-            # Create tool function with proper closure
-            tool_func = make_tool_func(tool_name, tool_config)
-            
-            # Create ToolSpec
-            tool_spec: ToolSpec = {
-                "name": tool_name,
-                "description": tool_config.description or f"Tool {tool_name}",
-                "inputSchema": tool_config.parameters or {"type": "object", "properties": {}},
-            }
-            
-            # Create PythonAgentTool
-            strands_tool = PythonAgentTool(
+
+        # One Strands tool per MCP tool (in config order), all backed by the
+        # same dispatcher; tools without parameters share one input schema
+        tools = [
+            PythonAgentTool(
                 tool_name=tool_name,
-                tool_spec=tool_spec,
-                tool_func=tool_func,
+                tool_spec={
+                    "name": tool_name,
+                    "description": tool_config.description or f"Tool {tool_name}",
+                    "inputSchema": (
+                        {"json": tool_config.parameters}
+                        if tool_config.parameters
+                        else _EMPTY_INPUT_SCHEMA
+                    ),
+                },
+                tool_func=partial(self._dispatch_tool, tool_name),
+            )
+            for tool_name, tool_config in self.mcp_tools.tools.items()
+        ]
+
+        # Composite tool running both client lookups concurrently
+        if all(self.mcp_tools.has_tool(name) for name in _CLIENT_BUNDLE_TOOLS):
+            tools.append(
+                PythonAgentTool(
+                    tool_name=CLIENT_BUNDLE_TOOL,
+                    tool_spec={
+                        "name": CLIENT_BUNDLE_TOOL,
+                        "description": (
+                            "Busca de uma só vez as informações do restaurante "
+                            "(obter_info_restaurante) e do cliente iFood "
+                            "(buscar_cliente_ifood) pelo CNPJ."
+                        ),
+                        "inputSchema": {
+                            "json": {
+                                "type": "object",
+                                "properties": {
+                                    "cnpj": {"type": "string", "description": "CNPJ do cliente"},
+                                },
+                                "required": ["cnpj"],
+                            },
+                        },
+                    },
+                    tool_func=self._dispatch_client_bundle,
+                )
             )
-            
-            tools.append(strands_tool)
         
         return tools
 
     def _create_swarm(self) -> Swarm:
         """Create Swarm with specialized agents.
 
+        System prompts and tool specs are fixed here and never carry per-turn
+        data, so the provider-side prompt cache can reuse the same prefix for
+        every message; the user message is only ever passed as the Swarm task.
+
         Returns:
             Swarm instance
         """
-        # Configure client_args for OpenAIModel
-        client_args = {
-            "api_key": self.settings.openai_api_key,
-        }
-        
-        # Handle SSL verification for corporate proxies/self-signed certificates
-        # Option 1: Use truststore (recommended) - injected at startup in server.py
-        # Option 2: Disable SSL verification (development only)
-        if not self.settings.ssl_verify:
-            # Only for development - disable SSL verification
-            # This creates an httpx client that doesn't verify SSL certificates
-            import httpx
-            
-            # Create httpx client with SSL verification disabled
-            http_client = httpx.AsyncClient(
-                verify=False,  # Disable SSL verification
-                timeout=httpx.Timeout(60.0, connect=10.0),
-            )
-            
-            # Pass http_client to OpenAI client
-            # OpenAIModel will use this when creating AsyncOpenAI internally
-            client_args["http_client"] = http_client
-            
-            self.logger.warning(
-                "SSL verification desabilitada - APENAS PARA DESENVOLVIMENTO",
-                hint="NÃO use SSL_VERIFY=false em produção! Use truststore em vez disso."
-            )
-        
-        # Create OpenAIModel using Strands Agents pattern
-        model = OpenAIModel(
-            client_args=client_args,
-            model_id=self.settings.model_name,
-            params={
-                "max_tokens": self.settings.max_tokens,
-                "temperature": self.settings.temperature,
-            },
-        )
+        # One OpenAI client (and connection pool) shared by the six agents
+        self.openai_client = self._create_openai_client()
 
-        # Create specialized agents
-        researcher_agent = self._create_researcher_agent(model)
-        sales_agent = self._create_sales_agent(model)
-        qualification_agent = self._create_qualification_agent(model)
-        presentation_agent = self._create_presentation_agent(model)
-        negotiation_agent = self._create_negotiation_agent(model)
-        closing_agent = self._create_closing_agent(model)
+        # Create specialized agents, each with its own prompt-cache key
+        researcher_agent = self._create_researcher_agent(self._create_model("researcher"))
+        sales_agent = self._create_sales_agent(self._create_model("sales_agent"))
+        qualification_agent = self._create_qualification_agent(
+            self._create_model("qualification_agent")
+        )
+        presentation_agent = self._create_presentation_agent(
+            self._create_model("presentation_agent")
+        )
+        negotiation_agent = self._create_negotiation_agent(
+            self._create_model("negotiation_agent")
+        )
+        closing_agent = self._create_closing_agent(self._create_model("closing_agent"))
         
-        # Create Swarm
-        swarm = Swarm(
+        # Create Swarm (node input laid out for provider prompt caching)
+        swarm = PrefixStableSwarm(
             [
                 sales_agent,
                 researcher_agent,
@@ -181,278 +685,188 @@ class SwarmSalesAgent(LoggerMixin):
 
         return swarm
 
+    def _create_openai_client(self) -> AsyncOpenAI:
+        """Create the OpenAI client shared by all agents.
+
+        The client is passed to each OpenAIModel as ``client``, so Strands reuses
+        its connection pool instead of opening (and closing) a client per request.
+        It is closed in ``aclose()``.
+
+        Returns:
+            AsyncOpenAI instance
+        """
+        # Handle SSL verification for corporate proxies/self-signed certificates
+        # Option 1: Use truststore (recommended) - injected at import in server.py
+        # Option 2: Disable SSL verification (development only)
+        if not self.settings.ssl_verify:
+            self.logger.warning(
+                "SSL verification desabilitada - APENAS PARA DESENVOLVIMENTO",
+                hint="NÃO use SSL_VERIFY=false em produção! Use truststore em vez disso."
+            )
+
+        http_client = httpx.AsyncClient(
+            verify=self.settings.ssl_verify,
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0,
+            ),
+            # HTTP/2 multiplexes concurrent agent calls over one connection;
+            # requires the optional h2 package (pip install -e ".[http2]")
+            http2=find_spec("h2") is not None,
+        )
+        # No per-request retries: each of the six agents would retry on its own.
+        # Transient failures are retried once per turn in _invoke_swarm(), and
+        # rate limits by Strands' event loop
+        return AsyncOpenAI(
+            api_key=self.settings.openai_api_key,
+            http_client=http_client,
+            max_retries=0,
+        )
+
+    def _create_model(self, agent_name: str) -> OpenAIModel:
+        """Create the OpenAIModel for one agent.
+
+        Args:
+            agent_name: Agent name, used as the provider prompt-cache routing key
+
+        Returns:
+            OpenAIModel instance
+        """
+        return OpenAIModel(
+            client=self.openai_client,
+            model_id=self.settings.model_name,
+            params={
+                "max_tokens": self.settings.max_tokens,
+                "temperature": self.settings.temperature,
+            },
+            cache_config=CacheConfig(cache_key=f"sales-agents-{agent_name}"),
+        )
+
     def _create_researcher_agent(self, model: OpenAIModel) -> Agent:
         """Create researcher agent."""
-        default_cnpj_text = self.default_cnpj or "12345678000190"
-        
-        system_prompt = f"""Você é um pesquisador especializado em coletar informações sobre clientes restaurantes.
-
-Quando chamado pelo sales_agent, você DEVE:
-1. Usar a tool obter_info_restaurante com CNPJ={default_cnpj_text}
-2. Usar a tool buscar_cliente_ifood com CNPJ={default_cnpj_text}
-3. Analisar essas informações e compartilhar um resumo no contexto compartilhado do Swarm
+        system_prompt = self._prompts["researcher"]
 
-Depois de coletar, faça handoff de volta para o sales_agent com um resumo claro."""
-        
         return Agent(
             name="researcher",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Coleta e analisa informações do cliente automaticamente",
         )
 
     def _create_sales_agent(self, model: OpenAIModel) -> Agent:
         """Create main sales agent."""
-        default_cnpj_text = self.default_cnpj or "12345678000190"
-        system_prompt = f"""Você é um vendedor especializado da Maquinona iFood Pago.
-
-OBJETIVO: Conduzir a conversa de forma natural e empática, identificando necessidades e CONDUZINDO PARA CONVERSÃO.
-
-INÍCIO DA CONVERSA:
-Quando a conversa iniciar, você DEVE:
-1. Primeiro, fazer handoff para o researcher_agent para buscar informações do cliente (CNPJ {default_cnpj_text})
-2. Aguardar o researcher coletar as informações
-3. Quando o researcher retornar, use essas informações para PERSONALIZAR a conversa
-
-SOBRE A MAQUINONA:
-A Maquinona combina máquina de pagamento com inteligência de marketing do iFood. Ela ajuda restaurantes a:
-- AUMENTAR VENDAS com campanhas de marketing inteligentes
-- FIDELIZAR CLIENTES com programas de cashback e cupons automáticos via WhatsApp
-- TER DADOS E INSIGHTS sobre o negócio
-- ACEITAR TODAS AS BANDEIRAS (crédito, débito, vale-refeição)
-
-COMO CONDUZIR A CONVERSA:
-1. Use as informações do cliente coletadas pelo researcher
-2. Seja natural e conversacional
-3. Faça perguntas ESTRATÉGICAS para identificar necessidades
-4. ESCUTE ATENTAMENTE e identifique dores reais
-5. CONECTE as necessidades identificadas com os benefícios da Maquinona
-6. Destaque benefícios ESPECÍFICOS que resolvem os problemas mencionados
+        system_prompt = self._prompts["sales"]
 
-PROGRESSÃO NATURAL:
-- Comece cumprimentando e mencionando algo específico sobre o restaurante
-- Identifique necessidades através de perguntas naturais
-- Quando identificar interesse, APRESENTE A SOLUÇÃO IMEDIATAMENTE
-- Se o cliente perguntar sobre preço, use calcular_preco_personalizado
-- Se precisar qualificar melhor (BANT), faça handoff para qualification_agent
-- Se precisar apresentar detalhes, faça handoff para presentation_agent
-- Se houver objeções, faça handoff para negotiation_agent
-- Se o cliente mostrar interesse em contratar, faça handoff IMEDIATAMENTE para closing_agent
-
-Responda SEMPRE em português brasileiro."""
-        
         return Agent(
             name="sales_agent",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Agente principal de vendas da Maquinona",
         )
 
     def _create_qualification_agent(self, model: OpenAIModel) -> Agent:
         """Create qualification agent."""
-        system_prompt = """Você é um especialista em qualificação de leads usando a metodologia BANT.
+        system_prompt = self._prompts["qualification"]
 
-Sua função é qualificar leads de forma natural mas EFETIVA:
-- Budget: Entender o orçamento disponível
-- Authority: Identificar quem tem poder de decisão
-- Need: Confirmar a necessidade real do restaurante
-- Timeline: Entender quando precisam da solução
-
-ESTRATÉGIA:
-1. Faça perguntas que confirmem o FIT do restaurante com a Maquinona
-2. Identifique sinais de ALTO POTENCIAL
-3. Use as tools qualificar_lead e calcular_lead_score quando tiver informações suficientes
-4. Se o lead_score for ALTO, recomende avançar para apresentação ou fechamento
-
-Após qualificar, faça handoff de volta para o sales_agent com:
-- Resumo da qualificação (BANT completo)
-- Lead score e justificativa
-- RECOMENDAÇÃO CLARA de próximos passos"""
-        
         return Agent(
             name="qualification_agent",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Qualifica leads usando metodologia BANT",
         )
 
     def _create_presentation_agent(self, model: OpenAIModel) -> Agent:
         """Create presentation agent."""
-        system_prompt = """Você é um especialista em apresentar soluções personalizadas para restaurantes.
-
-Sua função é criar uma apresentação CONVINCENTE e PERSONALIZADA:
-1. Use as informações do cliente para PERSONALIZAR
-2. Apresente a Maquinona destacando benefícios ESPECÍFICOS para o perfil do restaurante
-3. Use tools como recomendar_produtos e avaliar_fit_produto para personalizar
-4. Seja entusiasta mas autêntico
-5. Use CASOS DE SUCESSO quando apropriado
-6. Destaque BENEFÍCIOS TANGÍVEIS
-
-ESTRUTURA:
-- Comece com o PROBLEMA identificado
-- Apresente a Maquinona como SOLUÇÃO
-- Destaque BENEFÍCIOS que resolvem a dor
-- Termine com um CALL TO ACTION claro
+        system_prompt = self._prompts["presentation"]
 
-Após apresentar, faça handoff:
-- Para o sales_agent se a apresentação foi bem recebida
-- Para o negotiation_agent se houver objeções
-- Para o closing_agent se o cliente mostrar interesse claro"""
-        
         return Agent(
             name="presentation_agent",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Apresenta soluções personalizadas baseado no perfil do restaurante",
         )
 
     def _create_negotiation_agent(self, model: OpenAIModel) -> Agent:
         """Create negotiation agent."""
-        system_prompt = """Você é um especialista em negociação e tratamento de objeções.
-
-Sua função é resolver objeções de forma empática e construtiva:
-1. Identifique o tipo de objeção (preço, timing, necessidade, concorrência)
-2. Valide a preocupação do cliente
-3. Apresente argumentos sólidos e use tools quando necessário
-4. Negocie termos quando apropriado
-5. CONVERTA objeções em oportunidades
+        system_prompt = self._prompts["negotiation"]
 
-ESTRATÉGIAS POR TIPO DE OBJEÇÃO:
-- PREÇO: Destaque ROI, compare com concorrência, ofereça condições especiais
-- TIMING: Crie urgência se apropriado, mostre que implementação é rápida
-- NECESSIDADE: Reforce os benefícios identificados, use dados do restaurante
-- CONCORRÊNCIA: Destaque diferenciais da Maquinona
-
-Após resolver objeções:
-- Se objeções foram resolvidas e há interesse, faça handoff para o closing_agent
-- Se ainda há dúvidas, faça handoff para o sales_agent"""
-        
         return Agent(
             name="negotiation_agent",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Trata objeções e negocia termos quando necessário",
         )
 
     def _create_closing_agent(self, model: OpenAIModel) -> Agent:
         """Create closing agent."""
-        system_prompt = """Você é um especialista em fechar vendas de forma natural e empática.
+        system_prompt = self._prompts["closing"]
 
-Sua função é finalizar a venda de forma POSITIVA e EFICIENTE:
-1. Confirme o interesse do cliente de forma natural mas CLARA
-2. Colete informações necessárias de forma CONVERSACIONAL mas DIRETA:
-   - Nome completo, CNPJ, Email, Telefone
-   - Cidade e estado, Número de mesas, Faturamento mensal
-3. Use a tool concluir_compra quando tiver TODAS as informações
-4. Agradeça e explique os próximos passos de forma CLARA
-
-ESTRATÉGIA:
-- Seja EFICIENTE: não prolongue desnecessariamente
-- Seja POSITIVO: celebre o fechamento
-- Seja CLARO: explique exatamente o que acontece a seguir
-- Seja PROFISSIONAL: mostre que o cliente fez uma boa escolha
-
-IMPORTANTE:
-- NÃO perca a venda por não coletar todas as informações necessárias
-- Use a tool concluir_compra assim que tiver todos os dados"""
-        
         return Agent(
             name="closing_agent",
             model=model,
             system_prompt=system_prompt,
-            tools=self.strands_tools if self.strands_tools else None,
+            tools=self._agent_tools,
             description="Finaliza vendas e coleta informações necessárias",
         )
 
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections (OpenAI client and MCP tools)."""
+        await self.openai_client.close()
+        await self.mcp_tools.aclose()
+
     async def process(
         self,
         message: str,
         context: Optional[Dict[str, Any]] = None,
+        turn_index: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Process message using Swarm.
 
         Args:
             message: User message
             context: Additional context
+            turn_index: Number of earlier user turns in the conversation; only
+                the first turn (0) of a conversation uses the semantic cache
 
         Returns:
             Response dictionary with result and telemetry
         """
         self.logger.info("Processando mensagem com Swarm", message_length=len(message))
 
-        try:
-            # Execute Swarm
-            result = await self.swarm.invoke_async(message)
-            
-            # Extract response
-            status = "completed"
-            if hasattr(result, 'status'):
-                status = result.status.value if hasattr(result.status, 'value') else str(result.status)
-            
-            response_text = ""
-            if hasattr(result, 'results') and result.results:
-                # Get the last successful node result
-                node_results = list(result.results.values())
-                for node_result in reversed(node_results):
-                    if hasattr(node_result, 'result') and node_result.result:
-                        result_obj = node_result.result
-                        if isinstance(result_obj, str):
-                            response_text = result_obj
-                            break
-                        elif hasattr(result_obj, 'text'):
-                            response_text = str(result_obj.text)
-                            break
-                        elif hasattr(result_obj, 'content'):
-                            content = result_obj.content
-                            if isinstance(content, str):
-                                response_text = content
-                                break
-            
-            if not response_text:
-                response_text = "Desculpe, não consegui gerar uma resposta. Pode repetir sua mensagem?"
-
-            # Get node history for telemetry
-            node_history = []
-            agents_used = []
-            if hasattr(result, 'node_history'):
-                for node in result.node_history:
-                    node_id = node.node_id if hasattr(node, 'node_id') else str(node)
-                    node_status = node.status.value if hasattr(node, 'status') and hasattr(node.status, 'value') else str(getattr(node, 'status', 'unknown'))
-                    node_history.append({
-                        "node_id": node_id,
-                        "status": node_status,
-                    })
-                    if node_id not in agents_used:
-                        agents_used.append(node_id)
-
-            # Get execution metrics
-            execution_count = getattr(result, 'execution_count', 0)
-            execution_time = getattr(result, 'execution_time', 0)
-            accumulated_usage = getattr(result, 'accumulated_usage', {})
-            
-            if hasattr(accumulated_usage, '__dict__'):
-                accumulated_usage = {
-                    'inputTokens': getattr(accumulated_usage, 'inputTokens', 0),
-                    'outputTokens': getattr(accumulated_usage, 'outputTokens', 0),
-                    'totalTokens': getattr(accumulated_usage, 'totalTokens', 0),
-                }
+        # Only the first message of a conversation, without context or
+        # customer identifiers, is answered from the cache
+        use_cache = (
+            self._semantic_cache is not None
+            and turn_index == 0
+            and not context
+            and not _IDENTIFIER_RE.search(message)
+        )
+        if use_cache:
+            cached = self._get_cached_response(message)
+            if cached is not None:
+                return cached
 
+        try:
+            result = await self._invoke_swarm(message)
+            response = self._build_response(result)
+            if use_cache and not _called_tools(result):
+                self._cache_response(message, response)
+            return response
+        except asyncio.TimeoutError:
+            self.logger.error(
+                "Timeout ao processar mensagem com Swarm",
+                timeout=self.settings.swarm_execution_timeout,
+            )
             return {
-                "response": response_text,
-                "status": status,
-                "node_history": node_history,
-                "execution_count": execution_count,
-                "execution_time": execution_time,
-                "accumulated_usage": accumulated_usage,
-                "telemetry": {
-                    "agents_used": agents_used,
-                    "total_handoffs": len(node_history) - 1 if len(node_history) > 1 else 0,
-                },
+                "response": "Desculpe, a resposta demorou mais do que o esperado. Por favor, tente novamente.",
+                "status": "failed",
+                "error": f"Timeout de {self.settings.swarm_execution_timeout}s excedido",
             }
         except Exception as e:
             self.logger.error("Erro ao processar mensagem com Swarm", error=str(e), exc_info=True)
@@ -462,6 +876,244 @@ IMPORTANTE:
                 "error": str(e),
             }
 
+    def _get_cached_response(self, message: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached reply for an opening message.
+
+        Args:
+            message: User message
+
+        Returns:
+            Cached response marked with ``cache_hit`` telemetry, or None on a miss
+        """
+        self._cache_lookups += 1
+        cached = self._semantic_cache.get(_OPENING_STAGE, message)
+        if cached is not None:
+            self._cache_hits += 1
+        self.logger.info(
+            "Semantic cache consultado",
+            hit=cached is not None,
+            hit_rate=round(self._cache_hits / self._cache_lookups, 3),
+        )
+        if cached is None:
+            return None
+
+        # No Swarm work was done for this reply
+        return {
+            **cached,
+            "execution_count": 0,
+            "execution_time": 0,
+            "accumulated_usage": {},
+            "telemetry": {**cached["telemetry"], "cache_hit": True},
+        }
+
+    def _cache_response(self, message: str, response: Dict[str, Any]) -> None:
+        """Cache a reply to an opening message.
+
+        Failed turns, turns that reached the closing agent (which registers
+        purchases) and replies containing customer identifiers are never
+        cached; callers also skip turns that called tools.
+
+        Args:
+            message: User message
+            response: Response dictionary from ``_build_response()``
+        """
+        if response["status"] != "completed" or response["response"] == _FALLBACK_RESPONSE:
+            return
+        if "closing_agent" in response["telemetry"]["agents_used"]:
+            return
+        if _IDENTIFIER_RE.search(response["response"]):
+            return
+        self._semantic_cache.put(_OPENING_STAGE, message, response)
+
+    async def _invoke_swarm(self, message: str) -> Any:
+        """Run the Swarm, retrying turns that failed on a transient connection error.
+
+        Retries use exponential backoff (1s, 2s, ... up to 10s), for up to
+        ``_RETRY_ATTEMPTS`` attempts in total. ``swarm_execution_timeout``
+        bounds each attempt, not the whole retry loop nor the wait for a turn
+        running on the same Swarm.
+
+        Args:
+            message: User message
+
+        Returns:
+            Swarm execution result
+        """
+        delay = _RETRY_INITIAL_DELAY
+        for attempt in range(1, _RETRY_ATTEMPTS + 1):
+            try:
+                async with self._swarm_lock:
+                    # The Swarm checks execution_timeout only between nodes; the
+                    # outer bound also cancels a node stuck mid-call
+                    result = await asyncio.wait_for(
+                        self.swarm.invoke_async(message),
+                        timeout=self.settings.swarm_execution_timeout,
+                    )
+            except _TRANSIENT_ERRORS:
+                if attempt == _RETRY_ATTEMPTS:
+                    raise
+            else:
+                if attempt == _RETRY_ATTEMPTS or not _is_retryable_failure(result):
+                    return result
+
+            self.logger.warning(
+                "Falha transitória no Swarm, tentando novamente",
+                attempt=attempt,
+                delay=delay,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RETRY_MAX_DELAY)
+
+    async def process_batch(
+        self,
+        items: List[Tuple[str, str]],
+        poll_interval: float = 30.0,
+    ) -> List[Dict[str, Any]]:
+        """Process messages offline through the OpenAI Batch API.
+
+        For non-interactive workloads (evaluations, bulk outreach), where the
+        Batch API's lower price outweighs its completion window of up to 24h.
+        Batch requests cannot call tools or hand off, so each message is
+        answered by the sales agent's prompt alone, built for its CNPJ; the
+        Swarm is not used.
+
+        Args:
+            items: (CNPJ, message) pairs
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            One dictionary per item, in input order, with cnpj, message,
+            response and status ("completed" or "failed", plus error)
+        """
+        lines = []
+        for index, (cnpj, message) in enumerate(items):
+            request = {
+                "custom_id": f"{cnpj}:{index}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.settings.model_name,
+                    "messages": [
+                        {"role": "system", "content": _build_system_prompts(cnpj)["sales"]},
+                        {"role": "user", "content": message},
+                    ],
+                    "max_tokens": self.settings.max_tokens,
+                    "temperature": self.settings.temperature,
+                },
+            }
+            lines.append(json.dumps(request, ensure_ascii=False))
+
+        batch_file = await self.openai_client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        self.logger.info("Batch enviado", batch_id=batch.id, requests=len(items))
+
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            await asyncio.sleep(poll_interval)
+            batch = await self.openai_client.batches.retrieve(batch.id)
+        self.logger.info(
+            "Batch finalizado",
+            batch_id=batch.id,
+            status=batch.status,
+            request_counts=batch.request_counts.model_dump() if batch.request_counts else None,
+        )
+
+        # Successful and failed requests come back in separate JSONL files
+        records: Dict[str, Dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.openai_client.files.content(file_id)
+                for line in content.text.splitlines():
+                    if line:
+                        record = _json_loads(line)
+                        records[record["custom_id"]] = record
+
+        return [
+            _batch_item_result(cnpj, message, records.get(f"{cnpj}:{index}"), batch.status)
+            for index, (cnpj, message) in enumerate(items)
+        ]
+
+    def _build_response(self, result: Any) -> Dict[str, Any]:
+        """Convert a Swarm result into the response dictionary.
+
+        Args:
+            result: Swarm execution result
+
+        Returns:
+            Response dictionary with result and telemetry
+        """
+        # Extract response (getattr with a sentinel: no hasattr double lookups)
+        result_status = getattr(result, "status", _MISSING)
+        if result_status is _MISSING:
+            status = "completed"
+        else:
+            status = str(getattr(result_status, "value", result_status))
+        
+        # The terminal node (last in node_history) holds the reply
+        response_text = ""
+        swarm_nodes = getattr(result, "node_history", None)
+        results = getattr(result, "results", None)
+        if swarm_nodes and results:
+            node_result = results.get(swarm_nodes[-1].node_id)
+            if node_result is not None:
+                response_text = _extract_text(node_result.result)
+        
+        if not response_text:
+            response_text = _FALLBACK_RESPONSE
+
+        # Get node history for telemetry; the status of each node lives in its
+        # NodeResult (SwarmNode itself has none)
+        try:
+            statuses = {
+                node_id: node_result.status.value
+                for node_id, node_result in (results or {}).items()
+            }
+            node_history = [
+                {"node_id": node.node_id, "status": statuses.get(node.node_id, "unknown")}
+                for node in swarm_nodes or ()
+            ]
+        except AttributeError:
+            node_history = []
+        # Unique agents in first-use order
+        agents_used = list(dict.fromkeys(entry["node_id"] for entry in node_history))
+
+        # Get execution metrics
+        execution_count = getattr(result, 'execution_count', 0)
+        execution_time = getattr(result, 'execution_time', 0)
+        accumulated_usage = getattr(result, 'accumulated_usage', {})
+
+        # Strands' Usage is a TypedDict (passed through as-is); usage objects
+        # exposing the counters as attributes are converted to the same shape
+        try:
+            input_tokens, output_tokens, total_tokens = _USAGE_GETTER(accumulated_usage)
+            accumulated_usage = {
+                'inputTokens': input_tokens,
+                'outputTokens': output_tokens,
+                'totalTokens': total_tokens,
+            }
+        except AttributeError:
+            if not isinstance(accumulated_usage, dict):
+                accumulated_usage = {}
+
+        return {
+            "response": response_text,
+            "status": status,
+            "node_history": node_history,
+            "execution_count": execution_count,
+            "execution_time": execution_time,
+            "accumulated_usage": accumulated_usage,
+            "telemetry": {
+                "agents_used": agents_used,
+                "total_handoffs": len(node_history) - 1 if len(node_history) > 1 else 0,
+            },
+        }
+
     async def stream(
         self,
         message: str,
@@ -469,21 +1121,87 @@ IMPORTANTE:
     ):
         """Stream events from Swarm execution.
 
+        Swarm events are read by a producer task into a bounded queue, so a slow
+        consumer applies backpressure to the Swarm. Consecutive text chunks from
+        the same agent are coalesced for up to ``_STREAM_COALESCE_NS`` into one
+        ``multiagent_node_stream`` event carrying only ``{"data": text}``; raw
+        model chunks, which duplicate those text events, are dropped. Control
+        events (handoffs, tool calls, node start/stop) pass through unbatched.
+
         Args:
             message: User message
             context: Additional context
 
         Yields:
-            Event dictionaries
+            Event dictionaries; the final Swarm result is converted into a
+            ``{"type": "result", ...}`` event with the same shape as ``process()``
         """
         self.logger.info("Iniciando streaming de eventos do Swarm")
 
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+
+        async def produce() -> None:
+            try:
+                async with self._swarm_lock:
+                    async for event in self.swarm.stream_async(message):
+                        await queue.put(event)
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(_STREAM_END)
+
+        producer = asyncio.create_task(produce())
+        node_id: Optional[str] = None
+        chunks: List[str] = []
+        deadline = 0
+
         try:
-            async for event in self.swarm.stream_async(message):
-                yield event
+            while True:
+                if chunks:
+                    # Wait for more text only until the coalescing window closes
+                    timeout = max(deadline - time.monotonic_ns(), 0) / 1e9
+                    try:
+                        event = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        yield _text_event(node_id, chunks)
+                        chunks = []
+                        continue
+                else:
+                    event = await queue.get()
+
+                text = _stream_text(event)
+                if _is_raw_model_chunk(event):
+                    continue
+                if text is not None and chunks and event["node_id"] == node_id:
+                    chunks.append(text)
+                    if time.monotonic_ns() >= deadline:
+                        yield _text_event(node_id, chunks)
+                        chunks = []
+                    continue
+
+                if chunks:
+                    yield _text_event(node_id, chunks)
+                    chunks = []
+
+                if text is not None:
+                    node_id = event["node_id"]
+                    chunks = [text]
+                    deadline = time.monotonic_ns() + _STREAM_COALESCE_NS
+                elif event is _STREAM_END:
+                    break
+                elif isinstance(event, Exception):
+                    raise event
+                elif event.get("type") == "multiagent_result":
+                    yield {"type": "result", **self._build_response(event["result"])}
+                else:
+                    yield event
         except Exception as e:
             self.logger.error("Erro ao fazer streaming", error=str(e), exc_info=True)
             yield {
                 "type": "error",
                 "error": str(e),
             }
+        finally:
+            # Stop the Swarm when the consumer stops early, and wait for it so
+            # no task outlives the stream
+            producer.cancel()
+            await asyncio.wait({producer})
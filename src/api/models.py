@@ -3,12 +3,17 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Immutable and strict: unknown fields are rejected instead of being carried along
+API_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 
 class ChatMessage(BaseModel):
     """Chat message request model."""
 
+    model_config = API_MODEL_CONFIG
+
     message: str = Field(..., description="Mensagem do usuário")
     conversation_id: Optional[str] = Field(None, description="ID da conversa (opcional)")
     context: Optional[Dict[str, Any]] = Field(None, description="Contexto adicional")
@@ -17,6 +22,8 @@ class ChatMessage(BaseModel):
 class ChatResponse(BaseModel):
     """Chat response model."""
 
+    model_config = API_MODEL_CONFIG
+
     conversation_id: str = Field(..., description="ID da conversa")
     response: str = Field(..., description="Resposta do agente")
     agent_id: str = Field(..., description="ID do agente que processou")
@@ -25,11 +32,32 @@ class ChatResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Metadados adicionais")
 
 
+class HistoryMessage(BaseModel):
+    """Message entry of a conversation history."""
+
+    model_config = API_MODEL_CONFIG
+
+    role: str = Field(..., description="Papel do autor (user, agent, system)")
+    content: str = Field(..., description="Conteúdo da mensagem")
+    timestamp: datetime = Field(..., description="Data e hora da mensagem")
+    agent_id: Optional[str] = Field(None, description="ID do agente que respondeu")
+
+
+class ConversationCreated(BaseModel):
+    """New conversation response model."""
+
+    model_config = API_MODEL_CONFIG
+
+    conversation_id: str = Field(..., description="ID da nova conversa")
+
+
 class ConversationHistory(BaseModel):
     """Conversation history model."""
 
+    model_config = API_MODEL_CONFIG
+
     conversation_id: str = Field(..., description="ID da conversa")
-    messages: List[Dict[str, Any]] = Field(..., description="Histórico de mensagens")
+    messages: List[HistoryMessage] = Field(..., description="Histórico de mensagens")
     current_stage: str = Field(..., description="Estágio atual")
     lead_id: Optional[str] = Field(None, description="ID do lead associado")
 
@@ -37,6 +65,8 @@ class ConversationHistory(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response model."""
 
+    model_config = API_MODEL_CONFIG
+
     status: str = Field(..., description="Status do serviço")
     agents_count: int = Field(..., description="Número de agentes registrados")
     active_conversations: int = Field(..., description="Número de conversas ativas")
@@ -45,6 +75,8 @@ class HealthResponse(BaseModel):
 class AuditLogResponse(BaseModel):
     """Audit log entry response."""
 
+    model_config = API_MODEL_CONFIG
+
     timestamp: datetime = Field(..., description="When the decision was made")
     agent_id: str = Field(..., description="Agent that made the decision")
     decision_type: str = Field(..., description="Type of decision")
@@ -57,6 +89,8 @@ class AuditLogResponse(BaseModel):
 class AuditLogsResponse(BaseModel):
     """Audit logs response for a conversation."""
 
+    model_config = API_MODEL_CONFIG
+
     conversation_id: str = Field(..., description="Conversation ID")
     total_logs: int = Field(..., description="Total number of audit logs")
     logs: List[AuditLogResponse] = Field(..., description="List of audit logs")
@@ -1,63 +1,147 @@
 """FastAPI server using Strands Agents."""
 
+import asyncio
+import logging
 import os
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from typing import Any, Optional
+from functools import partial
+from operator import attrgetter, itemgetter
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-import json
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 
 from src.api.models import (
     AuditLogResponse,
     AuditLogsResponse,
     ChatMessage,
     ChatResponse,
+    ConversationCreated,
     ConversationHistory,
     HealthResponse,
+    HistoryMessage,
 )
 from src.config.settings import get_settings
+from src.models.conversation import Conversation
 from src.orchestrator.swarm_orchestrator import SwarmOrchestrator
 from src.utils.logger import configure_logging, get_logger
 
-# Configure logging
-configure_logging()
+# SSE event encoding: orjson when installed (pip install -e ".[speedups]").
+# Events forwarded from the Swarm may carry SDK objects (dataclasses,
+# exceptions), which are rendered with str() as before
+try:
+    import orjson
+
+    def _encode_event(event: Any) -> bytes:
+        """Encode an SSE event payload as JSON bytes."""
+        return orjson.dumps(
+            event,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+except ImportError:
+    import json
+
+    def _encode_event(event: Any) -> bytes:
+        """Encode an SSE event payload as JSON bytes."""
+        return json.dumps(event, default=str, ensure_ascii=False).encode("utf-8")
+
+# SSE wire framing around each encoded event
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+# SSE frames arriving close together are written in one chunk: a buffered
+# frame waits at most _SSE_FLUSH_INTERVAL seconds, or until _SSE_FLUSH_BYTES
+_SSE_FLUSH_INTERVAL = 0.005
+_SSE_FLUSH_BYTES = 4096
+
+# Constant root payload, encoded once
+_ROOT_BODY = _encode_event({
+    "message": "Sales Agents API",
+    "version": "1.0.0",
+    "framework": "Strands Agents",
+    "docs": "/docs",
+})
+
+# researcher, sales_agent, qualification, presentation, negotiation, closing
+_AGENTS_COUNT = 6
+
+# Last encoded /health body, keyed on the active conversation count, which is
+# the only part of the payload that changes
+_health_body: Optional[Tuple[int, bytes]] = None
+
+# Fields of a conversation message exposed as HistoryMessage
+_HISTORY_FIELDS = ("role", "content", "timestamp", "agent_id")
+_history_fields = attrgetter(*_HISTORY_FIELDS)
+
+# Required fields of a successful orchestrator result, read in one call
+_chat_result_fields = itemgetter("conversation_id", "response", "agent_id", "stage")
+
+# Histories from this size on are streamed in batches instead of being
+# encoded into a single buffer
+_HISTORY_STREAM_MIN_MESSAGES = 500
+_HISTORY_STREAM_BATCH = 100
+_history_batch_adapter = TypeAdapter(List[HistoryMessage])
+
+# Recent /chat calls by (conversation_id, Idempotency-Key header): a retried
+# or double-submitted request within the window gets the same reply instead of
+# being processed again, and concurrent duplicates share one execution
+_CHAT_DEDUP_TTL = 30.0
+_CHAT_DEDUP_MAX_ENTRIES = 1024
+_recent_chats: "OrderedDict[Tuple[str, str], Tuple[float, asyncio.Future]]" = OrderedDict()
+
+# Configure logging. Read from the process environment because settings are
+# only loaded in lifespan; LOG_LEVEL=WARNING drops the per-request INFO logs
+configure_logging(os.getenv("LOG_LEVEL", "INFO"))
 logger = get_logger(__name__)
+# Checked once: per-request INFO logs skip building their arguments when off
+_LOG_INFO = logger.is_enabled_for(logging.INFO)
+
+
+def _inject_truststore() -> None:
+    """Make SSL use the system certificate store, unless USE_TRUSTSTORE is off."""
+    if os.getenv("USE_TRUSTSTORE", "true").lower() in ("false", "0", "no", "off"):
+        return
+    try:
+        import truststore
+        truststore.inject_into_ssl()
+        logger.info("Truststore injetado - usando certificados do sistema")
+    except ImportError:
+        logger.info(
+            "Truststore não instalado - usando certificados padrão do Python",
+            hint="Para ambientes corporativos, instale: pip install truststore"
+        )
+    except Exception as e:
+        logger.warning(
+            "Erro ao injetar truststore, usando certificados padrão",
+            error=str(e)
+        )
+
+
+# Configure SSL/truststore at import, before any HTTP client can be created;
+# settings stay in lifespan so the app can be imported without a .env
+_inject_truststore()
 
 # Global orchestrator instance
 orchestrator: Optional[SwarmOrchestrator] = None
 
+# Open /chat/stream slots (MAX_CONCURRENT_STREAMS), created in lifespan
+stream_slots: Optional[asyncio.Semaphore] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
-    global orchestrator
+    global orchestrator, stream_slots
 
     # Startup
     logger.info("Inicializando Sales Agents API...")
     
-    # Configure SSL/truststore BEFORE loading settings
-    # This must be done before any HTTP clients are created
-    try:
-        if os.getenv("USE_TRUSTSTORE", "true").lower() not in ("false", "0", "no", "off"):
-            try:
-                import truststore
-                truststore.inject_into_ssl()
-                logger.info("Truststore injetado - usando certificados do sistema")
-            except ImportError:
-                logger.info(
-                    "Truststore não instalado - usando certificados padrão do Python",
-                    hint="Para ambientes corporativos, instale: pip install truststore"
-                )
-            except Exception as e:
-                logger.warning(
-                    "Erro ao injetar truststore, usando certificados padrão",
-                    error=str(e)
-                )
-    except Exception as e:
-        logger.warning("Erro ao configurar truststore", error=str(e))
-    
     try:
         settings = get_settings()
     except ValueError as e:
@@ -81,6 +165,11 @@ async def lifespan(app: FastAPI):
             f"Erro inesperado ao carregar configurações: {str(e)}"
         ) from e
 
+    # Resolved once; handlers read request.app.state.settings instead of
+    # calling get_settings() per request
+    app.state.settings = settings
+    stream_slots = asyncio.Semaphore(settings.max_concurrent_streams)
+
     # Initialize Swarm Orchestrator
     try:
         orchestrator = SwarmOrchestrator(settings=settings)
@@ -100,9 +189,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Encerrando Sales Agents API...")
+    if orchestrator is not None:
+        await orchestrator.aclose()
 
 
-# Create FastAPI app
+# Create FastAPI app. JSON routes declare a response_model, so FastAPI
+# serializes them straight to bytes with pydantic-core; setting a custom
+# default_response_class would disable that path
 app = FastAPI(
     title="Sales Agents API",
     description="API para o ecossistema de agentes de vendas usando Strands Agents",
@@ -111,48 +204,111 @@ app = FastAPI(
 )
 
 # Add CORS middleware
+# CORS_ORIGINS is a comma-separated allow-list (default "*"); browsers cache
+# preflight answers for max_age seconds
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[
+        origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+    ],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint."""
-    return {
-        "message": "Sales Agents API",
-        "version": "1.0.0",
-        "framework": "Strands Agents",
-        "docs": "/docs",
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Health check endpoint."""
+    global _health_body
+
     if orchestrator is None:
         raise HTTPException(status_code=503, detail="Orquestrador não inicializado")
-    
+
     conversations_count = len(orchestrator.conversations)
-    agents_count = 6  # researcher, sales_agent, qualification, presentation, negotiation, closing
-    
-    return HealthResponse(
-        status="healthy",
-        agents_count=agents_count,
-        active_conversations=conversations_count,
-    )
+    if _health_body is None or _health_body[0] != conversations_count:
+        health = HealthResponse(
+            status="healthy",
+            agents_count=_AGENTS_COUNT,
+            active_conversations=conversations_count,
+        )
+        _health_body = (conversations_count, health.model_dump_json().encode("utf-8"))
+
+    return Response(_health_body[1], media_type="application/json")
+
+
+def _chat_failed(task: asyncio.Future) -> bool:
+    """Whether a /chat execution raised, returned an error or a failed Swarm turn."""
+    if task.cancelled() or task.exception() is not None:
+        return True
+    result = task.result()
+    return "error" in result or result.get("metadata", {}).get("status") != "completed"
+
+
+def _forget_failed_chat(key: Tuple[str, str], task: asyncio.Future) -> None:
+    """Drop a deduplicated /chat entry whose execution did not succeed."""
+    if _chat_failed(task) and _recent_chats.get(key, (None, None))[1] is task:
+        del _recent_chats[key]
+
+
+async def _process_chat(message: ChatMessage, idempotency_key: Optional[str]) -> Dict[str, Any]:
+    """Process a /chat message, reusing a recent call with the same idempotency key.
+
+    Only requests carrying an Idempotency-Key are deduplicated: the same text
+    sent twice (e.g. "sim") is otherwise two turns of the conversation.
+    """
+    if not idempotency_key:
+        return await orchestrator.process_message(
+            message=message.message,
+            conversation_id=message.conversation_id,
+            context=message.context,
+        )
+
+    now = time.monotonic()
+    # Entries are in insertion order with the same TTL, so expired ones form a prefix
+    while _recent_chats and next(iter(_recent_chats.values()))[0] <= now:
+        _recent_chats.popitem(last=False)
+
+    key = (message.conversation_id or "", idempotency_key)
+    entry = _recent_chats.get(key)
+    if entry is None or entry[0] <= now:
+        task = asyncio.ensure_future(
+            orchestrator.process_message(
+                message=message.message,
+                conversation_id=message.conversation_id,
+                context=message.context,
+            )
+        )
+        task.add_done_callback(partial(_forget_failed_chat, key))
+        entry = _recent_chats[key] = (now + _CHAT_DEDUP_TTL, task)
+        _recent_chats.move_to_end(key)
+        if len(_recent_chats) > _CHAT_DEDUP_MAX_ENTRIES:
+            _recent_chats.popitem(last=False)
+    elif _LOG_INFO:
+        logger.info("Requisição repetida, reutilizando resposta", conversation_id=key[0])
+
+    # Shielded so a disconnecting client does not cancel a shared execution
+    return await asyncio.shield(entry[1])
 
 
 @app.post("/chat", response_model=ChatResponse, tags=["Chat"])
-async def chat(message: ChatMessage):
+async def chat(
+    message: ChatMessage,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """Processa uma mensagem do chat e retorna resposta do agente.
 
     Args:
         message: Mensagem do usuário e contexto opcional
+        idempotency_key: Chave opcional; repetições com a mesma chave em até
+            30s recebem a mesma resposta sem processar a mensagem de novo
 
     Returns:
         Resposta do agente com metadados
@@ -161,34 +317,35 @@ async def chat(message: ChatMessage):
         raise HTTPException(status_code=503, detail="Orquestrador não inicializado")
 
     try:
-        logger.info(
-            "Processando mensagem",
-            conversation_id=message.conversation_id,
-            message_length=len(message.message),
-        )
+        if _LOG_INFO:
+            logger.info(
+                "Processando mensagem",
+                conversation_id=message.conversation_id,
+                message_length=len(message.message),
+            )
 
-        result = await orchestrator.process_message(
-            message=message.message,
-            conversation_id=message.conversation_id,
-            context=message.context,
-        )
-
-        logger.info(
-            "Mensagem processada",
-            conversation_id=result.get("conversation_id"),
-            agent_id=result.get("agent_id"),
-            stage=result.get("stage"),
-        )
+        result = await _process_chat(message, idempotency_key)
 
         if "error" in result:
             logger.error("Erro no resultado", error=result["error"])
             raise HTTPException(status_code=500, detail=result["error"])
 
-        return ChatResponse(
-            conversation_id=result["conversation_id"],
-            response=result["response"],
-            agent_id=result["agent_id"],
-            stage=result["stage"],
+        conversation_id, response, agent_id, stage = _chat_result_fields(result)
+        if _LOG_INFO:
+            logger.info(
+                "Mensagem processada",
+                conversation_id=conversation_id,
+                agent_id=agent_id,
+                stage=stage,
+            )
+
+        # Fields come typed from SwarmOrchestrator._complete_turn, so field
+        # validation is skipped; the response_model still encodes them
+        return ChatResponse.model_construct(
+            conversation_id=conversation_id,
+            response=response,
+            agent_id=agent_id,
+            stage=stage,
             next_agent=result.get("next_agent"),
             metadata=result.get("metadata", {}),
         )
@@ -209,6 +366,28 @@ async def chat(message: ChatMessage):
         )
 
 
+async def _stream_history(conversation: Conversation) -> AsyncIterator[bytes]:
+    """Encode a conversation history in message batches.
+
+    Produces the same JSON document as the ConversationHistory response model,
+    holding at most one encoded batch of messages at a time.
+    """
+    # Messages appended while streaming belong to the next request
+    total = len(conversation.messages)
+    yield b'{"conversation_id":' + to_json(conversation.id) + b',"messages":['
+    for start in range(0, total, _HISTORY_STREAM_BATCH):
+        batch = [
+            dict(zip(_HISTORY_FIELDS, _history_fields(msg)))
+            for msg in conversation.messages[start:min(start + _HISTORY_STREAM_BATCH, total)]
+        ]
+        encoded = _history_batch_adapter.dump_json(_history_batch_adapter.validate_python(batch))
+        yield (b"," if start else b"") + encoded[1:-1]
+    yield (
+        b'],"current_stage":' + to_json(conversation.current_stage)
+        + b',"lead_id":' + to_json(conversation.lead_id) + b"}"
+    )
+
+
 @app.get("/conversation/{conversation_id}", response_model=ConversationHistory, tags=["Conversation"])
 async def get_conversation(conversation_id: str):
     """Obtém o histórico de uma conversa.
@@ -247,23 +426,24 @@ async def get_conversation(conversation_id: str):
             detail=f"Erro ao buscar conversa: {str(e)}"
         )
 
-    return ConversationHistory(
-        conversation_id=conversation.id,
-        messages=[
-            {
-                "role": msg.role.value,
-                "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
-                "agent_id": msg.agent_id,
-            }
-            for msg in conversation.messages
+    if len(conversation.messages) >= _HISTORY_STREAM_MIN_MESSAGES:
+        return StreamingResponse(_stream_history(conversation), media_type="application/json")
+
+    # Plain dicts: the response_model validates and encodes them in a single
+    # pydantic-core pass instead of building a HistoryMessage per message
+    return {
+        "conversation_id": conversation.id,
+        "messages": [
+            dict(zip(_HISTORY_FIELDS, fields))
+            for fields in map(_history_fields, conversation.messages)
         ],
-        current_stage=conversation.current_stage.value,
-        lead_id=conversation.lead_id,
-    )
+        # Enum or its value (Conversation uses use_enum_values); both validate as str
+        "current_stage": conversation.current_stage,
+        "lead_id": conversation.lead_id,
+    }
 
 
-@app.post("/conversation", tags=["Conversation"])
+@app.post("/conversation", response_model=ConversationCreated, tags=["Conversation"])
 async def create_conversation():
     """Cria uma nova conversa.
 
@@ -279,7 +459,7 @@ async def create_conversation():
             "Conversa criada com sucesso",
             conversation_id=conversation.id
         )
-        return {"conversation_id": conversation.id}
+        return ConversationCreated(conversation_id=conversation.id)
     except Exception as e:
         logger.error(
             "Erro ao criar conversa",
@@ -293,7 +473,7 @@ async def create_conversation():
         )
 
 
-@app.get("/metrics", tags=["Metrics"])
+@app.get("/metrics", response_model=Dict[str, Any], tags=["Metrics"])
 async def get_metrics():
     """Obtém métricas de conversão do sistema.
     
@@ -320,57 +500,119 @@ async def get_metrics():
         }
 
 
+async def _coalesce_frames(frames: AsyncGenerator[bytes, None]) -> AsyncIterator[bytes]:
+    """Merge SSE frames produced within a short window into a single chunk.
+
+    Frames are complete SSE events, so concatenating them keeps the framing.
+    The pending ``__anext__`` is never cancelled on a timeout (that would throw
+    into the source generator); it is awaited again on the next iteration.
+    When the consumer stops early (client disconnect), the pending ``__anext__``
+    is cancelled and the source generator closed, so its cleanup runs now.
+    """
+    loop = asyncio.get_running_loop()
+    buffer = bytearray()
+    deadline = 0.0
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(frames.__anext__())
+            if buffer:
+                done, _ = await asyncio.wait({pending}, timeout=max(deadline - loop.time(), 0))
+                if not done:
+                    yield bytes(buffer)
+                    buffer.clear()
+                    continue
+            try:
+                frame = await pending
+            except StopAsyncIteration:
+                break
+            finally:
+                pending = None
+            if not buffer:
+                deadline = loop.time() + _SSE_FLUSH_INTERVAL
+            buffer += frame
+            if len(buffer) >= _SSE_FLUSH_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            # wait() rather than await: only a cancellation of this task propagates
+            await asyncio.wait({pending})
+            if not pending.cancelled():
+                pending.exception()
+        await frames.aclose()
+
+
 @app.post("/chat/stream", tags=["Chat"])
 async def chat_stream(message: ChatMessage):
     """Processa uma mensagem do chat e retorna eventos de streaming do Swarm.
 
+    Trechos de texto chegam como eventos ``delta`` e o último evento é ``done``,
+    com o mesmo conteúdo da resposta de ``/chat``.
+
     Args:
         message: Mensagem do usuário e contexto opcional
 
     Returns:
         Streaming de eventos do Swarm
     """
-    if orchestrator is None:
+    if orchestrator is None or stream_slots is None:
         raise HTTPException(status_code=503, detail="Orquestrador não inicializado")
+    if stream_slots.locked():
+        logger.warning("Limite de streams simultâneos atingido")
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado. Por favor, tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
 
     async def generate():
-        try:
-            async for event in orchestrator.stream_message(
-                message=message.message,
-                conversation_id=message.conversation_id,
-                context=message.context,
-            ):
-                yield f"data: {json.dumps(event)}\n\n"
-        except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e)
+        # The slot is taken inside the generator so it is always released,
+        # even if the response is dropped before streaming starts
+        async with stream_slots:
+            try:
+                async for event in orchestrator.stream_message(
+                    message=message.message,
+                    conversation_id=message.conversation_id,
+                    context=message.context,
+                ):
+                    yield _SSE_PREFIX + _encode_event(event) + _SSE_SUFFIX
+            except Exception as e:
+                error_type = type(e).__name__
+                error_msg = str(e)
             
-            logger.error(
-                "Erro ao fazer streaming",
-                error=error_msg,
-                error_type=error_type,
-                conversation_id=message.conversation_id,
-                exc_info=True
-            )
+                logger.error(
+                    "Erro ao fazer streaming",
+                    error=error_msg,
+                    error_type=error_type,
+                    conversation_id=message.conversation_id,
+                    exc_info=True
+                )
             
-            error_event = {
-                "type": "error",
-                "error": "Erro ao processar mensagem",
-                "error_type": error_type,
-            }
-            yield f"data: {json.dumps(error_event)}\n\n"
+                error_event = {
+                    "type": "error",
+                    "error": "Erro ao processar mensagem",
+                    "error_type": error_type,
+                }
+                yield _SSE_PREFIX + _encode_event(error_event) + _SSE_SUFFIX
             
-            end_event = {
-                "type": "end",
-                "status": "error"
-            }
-            yield f"data: {json.dumps(end_event)}\n\n"
+                end_event = {
+                    "type": "end",
+                    "status": "error"
+                }
+                yield _SSE_PREFIX + _encode_event(end_event) + _SSE_SUFFIX
 
     return StreamingResponse(
-        generate(),
+        _coalesce_frames(generate()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # Keep reverse proxies (nginx) from buffering the event stream
+            "X-Accel-Buffering": "no",
         },
     )
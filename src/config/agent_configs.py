@@ -1,13 +1,16 @@
 """Agent-specific configurations."""
 
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AgentConfig(BaseModel):
     """Configuration for a specific agent."""
 
+    model_config = ConfigDict(frozen=True)
+
     agent_id: str = Field(..., description="Unique agent identifier")
     name: str = Field(..., description="Agent name")
     description: str = Field(..., description="Agent description")
@@ -24,6 +27,7 @@ class AgentConfigs:
     def __init__(self) -> None:
         """Initialize with default agent configurations."""
         self._configs: Dict[str, AgentConfig] = {}
+        self._view: Mapping[str, AgentConfig] = MappingProxyType(self._configs)
 
     def register(self, config: AgentConfig) -> None:
         """Register an agent configuration.
@@ -44,13 +48,13 @@ class AgentConfigs:
         """
         return self._configs.get(agent_id)
 
-    def get_all(self) -> Dict[str, AgentConfig]:
+    def get_all(self) -> Mapping[str, AgentConfig]:
         """Get all agent configurations.
 
         Returns:
-            Dictionary of all agent configurations
+            Read-only live view of all agent configurations
         """
-        return self._configs.copy()
+        return self._view
 
     def is_enabled(self, agent_id: str) -> bool:
         """Check if an agent is enabled.
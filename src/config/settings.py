@@ -56,6 +56,11 @@ class Settings(BaseSettings):
     swarm_max_handoffs: int = Field(default=20, alias="SWARM_MAX_HANDOFFS")
     swarm_max_iterations: int = Field(default=20, alias="SWARM_MAX_ITERATIONS")
 
+    # Semantic Response Cache (similar opening messages skip the Swarm)
+    semantic_cache_enabled: bool = Field(default=False, alias="SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.92, alias="SEMANTIC_CACHE_THRESHOLD")
+    semantic_cache_ttl: float = Field(default=3600.0, alias="SEMANTIC_CACHE_TTL")
+
     # Client Configuration
     default_client_cnpj: Optional[str] = Field(
         default=None, alias="DEFAULT_CLIENT_CNPJ"
@@ -63,6 +68,8 @@ class Settings(BaseSettings):
 
     # Server Configuration
     server_port: int = Field(default=8000, alias="SERVER_PORT")
+    # Concurrent /chat/stream connections per worker; extra ones get a 503
+    max_concurrent_streams: int = Field(default=32, gt=0, alias="MAX_CONCURRENT_STREAMS")
 
     # SSL Configuration (for development with corporate proxy/self-signed certificates)
     # Use truststore for production (pip install truststore)
@@ -1,17 +1,29 @@
 """Base class for MCP servers."""
 
+import asyncio
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
 from src.utils.logger import LoggerMixin
 
 
+class MCPTransportError(RuntimeError):
+    """Raised when an MCP server cannot be reached.
+
+    Distinguishes transport failures, which callers may retry over another
+    route, from tool errors (bad parameters, unknown tool), which would fail
+    again.
+    """
+
+
 class BaseMCPServer(ABC, LoggerMixin):
     """Abstract base class for MCP servers.
 
     All MCP servers must implement:
     - call(): Execute an MCP tool/function
-    - list_tools(): Return available tools
+    - _build_tools(): Return available tools (cached by list_tools())
     """
 
     def __init__(
@@ -26,9 +38,14 @@ class BaseMCPServer(ABC, LoggerMixin):
         Args:
             server_name: Name of the MCP server
             base_url: Base URL for the server (optional for mock servers)
-            simulate_latency: Whether to simulate network latency
+            simulate_latency: Whether to simulate network latency; the
+                MCP_SIMULATE_LATENCY environment variable overrides it when set
             latency_ms: Latency in milliseconds to simulate
         """
+        override = os.getenv("MCP_SIMULATE_LATENCY")
+        if override is not None:
+            simulate_latency = override.lower() in ("true", "1", "yes", "on")
+
         self.server_name = server_name
         self.base_url = base_url
         self.simulate_latency = simulate_latency
@@ -53,24 +70,60 @@ class BaseMCPServer(ABC, LoggerMixin):
         Raises:
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
+            MCPTransportError: If the server backing the tool cannot be reached
         """
         pass
 
     @abstractmethod
+    def _build_tools(self) -> list[Dict[str, Any]]:
+        """Build the tool definitions served by list_tools().
+
+        Returns:
+            List of tool definitions with name, description, and parameters
+        """
+        pass
+
+    @cached_property
+    def _tools(self) -> list[Dict[str, Any]]:
+        """Tool definitions, built once per server."""
+        return self._build_tools()
+
     def list_tools(self) -> list[Dict[str, Any]]:
         """List all available tools.
 
+        The definitions are built once and shared between calls, so callers
+        must not modify them.
+
         Returns:
             List of tool definitions with name, description, and parameters
         """
-        pass
+        return self._tools
 
     async def _simulate_latency(self) -> None:
-        """Simulate network latency for realistic behavior."""
-        if self.simulate_latency:
-            import asyncio
+        """Simulate network latency for realistic behavior.
 
-            await asyncio.sleep(self.latency_ms / 1000.0)
+        Tool calls check ``simulate_latency`` before awaiting this, so no
+        coroutine is created when latency simulation is off.
+        """
+        if not self.simulate_latency:
+            return
+        await asyncio.sleep(self.latency_ms / 1000.0)
+
+    @cached_property
+    def _tool_names(self) -> Tuple[str, ...]:
+        """Names of the tools from list_tools(), in declaration order."""
+        return tuple(tool["name"] for tool in self.list_tools())
+
+    @cached_property
+    def _tool_name_set(self) -> FrozenSet[str]:
+        """Tool names for O(1) membership checks."""
+        return frozenset(self._tool_names)
+
+    def invalidate_tool_cache(self) -> None:
+        """Forget cached tools; call after changing what _build_tools() returns."""
+        self.__dict__.pop("_tools", None)
+        self.__dict__.pop("_tool_names", None)
+        self.__dict__.pop("_tool_name_set", None)
 
     def _validate_tool_exists(self, tool_name: str) -> None:
         """Validate that a tool exists.
@@ -81,8 +134,8 @@ class BaseMCPServer(ABC, LoggerMixin):
         Raises:
             ValueError: If tool does not exist
         """
-        tools = [tool["name"] for tool in self.list_tools()]
-        if tool_name not in tools:
+        if tool_name not in self._tool_name_set:
+            tools = self._tool_names
             # Try to find similar tool names
             similar_tools = []
             tool_name_lower = tool_name.lower()
@@ -118,12 +171,17 @@ class BaseMCPServer(ABC, LoggerMixin):
         Raises:
             ValueError: If required parameters are missing
         """
-        missing = [param for param in required if param not in params or params[param] is None]
-        if missing:
-            error_msg = (
-                f"Parâmetros obrigatórios faltando para tool '{tool_name}': {', '.join(missing)}. "
-                f"Parâmetros fornecidos: {', '.join(params.keys()) if params else 'nenhum'}. "
-                f"Parâmetros esperados: {', '.join(required)}"
-            )
-            raise ValueError(error_msg)
-
+        # Fast path: a plain loop with no list or generator on success
+        for param in required:
+            if params.get(param) is None:
+                break
+        else:
+            return
+
+        missing = [param for param in required if params.get(param) is None]
+        error_msg = (
+            f"Parâmetros obrigatórios faltando para tool '{tool_name}': {', '.join(missing)}. "
+            f"Parâmetros fornecidos: {', '.join(params.keys()) if params else 'nenhum'}. "
+            f"Parâmetros esperados: {', '.join(required)}"
+        )
+        raise ValueError(error_msg)
@@ -1,5 +1,6 @@
 """HTTP server for MCP servers."""
 
+import asyncio
 from typing import Any, Dict, Optional
 
 from aiohttp import web
@@ -9,6 +10,25 @@ from aiohttp.web_response import Response
 from src.mcp_servers.base_mcp import BaseMCPServer
 from src.utils.logger import LoggerMixin
 
+# Response encoding: orjson when installed (pip install -e ".[speedups]")
+try:
+    import orjson
+
+    def _dumps(payload: Any) -> bytes:
+        """Encode a response payload as JSON bytes."""
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+
+    def _dumps(payload: Any) -> bytes:
+        """Encode a response payload as JSON bytes."""
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """Build a JSON response from a payload."""
+    return web.Response(body=_dumps(payload), status=status, content_type="application/json")
+
 
 class MCPServerHTTP(LoggerMixin):
     """HTTP server wrapper for MCP servers."""
@@ -24,6 +44,8 @@ class MCPServerHTTP(LoggerMixin):
         self.port = port
         self.app = web.Application()
         self.runner: Optional[web.AppRunner] = None
+        # Constant /health payload, encoded once
+        self._health_body = _dumps({"status": "healthy", "server": mcp_server.server_name})
         self._setup_routes()
         self.logger.info(
             "MCP HTTP server initialized", port=port, server_name=mcp_server.server_name
@@ -50,14 +72,14 @@ class MCPServerHTTP(LoggerMixin):
             parameters = data.get("parameters", {})
 
             if not tool_name:
-                return web.json_response({"error": "tool_name is required"}, status=400)
+                return _json_response({"error": "tool_name is required"}, status=400)
 
             result = await self.mcp_server.call(tool_name, parameters)
-            return web.json_response(result)
+            return _json_response(result)
 
         except Exception as e:
             self.logger.error("Error handling MCP call", error=str(e))
-            return web.json_response({"error": str(e)}, status=500)
+            return _json_response({"error": str(e)}, status=500)
 
     async def handle_list_tools(self, request: Request) -> Response:
         """Handle list tools request.
@@ -70,10 +92,10 @@ class MCPServerHTTP(LoggerMixin):
         """
         try:
             tools = self.mcp_server.list_tools()
-            return web.json_response({"tools": tools})
+            return _json_response({"tools": tools})
         except Exception as e:
             self.logger.error("Error listing tools", error=str(e))
-            return web.json_response({"error": str(e)}, status=500)
+            return _json_response({"error": str(e)}, status=500)
 
     async def handle_health(self, request: Request) -> Response:
         """Handle health check.
@@ -84,12 +106,14 @@ class MCPServerHTTP(LoggerMixin):
         Returns:
             HTTP response
         """
-        return web.json_response(
-            {"status": "healthy", "server": self.mcp_server.server_name}
-        )
+        return web.Response(body=self._health_body, content_type="application/json")
 
     async def start(self) -> None:
-        """Start the HTTP server."""
+        """Start the HTTP server.
+
+        Accepted connections already have TCP_NODELAY set by the asyncio/uvloop
+        transport, so small JSON responses are not held back by Nagle.
+        """
         self.runner = web.AppRunner(self.app)
         await self.runner.setup()
         site = web.TCPSite(self.runner, "localhost", self.port)
@@ -124,8 +148,7 @@ async def start_mcp_servers(
         MCPServerHTTP(analytics_server, 8003),
     ]
 
-    for server in servers:
-        await server.start()
+    await asyncio.gather(*(server.start() for server in servers))
 
     return servers
 
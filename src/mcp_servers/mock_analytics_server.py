@@ -1,11 +1,26 @@
 """Mock Analytics MCP server for conversion metrics."""
 
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from src.mcp_servers.base_mcp import BaseMCPServer
 from src.models.sales_pipeline import PipelineStage
 
+_PIPELINE_STAGES = tuple(PipelineStage)
+_PIPELINE_STAGE_VALUES = tuple(stage.value for stage in _PIPELINE_STAGES)
+# Maximum number of memoized metrics responses
+_METRICS_CACHE_SIZE = 128
+
+
+def _copy_metrics(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a metrics response and its nested dicts (values are dicts or scalars)."""
+    return {
+        key: _copy_metrics(value) if isinstance(value, dict) else value
+        for key, value in result.items()
+    }
+
 
 class MockAnalyticsServer(BaseMCPServer):
     """Mock analytics server with conversion metrics."""
@@ -29,8 +44,76 @@ class MockAnalyticsServer(BaseMCPServer):
             simulate_latency=simulate_latency,
             latency_ms=latency_ms,
         )
-        self._events: List[Dict[str, Any]] = []
+        # Events stored column-wise in parallel lists sorted by timestamp, so
+        # date ranges can be bisected and tallied without per-event dicts
+        self._timestamps: List[str] = []
+        self._stages: List[str] = []
+        self._event_types: List[str] = []
+        self._event_ids: List[str] = []
+        self._lead_ids: List[Optional[str]] = []
+        self._metadata: List[Dict[str, Any]] = []
+        # Event count per (stage, event_type) over all events
+        self._counts: Counter[Tuple[str, str]] = Counter()
+        # Metrics responses keyed by tool and arguments, in LRU order; cleared
+        # whenever an event is added
+        self._metrics_cache: OrderedDict[Tuple[Optional[str], ...], Dict[str, Any]] = OrderedDict()
         self._initialize_mock_metrics()
+        # Tool name -> handler, so call() dispatches with one dict lookup
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            "get_conversion_metrics": self._get_conversion_metrics,
+            "get_funnel_analytics": self._get_funnel_analytics,
+            "track_event": self._track_event,
+        }
+
+    def _add_event(self, event: Dict[str, Any]) -> None:
+        """Store an event, keeping the timestamp order and counters up to date."""
+        index = bisect_right(self._timestamps, event["timestamp"])
+        self._timestamps.insert(index, event["timestamp"])
+        self._stages.insert(index, event["stage"])
+        self._event_types.insert(index, event["event_type"])
+        self._event_ids.insert(index, event["id"])
+        self._lead_ids.insert(index, event["lead_id"])
+        self._metadata.insert(index, event["metadata"])
+        self._counts[(event["stage"], event["event_type"])] += 1
+        self._metrics_cache.clear()
+
+    def _cached_metrics(self, key: Tuple[Optional[str], ...]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a memoized metrics response, marking it as recently used."""
+        result = self._metrics_cache.get(key)
+        if result is None:
+            return None
+        self._metrics_cache.move_to_end(key)
+        return _copy_metrics(result)
+
+    def _store_metrics(
+        self, key: Tuple[Optional[str], ...], result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Memoize a metrics response, evicting the least recently used one.
+
+        Callers get a copy, so mutating a response never alters the cache.
+        """
+        self._metrics_cache[key] = result
+        if len(self._metrics_cache) > _METRICS_CACHE_SIZE:
+            self._metrics_cache.popitem(last=False)
+        return _copy_metrics(result)
+
+    def _count_events(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Counter[Tuple[str, str]]:
+        """Count events per (stage, event_type) within an ISO date range."""
+        if not start_date and not end_date:
+            return self._counts
+        lo = bisect_left(self._timestamps, start_date) if start_date else 0
+        hi = bisect_right(self._timestamps, end_date) if end_date else len(self._timestamps)
+        if hi - lo > len(self._timestamps) // 2:
+            # Most events are in range: discount the ones outside it instead
+            counts = self._counts.copy()
+            counts.subtract(zip(self._stages[:lo], self._event_types[:lo]))
+            counts.subtract(zip(self._stages[hi:], self._event_types[hi:]))
+            return counts
+        return Counter(zip(self._stages[lo:hi], self._event_types[lo:hi]))
 
     def _initialize_mock_metrics(self) -> None:
         """Initialize with sample metrics data."""
@@ -38,8 +121,8 @@ class MockAnalyticsServer(BaseMCPServer):
         base_time = datetime.utcnow() - timedelta(days=30)
 
         for i in range(100):
-            stage = list(PipelineStage)[i % len(PipelineStage)]
-            self._events.append(
+            stage = _PIPELINE_STAGES[i % len(_PIPELINE_STAGES)]
+            self._add_event(
                 {
                     "id": f"event_{i:03d}",
                     "event_type": "stage_entry",
@@ -68,20 +151,15 @@ class MockAnalyticsServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
-        self._validate_tool_exists(tool_name)
-
-        params = parameters or {}
-
-        if tool_name == "get_conversion_metrics":
-            return await self._get_conversion_metrics(**params)
-        elif tool_name == "get_funnel_analytics":
-            return await self._get_funnel_analytics(**params)
-        elif tool_name == "track_event":
-            return await self._track_event(**params)
-        else:
+        if self.simulate_latency:
+            await self._simulate_latency()
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            self._validate_tool_exists(tool_name)
             raise ValueError(f"Unknown tool: {tool_name}")
 
+        return await handler(**(parameters or {}))
+
     async def _get_conversion_metrics(
         self,
         stage: Optional[str] = None,
@@ -98,25 +176,22 @@ class MockAnalyticsServer(BaseMCPServer):
         Returns:
             Conversion metrics dictionary
         """
-        # Filter events
-        events = self._events.copy()
+        key = ("conversion", stage, start_date, end_date)
+        cached = self._cached_metrics(key)
+        if cached is not None:
+            return cached
 
+        counts = self._count_events(start_date, end_date)
         if stage:
-            events = [e for e in events if e.get("stage") == stage]
-
-        if start_date:
-            events = [e for e in events if e.get("timestamp", "") >= start_date]
-
-        if end_date:
-            events = [e for e in events if e.get("timestamp", "") <= end_date]
-
-        # Calculate metrics
-        total_entries = len([e for e in events if e.get("event_type") == "stage_entry"])
-        total_exits = len([e for e in events if e.get("event_type") == "stage_exit"])
+            total_entries = counts[(stage, "stage_entry")]
+            total_exits = counts[(stage, "stage_exit")]
+        else:
+            total_entries = sum(n for (_, kind), n in counts.items() if kind == "stage_entry")
+            total_exits = sum(n for (_, kind), n in counts.items() if kind == "stage_exit")
 
         conversion_rate = total_exits / total_entries if total_entries > 0 else 0.0
 
-        return {
+        return self._store_metrics(key, {
             "success": True,
             "stage": stage or "all",
             "total_entries": total_entries,
@@ -126,7 +201,7 @@ class MockAnalyticsServer(BaseMCPServer):
                 "start": start_date or "all_time",
                 "end": end_date or "now",
             },
-        }
+        })
 
     async def _get_funnel_analytics(
         self,
@@ -142,24 +217,21 @@ class MockAnalyticsServer(BaseMCPServer):
         Returns:
             Funnel analytics dictionary
         """
-        # Filter events
-        events = self._events.copy()
+        key = ("funnel", start_date, end_date)
+        cached = self._cached_metrics(key)
+        if cached is not None:
+            return cached
 
-        if start_date:
-            events = [e for e in events if e.get("timestamp", "") >= start_date]
-
-        if end_date:
-            events = [e for e in events if e.get("timestamp", "") <= end_date]
+        counts = self._count_events(start_date, end_date)
 
         # Calculate metrics per stage
         funnel_data = {}
 
-        for stage in PipelineStage:
-            stage_events = [e for e in events if e.get("stage") == stage.value]
-            entries = len([e for e in stage_events if e.get("event_type") == "stage_entry"])
-            exits = len([e for e in stage_events if e.get("event_type") == "stage_exit"])
+        for stage in _PIPELINE_STAGE_VALUES:
+            entries = counts[(stage, "stage_entry")]
+            exits = counts[(stage, "stage_exit")]
 
-            funnel_data[stage.value] = {
+            funnel_data[stage] = {
                 "entries": entries,
                 "exits": exits,
                 "conversion_rate": round(exits / entries, 4) if entries > 0 else 0.0,
@@ -170,7 +242,7 @@ class MockAnalyticsServer(BaseMCPServer):
         total_exits = sum(data["exits"] for data in funnel_data.values())
         overall_rate = total_exits / total_entries if total_entries > 0 else 0.0
 
-        return {
+        return self._store_metrics(key, {
             "success": True,
             "funnel": funnel_data,
             "overall": {
@@ -182,7 +254,7 @@ class MockAnalyticsServer(BaseMCPServer):
                 "start": start_date or "all_time",
                 "end": end_date or "now",
             },
-        }
+        })
 
     async def _track_event(
         self,
@@ -203,7 +275,7 @@ class MockAnalyticsServer(BaseMCPServer):
             Tracking result dictionary
         """
         event = {
-            "id": f"event_{len(self._events):06d}",
+            "id": f"event_{len(self._timestamps):06d}",
             "event_type": event_type,
             "stage": stage,
             "lead_id": lead_id,
@@ -211,7 +283,7 @@ class MockAnalyticsServer(BaseMCPServer):
             "metadata": metadata or {},
         }
 
-        self._events.append(event)
+        self._add_event(event)
 
         return {
             "success": True,
@@ -219,8 +291,8 @@ class MockAnalyticsServer(BaseMCPServer):
             "timestamp": event["timestamp"],
         }
 
-    def list_tools(self) -> list[Dict[str, Any]]:
-        """List available analytics tools.
+    def _build_tools(self) -> list[Dict[str, Any]]:
+        """Build the analytics tool definitions.
 
         Returns:
             List of tool definitions
@@ -235,7 +307,7 @@ class MockAnalyticsServer(BaseMCPServer):
                         "stage": {
                             "type": "string",
                             "description": "Pipeline stage",
-                            "enum": [s.value for s in PipelineStage],
+                            "enum": _PIPELINE_STAGE_VALUES,
                         },
                         "start_date": {"type": "string", "description": "Start date (ISO format)"},
                         "end_date": {"type": "string", "description": "End date (ISO format)"},
@@ -266,7 +338,7 @@ class MockAnalyticsServer(BaseMCPServer):
                         "stage": {
                             "type": "string",
                             "description": "Pipeline stage",
-                            "enum": [s.value for s in PipelineStage],
+                            "enum": _PIPELINE_STAGE_VALUES,
                         },
                         "lead_id": {"type": "string", "description": "Optional lead ID"},
                         "metadata": {
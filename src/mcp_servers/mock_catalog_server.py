@@ -1,6 +1,7 @@
 """Mock Catalog MCP server for product information."""
 
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from src.mcp_servers.base_mcp import BaseMCPServer
 
@@ -28,6 +29,19 @@ class MockCatalogServer(BaseMCPServer):
             latency_ms=latency_ms,
         )
         self._products = self._initialize_mock_products()
+        # Lowercased (name, description, category) per product for search
+        self._search_fields: List[Tuple[str, str, str]] = [
+            (p["name"].lower(), p["description"].lower(), p.get("category", "").lower())
+            for p in self._products
+        ]
+        self._products_by_id: Dict[str, Dict[str, Any]] = {p["id"]: p for p in self._products}
+        # Tool name -> handler, so call() dispatches with one dict lookup;
+        # retorna_preco is declared in _build_tools but has no handler yet
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            "get_products": self._get_products,
+            "get_product_details": self._get_product_details,
+            "search_products": self._search_products,
+        }
 
     def _initialize_mock_products(self) -> List[Dict[str, Any]]:
         """Initialize with Maquinona product data from iFood Pago.
@@ -43,7 +57,7 @@ class MockCatalogServer(BaseMCPServer):
                 "category": "Pagamentos e Marketing",
                 "price": 0.0,  # Taxas especiais conforme negócio
                 "currency": "BRL",
-                "features": [
+                "features": (
                     "Máquina de pagamento moderna e intuitiva",
                     "Campanhas de fidelidade e cashback",
                     "Inteligência de marketing do iFood",
@@ -54,10 +68,10 @@ class MockCatalogServer(BaseMCPServer):
                     "Notificações automáticas via WhatsApp",
                     "Relatórios semanais com insights",
                     "Identificação e segmentação de clientes em tempo real",
-                ],
+                ),
                 "target_audience": "restaurantes",
                 "trial_days": 0,  # Não há trial, mas taxas especiais
-                "benefits": [
+                "benefits": (
                     "Aumente suas vendas com inteligência de marketing",
                     "Fidelize clientes atuais",
                     "Leve novos clientes para o salão",
@@ -65,27 +79,27 @@ class MockCatalogServer(BaseMCPServer):
                     "Receba dados e dicas sobre suas vendas",
                     "Economia no bolso para fidelizar clientes",
                     "Mais dinheiro no seu fluxo de caixa",
-                ],
-                "how_it_works": [
+                ),
+                "how_it_works": (
                     "Cliente faz visita ao restaurante pela primeira vez",
                     "Atendente apresenta programa de fidelidade ou cashback",
                     "Cliente é cadastrado na maquinona com número de celular",
                     "Cliente faz pagamento na maquinona",
                     "Instantaneamente recebe cupom ou cashback via WhatsApp",
                     "Cliente é estimulado a voltar mais vezes",
-                ],
-                "payment_methods": [
+                ),
+                "payment_methods": (
                     "Cartão de Crédito",
                     "Cartão de Débito",
                     "Vale Refeição",
                     "Outros",
-                ],
-                "support": [
+                ),
+                "support": (
                     "Identificação e segmentação de clientes em tempo real",
                     "Controle de resgate de cupons e pedidos mínimos",
                     "Envio automático de ofertas pelo WhatsApp",
                     "Envio de relatórios semanais com insights valiosos",
-                ],
+                ),
             },
         ]
 
@@ -107,22 +121,15 @@ class MockCatalogServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
-        self._validate_tool_exists(tool_name)
-
-        params = parameters or {}
-
-        if tool_name == "get_products":
-            return await self._get_products(**params)
-        elif tool_name == "get_product_details":
-            return await self._get_product_details(**params)
-        elif tool_name == "search_products":
-            return await self._search_products(**params)
-        elif tool_name == "retorna_preco":
-            return await self._retorna_preco(**params)
-        else:
+        if self.simulate_latency:
+            await self._simulate_latency()
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            self._validate_tool_exists(tool_name)
             raise ValueError(f"Unknown tool: {tool_name}")
 
+        return await handler(**(parameters or {}))
+
     async def _get_products(
         self,
         category: Optional[str] = None,
@@ -139,15 +146,16 @@ class MockCatalogServer(BaseMCPServer):
         Returns:
             Products list dictionary
         """
-        products = self._products.copy()
-
-        if category:
-            products = [p for p in products if p.get("category") == category]
-
-        if target_audience:
-            products = [p for p in products if p.get("target_audience") == target_audience]
-
-        products = products[:limit]
+        # Single filtering pass that stops once limit products are found;
+        # callers get copies (nested values are tuples), never the seed dicts
+        products = list(islice(
+            (
+                dict(p) for p in self._products
+                if (not category or p.get("category") == category)
+                and (not target_audience or p.get("target_audience") == target_audience)
+            ),
+            max(limit, 0),
+        ))
 
         return {
             "success": True,
@@ -167,14 +175,14 @@ class MockCatalogServer(BaseMCPServer):
         Returns:
             Product details dictionary
         """
-        product = next((p for p in self._products if p["id"] == product_id), None)
+        product = self._products_by_id.get(product_id)
 
-        if not product:
+        if product is None:
             return {"error": "Product not found", "product_id": product_id}
 
         return {
             "success": True,
-            "product": product,
+            "product": dict(product),
         }
 
     async def _search_products(
@@ -194,15 +202,12 @@ class MockCatalogServer(BaseMCPServer):
         query_lower = query.lower()
         results = []
 
-        for product in self._products:
-            name_match = query_lower in product["name"].lower()
-            desc_match = query_lower in product["description"].lower()
-            category_match = query_lower in product.get("category", "").lower()
-
-            if name_match or desc_match or category_match:
-                results.append(product)
-
-        results = results[:limit]
+        if limit > 0:
+            for product, fields in zip(self._products, self._search_fields):
+                if any(query_lower in field for field in fields):
+                    results.append(dict(product))
+                    if len(results) == limit:
+                        break
 
         return {
             "success": True,
@@ -211,8 +216,8 @@ class MockCatalogServer(BaseMCPServer):
             "products": results,
         }
 
-    def list_tools(self) -> list[Dict[str, Any]]:
-        """List available catalog tools.
+    def _build_tools(self) -> list[Dict[str, Any]]:
+        """Build the catalog tool definitions.
 
         Returns:
             List of tool definitions
@@ -1,7 +1,7 @@
 """Mock Contract MCP server for contract history."""
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from src.mcp_servers.base_mcp import BaseMCPServer
 
@@ -29,10 +29,47 @@ class MockContractServer(BaseMCPServer):
             latency_ms=latency_ms,
         )
         self._contracts: Dict[str, List[Dict[str, Any]]] = {}
+        # Active contracts and their product ids per CNPJ, built by _index_contracts
+        self._active_by_cnpj: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._active_products_by_cnpj: Dict[str, FrozenSet[str]] = {}
+        # Parsed data_fim of active contracts by contract id, as naive UTC
+        self._data_fim_by_id: Dict[str, datetime] = {}
         self._initialize_mock_data()
+        self._index_contracts()
+        # Tool name -> handler, so call() dispatches with one dict lookup
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            "buscar_historico_contratos": self._buscar_historico_contratos,
+            "verificar_renovacoes_pendentes": self._verificar_renovacoes_pendentes,
+        }
+
+    def _index_contracts(self) -> None:
+        """Index active contracts per CNPJ; call again after changing _contracts."""
+        self._active_by_cnpj = {
+            cnpj: tuple(c for c in contratos if c.get("status") == "ativo")
+            for cnpj, contratos in self._contracts.items()
+        }
+        self._active_products_by_cnpj = {
+            cnpj: frozenset(c.get("produto_id") for c in ativos)
+            for cnpj, ativos in self._active_by_cnpj.items()
+        }
+        self._data_fim_by_id = {}
+        for ativos in self._active_by_cnpj.values():
+            for contrato in ativos:
+                data_fim_str = contrato.get("data_fim")
+                if not data_fim_str:
+                    continue
+                try:
+                    data_fim = datetime.fromisoformat(data_fim_str.replace("Z", "+00:00"))
+                except ValueError:
+                    self.logger.warning("data_fim inválida", contrato_id=contrato["id"])
+                    continue
+                if data_fim.tzinfo is not None:
+                    data_fim = data_fim.astimezone(timezone.utc).replace(tzinfo=None)
+                self._data_fim_by_id[contrato["id"]] = data_fim
 
     def _initialize_mock_data(self) -> None:
         """Initialize with sample mock data."""
+        now = datetime.utcnow()
         self._contracts = {
             "12345678000190": [
                 {
@@ -41,8 +78,8 @@ class MockContractServer(BaseMCPServer):
                     "produto_id": "ifood_delivery",
                     "produto_nome": "iFood Delivery",
                     "status": "ativo",
-                    "data_inicio": (datetime.utcnow() - timedelta(days=150)).isoformat(),
-                    "data_fim": (datetime.utcnow() + timedelta(days=215)).isoformat(),
+                    "data_inicio": (now - timedelta(days=150)).isoformat(),
+                    "data_fim": (now + timedelta(days=215)).isoformat(),
                     "valor_mensal": 500.0,
                 },
                 {
@@ -51,8 +88,8 @@ class MockContractServer(BaseMCPServer):
                     "produto_id": "ifood_pago",
                     "produto_nome": "iFood Pago",
                     "status": "ativo",
-                    "data_inicio": (datetime.utcnow() - timedelta(days=30)).isoformat(),
-                    "data_fim": (datetime.utcnow() + timedelta(days=335)).isoformat(),
+                    "data_inicio": (now - timedelta(days=30)).isoformat(),
+                    "data_fim": (now + timedelta(days=335)).isoformat(),
                     "valor_mensal": 200.0,
                 },
             ],
@@ -63,8 +100,8 @@ class MockContractServer(BaseMCPServer):
                     "produto_id": "ifood_delivery",
                     "produto_nome": "iFood Delivery",
                     "status": "ativo",
-                    "data_inicio": (datetime.utcnow() - timedelta(days=300)).isoformat(),
-                    "data_fim": (datetime.utcnow() + timedelta(days=65)).isoformat(),
+                    "data_inicio": (now - timedelta(days=300)).isoformat(),
+                    "data_fim": (now + timedelta(days=65)).isoformat(),
                     "valor_mensal": 1200.0,
                 },
             ],
@@ -88,18 +125,15 @@ class MockContractServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
-        self._validate_tool_exists(tool_name)
-
-        params = parameters or {}
-
-        if tool_name == "buscar_historico_contratos":
-            return await self._buscar_historico_contratos(**params)
-        elif tool_name == "verificar_renovacoes_pendentes":
-            return await self._verificar_renovacoes_pendentes(**params)
-        else:
+        if self.simulate_latency:
+            await self._simulate_latency()
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            self._validate_tool_exists(tool_name)
             raise ValueError(f"Unknown tool: {tool_name}")
 
+        return await handler(**(parameters or {}))
+
     async def _buscar_historico_contratos(
         self,
         cnpj: str,
@@ -114,13 +148,19 @@ class MockContractServer(BaseMCPServer):
         """
         contratos = self._contracts.get(cnpj, [])
 
+        # Callers get copies (contracts hold only scalars), so mutating a
+        # response never leaves the active-contract index out of date
         return {
             "success": True,
             "cnpj": cnpj,
-            "contratos": contratos,
+            "contratos": [dict(c) for c in contratos],
             "total_contratos": len(contratos),
-            "contratos_ativos": [c for c in contratos if c.get("status") == "ativo"],
-            "produtos_contratados": list(set([c.get("produto_id") for c in contratos])),
+            "contratos_ativos": [dict(c) for c in self._active_by_cnpj.get(cnpj, ())],
+            "produtos_contratados": list(
+                dict.fromkeys(
+                    c["produto_id"] for c in contratos if c.get("produto_id") is not None
+                )
+            ),
         }
 
     async def _verificar_renovacoes_pendentes(
@@ -135,33 +175,25 @@ class MockContractServer(BaseMCPServer):
         Returns:
             Contratos próximos de vencer e oportunidades
         """
-        contratos = self._contracts.get(cnpj, [])
         hoje = datetime.utcnow()
 
         renovacoes_pendentes = []
         oportunidades_upsell = []
 
-        for contrato in contratos:
-            if contrato.get("status") != "ativo":
+        for contrato in self._active_by_cnpj.get(cnpj, ()):
+            data_fim = self._data_fim_by_id.get(contrato["id"])
+            if data_fim is None:
                 continue
 
-            data_fim_str = contrato.get("data_fim")
-            if data_fim_str:
-                try:
-                    data_fim = datetime.fromisoformat(data_fim_str.replace("Z", "+00:00"))
-                    dias_restantes = (data_fim - hoje).days
-
-                    if 0 <= dias_restantes <= 90:
-                        renovacoes_pendentes.append({
-                            **contrato,
-                            "dias_restantes": dias_restantes,
-                        })
-                except Exception:
-                    pass
+            dias_restantes = (data_fim - hoje).days
+            if 0 <= dias_restantes <= 90:
+                renovacoes_pendentes.append({
+                    **contrato,
+                    "dias_restantes": dias_restantes,
+                })
 
         # Check for upsell opportunities
-        produtos_contratados = [c.get("produto_id") for c in contratos if c.get("status") == "ativo"]
-        if "maquinona" not in produtos_contratados:
+        if "maquinona" not in self._active_products_by_cnpj.get(cnpj, frozenset()):
             oportunidades_upsell.append({
                 "produto_id": "maquinona",
                 "produto_nome": "Maquinona iFood Pago",
@@ -177,8 +209,8 @@ class MockContractServer(BaseMCPServer):
             "total_oportunidades": len(oportunidades_upsell),
         }
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools.
+    def _build_tools(self) -> List[Dict[str, Any]]:
+        """Build the tool definitions.
 
         Returns:
             List of tool definitions
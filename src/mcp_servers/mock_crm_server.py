@@ -109,7 +109,8 @@ class MockCRMServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
+        if self.simulate_latency:
+            await self._simulate_latency()
         self._validate_tool_exists(tool_name)
 
         params = parameters or {}
@@ -330,8 +331,8 @@ class MockCRMServer(BaseMCPServer):
             "message": "Compra finalizada com sucesso! Você receberá um email de confirmação em breve.",
         }
 
-    def list_tools(self) -> list[Dict[str, Any]]:
-        """List available CRM tools.
+    def _build_tools(self) -> list[Dict[str, Any]]:
+        """Build the CRM tool definitions.
 
         Returns:
             List of tool definitions
@@ -126,7 +126,8 @@ class MockiFoodServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
+        if self.simulate_latency:
+            await self._simulate_latency()
         self._validate_tool_exists(tool_name)
 
         params = parameters or {}
@@ -219,8 +220,8 @@ class MockiFoodServer(BaseMCPServer):
             "produtos_ativos": [p for p in produtos if p.get("status") == "ativo"],
         }
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools.
+    def _build_tools(self) -> List[Dict[str, Any]]:
+        """Build the tool definitions.
 
         Returns:
             List of tool definitions
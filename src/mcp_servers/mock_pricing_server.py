@@ -46,7 +46,8 @@ class MockPricingServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
+        if self.simulate_latency:
+            await self._simulate_latency()
         self._validate_tool_exists(tool_name)
 
         params = parameters or {}
@@ -204,8 +205,8 @@ class MockPricingServer(BaseMCPServer):
             "error": f"Produto {produto_id} não encontrado",
         }
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools.
+    def _build_tools(self) -> List[Dict[str, Any]]:
+        """Build the tool definitions.
 
         Returns:
             List of tool definitions
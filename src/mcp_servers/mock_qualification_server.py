@@ -46,7 +46,8 @@ class MockQualificationServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
+        if self.simulate_latency:
+            await self._simulate_latency()
         self._validate_tool_exists(tool_name)
 
         params = parameters or {}
@@ -236,8 +237,8 @@ class MockQualificationServer(BaseMCPServer):
             ),
         }
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools.
+    def _build_tools(self) -> List[Dict[str, Any]]:
+        """Build the tool definitions.
 
         Returns:
             List of tool definitions
@@ -59,7 +59,8 @@ class MockRecommendationServer(BaseMCPServer):
             ValueError: If tool_name is not found
             RuntimeError: If tool execution fails
         """
-        await self._simulate_latency()
+        if self.simulate_latency:
+            await self._simulate_latency()
         self._validate_tool_exists(tool_name)
 
         params = parameters or {}
@@ -194,8 +195,8 @@ class MockRecommendationServer(BaseMCPServer):
             "recomendacao": "Recomendado" if fit_score >= 0.7 else "Avaliar caso a caso",
         }
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        """List available tools.
+    def _build_tools(self) -> List[Dict[str, Any]]:
+        """Build the tool definitions.
 
         Returns:
             List of tool definitions
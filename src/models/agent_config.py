@@ -2,7 +2,7 @@
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ScriptStep(BaseModel):
@@ -43,6 +43,9 @@ class FAQItem(BaseModel):
 class MCPTool(BaseModel):
     """Model for MCP tool configuration."""
 
+    # Immutable: parsed tool configs are cached and shared between instances
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Nome da tool")
     mcp_url: str = Field(..., description="URL do servidor MCP")
     description: str = Field(..., description="Descrição da tool")
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -75,6 +75,21 @@ class Conversation(BaseModel):
         self.messages.append(message)
         self.updated_at = datetime.utcnow()
 
+    def add_messages(
+        self,
+        messages: List[Tuple[MessageRole, str, Optional[str]]],
+    ) -> None:
+        """Add several messages to the conversation in a single update.
+
+        Args:
+            messages: Tuples of (role, content, agent_id)
+        """
+        self.messages.extend(
+            Message(role=role, content=content, agent_id=agent_id)
+            for role, content, agent_id in messages
+        )
+        self.updated_at = datetime.utcnow()
+
     def get_messages_by_agent(self, agent_id: str) -> List[Message]:
         """Get all messages from a specific agent."""
         return [msg for msg in self.messages if msg.agent_id == agent_id]
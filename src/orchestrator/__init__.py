@@ -1,5 +1,17 @@
 """Orchestrator module using Strands Agents."""
 
-from src.orchestrator.swarm_orchestrator import SwarmOrchestrator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.orchestrator.swarm_orchestrator import SwarmOrchestrator
 
 __all__ = ["SwarmOrchestrator"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import SwarmOrchestrator (and Strands) only when it is first accessed."""
+    if name == "SwarmOrchestrator":
+        from src.orchestrator.swarm_orchestrator import SwarmOrchestrator
+
+        return SwarmOrchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -26,8 +26,8 @@ class SwarmOrchestrator(LoggerMixin):
         self.settings = settings
         self.conversations: Dict[str, Conversation] = {}
         
-        # Initialize Swarm agent
-        self.swarm_agent = SwarmSalesAgent(
+        # Initialize Swarm agent (shared across orchestrators in the process)
+        self.swarm_agent = SwarmSalesAgent.get_or_create(
             settings=settings,
             default_cnpj=settings.default_client_cnpj,
         )
@@ -39,7 +39,8 @@ class SwarmOrchestrator(LoggerMixin):
             "stage_transitions": defaultdict(int),
             "agents_usage": defaultdict(int),
             "conversion_by_stage": defaultdict(int),
-            "time_by_stage": defaultdict(list),
+            # Running [total seconds, samples] per stage, so averages stay O(1)
+            "time_by_stage": defaultdict(lambda: [0.0, 0]),
             "abandonment_points": defaultdict(int),
             "completed_conversations": 0,
             "closed_sales": 0,
@@ -47,6 +48,10 @@ class SwarmOrchestrator(LoggerMixin):
         
         self.logger.info("Swarm Orchestrator inicializado")
 
+    async def aclose(self) -> None:
+        """Release this orchestrator's reference to the shared Swarm agent."""
+        await self.swarm_agent.release()
+
     async def create_conversation(
         self,
         lead_id: Optional[str] = None,
@@ -128,8 +133,10 @@ class SwarmOrchestrator(LoggerMixin):
             conversation = self.get_conversation(conversation_id)
             if not conversation:
                 return {"error": "Conversation not found", "conversation_id": conversation_id}
+            turn_index = sum(1 for m in conversation.messages if m.role == MessageRole.USER)
         else:
             conversation = await self.create_conversation(initial_message=message)
+            turn_index = 0
 
         # Add user message to conversation
         conversation.add_message(role=MessageRole.USER, content=message)
@@ -146,86 +153,8 @@ class SwarmOrchestrator(LoggerMixin):
 
         try:
             # Process with Swarm
-            result = await self.swarm_agent.process(message, context)
-            
-            # Extract response
-            response_text = result.get("response", "")
-            
-            # Add agent response to conversation
-            if response_text:
-                conversation.add_message(
-                    role=MessageRole.AGENT,
-                    content=response_text,
-                    agent_id="swarm",
-                    metadata={
-                        "telemetry": result.get("telemetry", {}),
-                        "node_history": result.get("node_history", []),
-                        "status": result.get("status", "completed"),
-                    },
-                )
-
-            # Determine current stage based on agents used
-            agents_used = result.get("telemetry", {}).get("agents_used", [])
-            node_history = result.get("node_history", [])
-            
-            # Get the last active agent from node history
-            last_agent = "researcher"
-            if node_history:
-                last_node = node_history[-1]
-                last_agent = last_node.get("node_id", "researcher")
-            elif agents_used:
-                last_agent = agents_used[-1]
-            
-            # Map agent to stage
-            stage_mapping = {
-                "researcher": ConversationStage.FAQ,
-                "sales_agent": ConversationStage.QUALIFICATION,
-                "qualification_agent": ConversationStage.QUALIFICATION,
-                "presentation_agent": ConversationStage.PRESENTATION,
-                "negotiation_agent": ConversationStage.NEGOTIATION,
-                "closing_agent": ConversationStage.CLOSING,
-            }
-            
-            new_stage = stage_mapping.get(last_agent, ConversationStage.FAQ)
-            
-            # Track stage transition and metrics
-            if old_stage != new_stage:
-                self._track_stage_transition(conversation, old_stage, new_stage, process_start_time)
-            
-            conversation.current_stage = new_stage
-            conversation.active_agent = last_agent
-            
-            # Track agent usage
-            for agent in agents_used:
-                self.metrics["agents_usage"][agent] += 1
-            
-            # Track conversion if reached closing stage
-            if new_stage == ConversationStage.CLOSING:
-                self.metrics["conversion_by_stage"][ConversationStage.CLOSING.value] += 1
-                if "closing_agent" in agents_used:
-                    self.metrics["closed_sales"] += 1
-                    conversation.metadata["sale_closed"] = True
-                    conversation.metadata["closed_at"] = time.time()
-            
-            # Track completion
-            if new_stage == ConversationStage.COMPLETED:
-                self.metrics["completed_conversations"] += 1
-                conversation.metadata["completed_at"] = time.time()
-
-            return {
-                "conversation_id": conversation.id,
-                "response": response_text,
-                "agent_id": agents_used[-1] if agents_used else "swarm",
-                "stage": conversation.current_stage.value,
-                "metadata": {
-                    "telemetry": result.get("telemetry", {}),
-                    "node_history": result.get("node_history", []),
-                    "execution_count": result.get("execution_count", 0),
-                    "execution_time": result.get("execution_time", 0),
-                    "accumulated_usage": result.get("accumulated_usage", {}),
-                    "status": result.get("status", "completed"),
-                },
-            }
+            result = await self.swarm_agent.process(message, context, turn_index)
+            return self._complete_turn(conversation, result, old_stage, process_start_time)
         except Exception as e:
             self.logger.error(
                 "Erro ao processar mensagem com Swarm",
@@ -240,6 +169,106 @@ class SwarmOrchestrator(LoggerMixin):
                 "error_type": type(e).__name__,
             }
 
+    def _complete_turn(
+        self,
+        conversation: Conversation,
+        result: Dict[str, Any],
+        old_stage: ConversationStage,
+        process_start_time: float,
+    ) -> Dict[str, Any]:
+        """Record a Swarm result in the conversation and update metrics.
+
+        Args:
+            conversation: Conversation the message belongs to
+            result: Response dictionary from the Swarm agent
+            old_stage: Conversation stage before processing
+            process_start_time: When processing started
+
+        Returns:
+            Response dictionary with agent response and telemetry
+        """
+        # Conversation uses use_enum_values, so a freshly validated stage is a plain str
+        old_stage = ConversationStage(old_stage)
+
+        # Extract response
+        response_text = result.get("response", "")
+        
+        # Add agent response to conversation
+        if response_text:
+            conversation.add_message(
+                role=MessageRole.AGENT,
+                content=response_text,
+                agent_id="swarm",
+                metadata={
+                    "telemetry": result.get("telemetry", {}),
+                    "node_history": result.get("node_history", []),
+                    "status": result.get("status", "completed"),
+                },
+            )
+
+        # Determine current stage based on agents used
+        agents_used = result.get("telemetry", {}).get("agents_used", [])
+        node_history = result.get("node_history", [])
+        
+        # Get the last active agent from node history
+        last_agent = "researcher"
+        if node_history:
+            last_node = node_history[-1]
+            last_agent = last_node.get("node_id", "researcher")
+        elif agents_used:
+            last_agent = agents_used[-1]
+        
+        # Map agent to stage
+        stage_mapping = {
+            "researcher": ConversationStage.FAQ,
+            "sales_agent": ConversationStage.QUALIFICATION,
+            "qualification_agent": ConversationStage.QUALIFICATION,
+            "presentation_agent": ConversationStage.PRESENTATION,
+            "negotiation_agent": ConversationStage.NEGOTIATION,
+            "closing_agent": ConversationStage.CLOSING,
+        }
+        
+        new_stage = stage_mapping.get(last_agent, ConversationStage.FAQ)
+        
+        # Track stage transition and metrics
+        if old_stage != new_stage:
+            self._track_stage_transition(conversation, old_stage, new_stage, process_start_time)
+        
+        conversation.current_stage = new_stage
+        conversation.active_agent = last_agent
+        
+        # Track agent usage
+        for agent in agents_used:
+            self.metrics["agents_usage"][agent] += 1
+        
+        # Track conversion if reached closing stage
+        if new_stage == ConversationStage.CLOSING:
+            self.metrics["conversion_by_stage"][ConversationStage.CLOSING.value] += 1
+            if "closing_agent" in agents_used:
+                self.metrics["closed_sales"] += 1
+                conversation.metadata["sale_closed"] = True
+                conversation.metadata["closed_at"] = time.time()
+        
+        # Track completion
+        if new_stage == ConversationStage.COMPLETED:
+            self.metrics["completed_conversations"] += 1
+            conversation.metadata["completed_at"] = time.time()
+
+        return {
+            "conversation_id": conversation.id,
+            "response": response_text,
+            "agent_id": agents_used[-1] if agents_used else "swarm",
+            "stage": conversation.current_stage.value,
+            "metadata": {
+                "telemetry": result.get("telemetry", {}),
+                "node_history": result.get("node_history", []),
+                "execution_count": result.get("execution_count", 0),
+                "execution_time": result.get("execution_time", 0),
+                "accumulated_usage": result.get("accumulated_usage", {}),
+                "status": result.get("status", "completed"),
+            },
+        }
+
     async def stream_message(
         self,
         message: str,
@@ -272,9 +301,34 @@ class SwarmOrchestrator(LoggerMixin):
         # Add user message to conversation
         conversation.add_message(role=MessageRole.USER, content=message)
 
+        process_start_time = time.time()
+        old_stage = conversation.current_stage
+
         try:
             # Stream events from Swarm
             async for event in self.swarm_agent.stream(message, context):
+                event_type = event.get("type")
+
+                # Final result: same payload as process_message()
+                if event_type == "result":
+                    yield {
+                        "type": "done",
+                        **self._complete_turn(conversation, event, old_stage, process_start_time),
+                    }
+                    continue
+
+                # Text chunks from an agent are flattened into compact delta events
+                if event_type == "multiagent_node_stream":
+                    text = event.get("event", {}).get("data")
+                    if isinstance(text, str):
+                        yield {
+                            "type": "delta",
+                            "node_id": event.get("node_id"),
+                            "delta": text,
+                            "conversation_id": conversation.id,
+                        }
+                        continue
+
                 event["conversation_id"] = conversation.id
                 yield event
         except Exception as e:
@@ -311,7 +365,9 @@ class SwarmOrchestrator(LoggerMixin):
         # Calculate time in old stage
         if old_stage.value in conversation.metadata["stage_times"]:
             time_in_stage = transition_start_time - conversation.metadata["stage_times"][old_stage.value]
-            self.metrics["time_by_stage"][old_stage.value].append(time_in_stage)
+            stage_time = self.metrics["time_by_stage"][old_stage.value]
+            stage_time[0] += time_in_stage
+            stage_time[1] += 1
         
         # Record new stage start time
         conversation.metadata["stage_times"][new_stage.value] = transition_start_time
@@ -321,12 +377,17 @@ class SwarmOrchestrator(LoggerMixin):
         self.metrics["conversations_by_stage"][new_stage.value] += 1
     
     def get_conversion_metrics(self) -> Dict[str, Any]:
-        """Get conversion metrics for analysis."""
+        """Get conversion metrics for analysis.
+
+        Only reads in-memory counters, so it is cheap enough to call directly
+        from the event loop.
+        """
         # Calculate average time by stage
-        avg_time_by_stage = {}
-        for stage, times in self.metrics["time_by_stage"].items():
-            if times:
-                avg_time_by_stage[stage] = sum(times) / len(times)
+        avg_time_by_stage = {
+            stage: total / samples
+            for stage, (total, samples) in self.metrics["time_by_stage"].items()
+            if samples
+        }
         
         # Calculate conversion rates
         total_conversations = self.metrics["conversations_total"]
@@ -0,0 +1,42 @@
+"""Event loop helpers for the command-line entry points."""
+
+import asyncio
+import sys
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _uvloop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's event loop factory, or None if uvloop is not installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion, on uvloop when it is available.
+
+    uvloop is an optional dependency (``pip install .[examples]``); without it
+    this falls back to the default asyncio event loop.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        Result of the coroutine
+    """
+    loop_factory = _uvloop_factory()
+    if loop_factory is None:
+        return asyncio.run(main)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(main)
+
+    import uvloop
+
+    uvloop.install()
+    return asyncio.run(main)
@@ -11,12 +11,18 @@ def configure_logging(log_level: str = "INFO") -> None:
     """Configure structured logging for the application.
 
     Args:
-        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL);
+            unknown levels fall back to INFO with a warning
     """
+    level = getattr(logging, log_level.upper(), None)
+    valid_level = isinstance(level, int)
+    if not valid_level:
+        level = logging.INFO
+
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
+        level=level,
     )
 
     structlog.configure(
@@ -28,14 +34,17 @@ def configure_logging(log_level: str = "INFO") -> None:
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.dev.ConsoleRenderer(),
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, log_level.upper())
-        ),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
+    if not valid_level:
+        structlog.get_logger(__name__).warning(
+            "LOG_LEVEL inválido, usando INFO", log_level=log_level
+        )
+
 
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a structured logger instance.
@@ -0,0 +1,177 @@
+"""Semantic response cache for repeated sales prompts."""
+
+import json
+import math
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.logger import LoggerMixin
+
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "sales-agents" / "semantic_cache.db"
+
+Vector = Dict[str, float]
+# Embedding, cached result and monotonic time it was stored
+Entry = Tuple[Vector, Dict[str, Any], float]
+
+
+def embed_text(text: str) -> Vector:
+    """Embed text as an L2-normalized sparse bag-of-words vector.
+
+    Accents and casing are stripped so that "Preço" and "preco" map to the
+    same dimension.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Sparse vector mapping tokens to weights
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    counts = Counter(_TOKEN_RE.findall(normalized))
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    if not norm:
+        return {}
+    return {token: count / norm for token, count in counts.items()}
+
+
+def cosine_similarity(a: Vector, b: Vector) -> float:
+    """Cosine similarity between two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(token, 0.0) for token, weight in a.items())
+
+
+class SemanticCache(LoggerMixin):
+    """Cache of agent results keyed by conversation stage and message similarity.
+
+    A lookup returns the stored result of the most similar message previously
+    cached for the same stage, provided the similarity reaches ``threshold``.
+    With a ``ttl``, entries older than ``ttl`` seconds are ignored and evicted.
+    """
+
+    def __init__(
+        self,
+        backend: str = "memory",
+        threshold: float = 0.95,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize semantic cache.
+
+        Args:
+            backend: Storage backend ("memory" or "sqlite")
+            threshold: Minimum cosine similarity for a cache hit
+            path: SQLite database path (only used by the "sqlite" backend)
+            ttl: Maximum entry age in seconds (None keeps entries forever);
+                entries loaded from SQLite count from when they were loaded
+
+        Raises:
+            ValueError: If backend is not supported
+        """
+        if backend not in ("memory", "sqlite"):
+            raise ValueError(f"Backend de cache não suportado: {backend}")
+
+        self.backend = backend
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries: Dict[str, List[Entry]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+
+        if backend == "sqlite":
+            db_path = Path(path or DEFAULT_CACHE_PATH)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "id INTEGER PRIMARY KEY, stage TEXT, text TEXT, response_blob TEXT)"
+            )
+            self._load()
+
+        self.logger.info(
+            "Semantic cache inicializado",
+            backend=backend,
+            threshold=threshold,
+            entries=len(self),
+        )
+
+    def __len__(self) -> int:
+        """Number of cached entries across all stages."""
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _load(self) -> None:
+        """Load persisted entries from SQLite."""
+        rows = self._db.execute("SELECT stage, text, response_blob FROM cache ORDER BY id")
+        loaded_at = time.monotonic()
+        for stage, text, response_blob in rows:
+            self._entries.setdefault(stage, []).append(
+                (embed_text(text), json.loads(response_blob), loaded_at)
+            )
+
+    def get(self, stage: str, text: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result.
+
+        Args:
+            stage: Conversation stage the message was sent in
+            text: User message
+
+        Returns:
+            Cached result or None on a miss
+        """
+        entries = self._entries.get(stage)
+        if entries and self.ttl is not None:
+            cutoff = time.monotonic() - self.ttl
+            if entries[0][2] < cutoff:
+                # Entries are in insertion order, so expired ones form a prefix
+                entries = self._entries[stage] = [e for e in entries if e[2] >= cutoff]
+        if not entries:
+            return None
+
+        vector = embed_text(text)
+        best_score = 0.0
+        best_result: Optional[Dict[str, Any]] = None
+        for cached_vector, result, _ in entries:
+            score = cosine_similarity(vector, cached_vector)
+            if score > best_score:
+                best_score, best_result = score, result
+
+        if best_score >= self.threshold:
+            self.logger.debug("Semantic cache hit", stage=stage, score=round(best_score, 4))
+            return best_result
+        return None
+
+    def put(self, stage: str, text: str, result: Dict[str, Any]) -> None:
+        """Store a result in the cache.
+
+        Args:
+            stage: Conversation stage the message was sent in
+            text: User message
+            result: Result to return for similar messages
+        """
+        self._entries.setdefault(stage, []).append((embed_text(text), result, time.monotonic()))
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO cache (stage, text, response_blob) VALUES (?, ?, ?)",
+                    (stage, text, json.dumps(result, ensure_ascii=False, default=str)),
+                )
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
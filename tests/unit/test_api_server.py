@@ -0,0 +1,198 @@
+"""Unit tests for the FastAPI server."""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from src.api import server
+from fastapi import HTTPException
+
+from src.api.models import ChatMessage, ConversationHistory, HistoryMessage
+from src.models.conversation import Conversation, ConversationStage, MessageRole
+
+
+class FakeOrchestrator:
+    """Orchestrator stub that records messages and returns canned turns."""
+
+    def __init__(self, statuses: Optional[List[str]] = None) -> None:
+        self.messages: List[str] = []
+        self.statuses = statuses or []
+
+    async def process_message(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        self.messages.append(message)
+        status = self.statuses.pop(0) if self.statuses else "completed"
+        return {
+            "conversation_id": conversation_id or "nova",
+            "response": "Desculpe, tente novamente." if status == "failed" else "Olá!",
+            "agent_id": "researcher",
+            "stage": "faq",
+            "metadata": {"status": status},
+        }
+
+    async def stream_message(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        self.messages.append(message)
+        yield {"type": "delta", "data": "Olá"}
+        # Keep the stream open until the client goes away
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """HTTP client for the app, without running its lifespan."""
+    monkeypatch.setattr(server, "_recent_chats", type(server._recent_chats)())
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_chat_retry_after_failed_turn_runs_again(client, monkeypatch):
+    """Test a failed Swarm turn is not reused for a retry with the same key."""
+    fake = FakeOrchestrator(statuses=["failed", "completed"])
+    monkeypatch.setattr(server, "orchestrator", fake)
+    body = {"message": "Quais produtos vocês têm?", "conversation_id": "c1"}
+    headers = {"Idempotency-Key": "k1"}
+
+    first = await client.post("/chat", json=body, headers=headers)
+    second = await client.post("/chat", json=body, headers=headers)
+
+    assert first.json()["metadata"]["status"] == "failed"
+    assert second.json()["metadata"]["status"] == "completed"
+    assert len(fake.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_deduplicates_only_by_idempotency_key(client, monkeypatch):
+    """Test repeated keys share one execution while repeated text without a key does not."""
+    fake = FakeOrchestrator()
+    monkeypatch.setattr(server, "orchestrator", fake)
+    body = {"message": "sim", "conversation_id": "c1"}
+
+    responses = await asyncio.gather(
+        *(client.post("/chat", json=body, headers={"Idempotency-Key": "k1"}) for _ in range(3))
+    )
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert fake.messages == ["sim"]
+
+    await client.post("/chat", json=body)
+    await client.post("/chat", json=body)
+    assert fake.messages == ["sim", "sim", "sim"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_history_matches_response_model():
+    """Test the batched history encodes like ConversationHistory and stops at its snapshot."""
+    conversation = Conversation(id="c1", current_stage=ConversationStage.FAQ)
+    for i in range(250):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.AGENT
+        conversation.add_message(role=role, content=f"mensagem {i}", agent_id="researcher")
+    expected = ConversationHistory(
+        conversation_id=conversation.id,
+        messages=[
+            HistoryMessage(
+                role=m.role, content=m.content, timestamp=m.timestamp, agent_id=m.agent_id
+            )
+            for m in conversation.messages
+        ],
+        current_stage=conversation.current_stage,
+        lead_id=conversation.lead_id,
+    )
+
+    chunks = []
+    async for chunk in server._stream_history(conversation):
+        chunks.append(chunk)
+        # Messages appended mid-stream are left for the next request
+        conversation.add_message(role=MessageRole.USER, content="nova")
+
+    assert json.loads(b"".join(chunks)) == json.loads(expected.model_dump_json())
+
+
+async def _frames(*frames: bytes, delay: float = 0.0, closed: Optional[list] = None):
+    """Yield SSE frames, sleeping ``delay`` before each after the first, then block."""
+    try:
+        for i, frame in enumerate(frames):
+            if i and delay:
+                await asyncio.sleep(delay)
+            yield frame
+        if closed is not None:
+            await asyncio.Event().wait()
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_frames_merges_frames_within_window():
+    """Test frames produced together are sent as one chunk, in order."""
+    chunks = [chunk async for chunk in server._coalesce_frames(_frames(b"a", b"b", b"c"))]
+
+    assert chunks == [b"abc"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_frames_flushes_after_interval_and_size():
+    """Test a slow producer's frames are flushed separately, and large buffers at once."""
+    slow = _frames(b"a", b"b", delay=server._SSE_FLUSH_INTERVAL * 10)
+    assert [chunk async for chunk in server._coalesce_frames(slow)] == [b"a", b"b"]
+
+    big = b"x" * server._SSE_FLUSH_BYTES
+    assert [chunk async for chunk in server._coalesce_frames(_frames(big, b"y"))] == [big, b"y"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("first", [b"a", b"x" * 4096], ids=["pending-read", "full-buffer"])
+async def test_coalesce_frames_closes_source_on_disconnect(first):
+    """Test closing the stream early cancels the pending read and closes the source."""
+    closed: list = []
+    before = asyncio.all_tasks()
+    stream = server._coalesce_frames(_frames(first, closed=closed))
+
+    assert await stream.__anext__() == first
+    await stream.aclose()
+
+    assert closed == [True]
+    assert asyncio.all_tasks() == before
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_rejects_when_slots_are_full(monkeypatch):
+    """Test streams beyond the limit get 503 and a closed stream frees its slot."""
+    fake = FakeOrchestrator()
+    monkeypatch.setattr(server, "orchestrator", fake)
+    monkeypatch.setattr(server, "stream_slots", asyncio.Semaphore(2))
+
+    streams = []
+    for _ in range(2):
+        response = await server.chat_stream(ChatMessage(message="oi"))
+        body = response.body_iterator
+        assert b'"type":"delta"' in await body.__anext__()
+        streams.append(body)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await server.chat_stream(ChatMessage(message="oi"))
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+
+    await streams.pop().aclose()
+    assert not server.stream_slots.locked()
+
+    response = await server.chat_stream(ChatMessage(message="oi"))
+    body = response.body_iterator
+    assert b'"type":"delta"' in await body.__anext__()
+    assert server.stream_slots.locked()
+
+    for stream in (*streams, body):
+        await stream.aclose()
+    assert not server.stream_slots.locked()
+    assert len(fake.messages) == 3
@@ -0,0 +1,23 @@
+"""Unit tests for Conversation model."""
+
+from src.models.conversation import MessageRole
+from tests.fixtures.sample_data import create_sample_conversation
+
+
+def test_add_messages_appends_in_order():
+    """Test batched message append."""
+    conversation = create_sample_conversation()
+    initial_count = len(conversation.messages)
+    previous_update = conversation.updated_at
+
+    conversation.add_messages([
+        (MessageRole.USER, "Qual o preço?", None),
+        (MessageRole.AGENT, "Depende do faturamento.", "sales_agent"),
+    ])
+
+    assert len(conversation.messages) == initial_count + 2
+    user_msg, agent_msg = conversation.messages[-2:]
+    assert user_msg.content == "Qual o preço?"
+    assert user_msg.agent_id is None
+    assert agent_msg.agent_id == "sales_agent"
+    assert conversation.updated_at >= previous_update
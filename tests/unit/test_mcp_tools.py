@@ -0,0 +1,93 @@
+"""Unit tests for MCPTools."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.agents.mcp_tools import MCPTools
+from src.mcp_servers.base_mcp import MCPTransportError
+from src.models.agent_config import MCPTool
+
+
+def test_server_name_from_url():
+    """Test server names are resolved from the URL port."""
+    mcp_tools = MCPTools([])
+
+    assert mcp_tools._get_server_name_from_url("http://localhost:8001") == "mock_crm"
+    assert mcp_tools._get_server_name_from_url("http://127.0.0.1:8010/") == "mock_qualification"
+    assert mcp_tools._get_server_name_from_url("http://localhost:9999") == "unknown"
+    assert mcp_tools._get_server_name_from_url("http://localhost") == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_call_tool_matches_name_case_insensitively():
+    """Test tool lookup ignores case and suggests similar tools on a miss."""
+    server = AsyncMock()
+    server.call.return_value = {"success": True}
+    mcp_tools = MCPTools(
+        [MCPTool(name="get_client", mcp_url="http://localhost:8001", description="CRM")],
+        servers={"mock_crm": server},
+    )
+
+    assert await mcp_tools.call_tool("GET_CLIENT", {"cnpj": "1"}) == {"success": True}
+    server.call.assert_awaited_once_with("get_client", {"cnpj": "1"})
+
+    with pytest.raises(ValueError, match="similares disponíveis: get_client"):
+        await mcp_tools.call_tool("Client")
+
+
+@pytest.mark.asyncio
+async def test_call_tool_falls_back_to_http_only_on_transport_errors():
+    """Test tool errors from a direct server call are not retried over HTTP."""
+    server = AsyncMock()
+    mcp_tools = MCPTools(
+        [MCPTool(name="get_client", mcp_url="http://localhost:8001", description="CRM")],
+        servers={"mock_crm": server},
+    )
+    mcp_tools._client = AsyncMock()
+    mcp_tools._client.is_closed = False
+
+    server.call.side_effect = ValueError("Parâmetros obrigatórios faltando")
+    with pytest.raises(ValueError):
+        await mcp_tools.call_tool("get_client")
+    mcp_tools._client.post.assert_not_awaited()
+
+    server.call.side_effect = MCPTransportError("connection refused")
+    response = mcp_tools._client.post.return_value
+    response.raise_for_status = lambda: None
+    response.content = b'{"success": true}'
+    assert await mcp_tools.call_tool("get_client") == {"success": True}
+    mcp_tools._client.post.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_call_tool_suggests_close_spellings():
+    """Test misspelled tool names get close matches in the error message."""
+    mcp_tools = MCPTools(
+        [MCPTool(name="buscar_cliente_ifood", mcp_url="http://localhost:8005", description="")]
+    )
+
+    with pytest.raises(ValueError, match="similares disponíveis: buscar_cliente_ifood"):
+        await mcp_tools.call_tool("buscar_clientes_ifod")
+
+
+@pytest.mark.asyncio
+async def test_fetch_client_bundle_keeps_partial_results():
+    """Test both client lookups run and a failing one does not discard the other."""
+    restaurant_server = AsyncMock()
+    restaurant_server.call.return_value = {"success": True, "nome": "Cantina"}
+    ifood_server = AsyncMock()
+    ifood_server.call.side_effect = ValueError("Cliente não encontrado")
+    mcp_tools = MCPTools(
+        [
+            MCPTool(name="obter_info_restaurante", mcp_url="http://localhost:8006", description=""),
+            MCPTool(name="buscar_cliente_ifood", mcp_url="http://localhost:8005", description=""),
+        ],
+        servers={"mock_restaurant": restaurant_server, "mock_ifood": ifood_server},
+    )
+
+    bundle = await mcp_tools.fetch_client_bundle("123")
+
+    assert bundle["info"] == {"success": True, "nome": "Cantina"}
+    assert bundle["ifood"] == {"success": False, "error": "Cliente não encontrado"}
+    ifood_server.call.assert_awaited_once_with("buscar_cliente_ifood", {"cnpj": "123"})
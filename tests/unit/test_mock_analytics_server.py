@@ -0,0 +1,223 @@
+"""Unit tests for MockAnalyticsServer."""
+
+import copy
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from src.mcp_servers.mock_analytics_server import MockAnalyticsServer
+from src.models.sales_pipeline import PipelineStage
+
+_STAGES = [stage.value for stage in PipelineStage]
+_BASE_TIME = datetime(2024, 1, 1)
+
+
+def _timestamp(hours: float) -> str:
+    return (_BASE_TIME + timedelta(hours=hours)).isoformat()
+
+
+def _expected_counts(
+    server: MockAnalyticsServer,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Counter:
+    """Count stored events per (stage, event_type) by scanning every one."""
+    return Counter(
+        (stage, event_type)
+        for timestamp, stage, event_type in zip(
+            server._timestamps, server._stages, server._event_types
+        )
+        if (not start_date or timestamp >= start_date) and (not end_date or timestamp <= end_date)
+    )
+
+
+def _total(counts: Counter, event_type: str, stage: Optional[str] = None) -> int:
+    """Sum counts of one event type, over one stage or all of them."""
+    return sum(
+        n for (s, kind), n in counts.items() if kind == event_type and stage in (None, s)
+    )
+
+
+@pytest.fixture
+def server():
+    """Analytics server holding entries and exits at known hours after _BASE_TIME."""
+    server = MockAnalyticsServer(simulate_latency=False)
+    rng = random.Random(42)
+    for i in range(300):
+        server._add_event(
+            {
+                "id": f"test_{i:03d}",
+                "event_type": rng.choice(["stage_entry", "stage_exit"]),
+                "stage": rng.choice(_STAGES),
+                "lead_id": None,
+                # Out of order, with repeated timestamps
+                "timestamp": _timestamp(rng.randrange(100)),
+                "metadata": {},
+            }
+        )
+    return server
+
+
+@pytest.mark.asyncio
+async def test_conversion_metrics_filter_by_date_range(server):
+    """Test date ranges include both ends and match a full scan of the events."""
+    rng = random.Random(7)
+    ranges = [(None, None), (_timestamp(10), None), (None, _timestamp(10))]
+    ranges += [(_timestamp(10), _timestamp(10)), (_timestamp(200), _timestamp(300))]
+    for _ in range(50):
+        lo, hi = sorted(rng.randrange(-10, 110) for _ in range(2))
+        ranges.append((_timestamp(lo), _timestamp(hi)))
+
+    for start_date, end_date in ranges:
+        counts = _expected_counts(server, start_date, end_date)
+        for stage in [None, *_STAGES]:
+            result = await server.call(
+                "get_conversion_metrics",
+                {"stage": stage, "start_date": start_date, "end_date": end_date},
+            )
+            entries = _total(counts, "stage_entry", stage)
+            exits = _total(counts, "stage_exit", stage)
+            assert (result["total_entries"], result["total_exits"]) == (entries, exits)
+            assert result["conversion_rate"] == (round(exits / entries, 4) if entries else 0.0)
+
+
+@pytest.mark.asyncio
+async def test_funnel_analytics_counts_every_stage(server):
+    """Test the funnel has one entry per stage, consistent with the overall totals."""
+    start_date, end_date = _timestamp(20), _timestamp(60)
+    counts = _expected_counts(server, start_date, end_date)
+
+    result = await server.call(
+        "get_funnel_analytics", {"start_date": start_date, "end_date": end_date}
+    )
+
+    assert list(result["funnel"]) == _STAGES
+    for stage, data in result["funnel"].items():
+        assert data["entries"] == counts[(stage, "stage_entry")]
+        assert data["exits"] == counts[(stage, "stage_exit")]
+    assert result["overall"]["total_entries"] == sum(
+        data["entries"] for data in result["funnel"].values()
+    )
+    assert result["period"] == {"start": start_date, "end": end_date}
+
+
+def test_events_stay_sorted_with_aligned_columns():
+    """Test out-of-order events are stored by timestamp, each row holding one event."""
+    server = MockAnalyticsServer(simulate_latency=False)
+    events = [
+        {
+            "id": f"test_{i}",
+            "event_type": "stage_exit",
+            "stage": _STAGES[i % len(_STAGES)],
+            "lead_id": f"lead_{i}",
+            "timestamp": _timestamp(hours),
+            "metadata": {"order": i},
+        }
+        for i, hours in enumerate([5, 1, 3, 1, 4])
+    ]
+    for event in events:
+        server._add_event(event)
+
+    assert server._timestamps == sorted(server._timestamps)
+    rows = zip(
+        server._event_ids,
+        server._timestamps,
+        server._stages,
+        server._event_types,
+        server._lead_ids,
+        server._metadata,
+    )
+    stored = {
+        event_id: (timestamp, stage, event_type, lead_id, metadata)
+        for event_id, timestamp, stage, event_type, lead_id, metadata in rows
+    }
+    for event in events:
+        assert stored[event["id"]] == (
+            event["timestamp"],
+            event["stage"],
+            event["event_type"],
+            event["lead_id"],
+            event["metadata"],
+        )
+    # Events with equal timestamps keep their insertion order
+    assert server._event_ids.index("test_1") < server._event_ids.index("test_3")
+
+
+@pytest.mark.asyncio
+async def test_track_event_is_counted():
+    """Test tracked events are stored and show up in later metrics."""
+    server = MockAnalyticsServer(simulate_latency=False)
+    before = await server.call("get_conversion_metrics", {"stage": _STAGES[0]})
+
+    result = await server.call("track_event", {"event_type": "stage_exit", "stage": _STAGES[0]})
+
+    assert result["success"] is True
+    index = server._event_ids.index(result["event_id"])
+    assert server._timestamps[index] == result["timestamp"]
+    assert server._metadata[index] == {}
+    after = await server.call("get_conversion_metrics", {"stage": _STAGES[0]})
+    assert after["total_exits"] == before["total_exits"] + 1
+    assert after["total_entries"] == before["total_entries"]
+
+
+@pytest.mark.asyncio
+async def test_mutating_metrics_responses_does_not_alter_later_ones():
+    """Test callers get their own copy of memoized responses, nested dicts included."""
+    server = MockAnalyticsServer(simulate_latency=False)
+    for tool, parameters in [
+        ("get_conversion_metrics", {"stage": _STAGES[0]}),
+        ("get_funnel_analytics", {}),
+    ]:
+        # The first call computes the response, later ones are cache hits
+        miss = await server.call(tool, parameters)
+        expected = copy.deepcopy(miss)
+        hit = await server.call(tool, parameters)
+
+        for response in (miss, hit):
+            response["success"] = False
+            response["period"]["start"] = "mutated"
+            if "funnel" in response:
+                response["funnel"][_STAGES[0]]["entries"] = -1
+
+        assert await server.call(tool, parameters) == expected
+
+
+@pytest.mark.asyncio
+async def test_metrics_cache_is_cleared_by_new_events_and_bounded(monkeypatch):
+    """Test memoized metrics are dropped on new events and evicted least recently used first."""
+    monkeypatch.setattr("src.mcp_servers.mock_analytics_server._METRICS_CACHE_SIZE", 2)
+    server = MockAnalyticsServer(simulate_latency=False)
+
+    await server.call("get_funnel_analytics", {})
+    assert len(server._metrics_cache) == 1
+    await server.call("track_event", {"event_type": "stage_entry", "stage": _STAGES[0]})
+    assert not server._metrics_cache
+
+    for stage in _STAGES[:2]:
+        await server.call("get_conversion_metrics", {"stage": stage})
+    # A hit makes the first stage the most recently used
+    await server.call("get_conversion_metrics", {"stage": _STAGES[0]})
+    await server.call("get_conversion_metrics", {"stage": _STAGES[2]})
+
+    assert [key[1] for key in server._metrics_cache] == [_STAGES[0], _STAGES[2]]
+
+
+@pytest.mark.parametrize(
+    "start_hours, end_hours",
+    [(40, 45), (-1000, 95), (5, 1000), (0, 99)],
+    ids=["narrow", "wide-from-start", "wide-to-end", "wide-both"],
+)
+def test_count_events_narrow_and_wide_ranges(server, start_hours, end_hours):
+    """Test ranges tallied directly and from their complement both match a full scan."""
+    start_date, end_date = _timestamp(start_hours), _timestamp(end_hours)
+    total = server._counts.copy()
+
+    counts = server._count_events(start_date, end_date)
+
+    assert +counts == _expected_counts(server, start_date, end_date)
+    assert min(counts.values()) >= 0
+    # The complement path works on a copy of the overall counts
+    assert server._counts == total == _expected_counts(server)
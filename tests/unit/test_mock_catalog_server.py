@@ -0,0 +1,61 @@
+"""Unit tests for MockCatalogServer."""
+
+import pytest
+
+from src.mcp_servers.mock_catalog_server import MockCatalogServer
+
+
+@pytest.fixture
+def server():
+    """Catalog server without simulated latency."""
+    return MockCatalogServer(simulate_latency=False)
+
+
+@pytest.mark.asyncio
+async def test_declared_tool_without_handler_is_unknown(server):
+    """Test retorna_preco is listed but calling it raises like an unknown tool."""
+    assert "retorna_preco" in {tool["name"] for tool in server._build_tools()}
+
+    with pytest.raises(ValueError, match="Unknown tool: retorna_preco"):
+        await server.call("retorna_preco", {"product_id": "maquinona_001"})
+    with pytest.raises(ValueError, match="Tools similares: get_products, search_products"):
+        await server.call("products")
+
+
+@pytest.mark.asyncio
+async def test_product_lookups_return_fresh_copies(server):
+    """Test mutating any catalog response never changes later responses."""
+    product_id = server._products[0]["id"]
+    calls = [
+        ("get_products", {}),
+        ("get_products", {"category": server._products[0]["category"]}),
+        ("get_product_details", {"product_id": product_id}),
+        ("search_products", {"query": "maquinona"}),
+    ]
+    expected = [await server.call(tool, parameters) for tool, parameters in calls]
+
+    for tool, parameters in calls:
+        response = await server.call(tool, parameters)
+        for product in response.get("products") or [response.get("product")]:
+            product["name"] = "mutated"
+            product.clear()
+        response.clear()
+
+    assert [await server.call(tool, parameters) for tool, parameters in calls] == expected
+    assert expected[2]["product"]["id"] == product_id
+
+
+@pytest.mark.asyncio
+async def test_product_filters_and_limits(server):
+    """Test get_products filters in one pass and stops at the limit."""
+    category = server._products[0]["category"]
+
+    filtered = await server.call("get_products", {"category": category})
+    limited = await server.call("get_products", {"limit": 1})
+    missing = await server.call("get_product_details", {"product_id": "inexistente"})
+
+    assert filtered["products"]
+    assert all(p["category"] == category for p in filtered["products"])
+    assert [p["id"] for p in limited["products"]] == [server._products[0]["id"]]
+    assert (await server.call("get_products", {"limit": -1}))["count"] == 0
+    assert missing == {"error": "Product not found", "product_id": "inexistente"}
@@ -0,0 +1,130 @@
+"""Unit tests for MockContractServer."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.mcp_servers.mock_contract_server import MockContractServer
+
+CNPJ = "12345678000190"
+
+
+@pytest.fixture
+def server():
+    """Contract server without simulated latency."""
+    return MockContractServer(simulate_latency=False)
+
+
+@pytest.mark.asyncio
+async def test_historico_lists_active_contracts_and_products(server):
+    """Test the history reports active contracts and each contracted product once."""
+    server._contracts[CNPJ].append(
+        {
+            "id": "contrato_900",
+            "cnpj": CNPJ,
+            "produto_id": "ifood_delivery",
+            "status": "cancelado",
+        }
+    )
+    server._index_contracts()
+
+    result = await server.call("buscar_historico_contratos", {"cnpj": CNPJ})
+
+    assert result["total_contratos"] == 3
+    assert [c["id"] for c in result["contratos_ativos"]] == ["contrato_001", "contrato_002"]
+    assert result["produtos_contratados"] == ["ifood_delivery", "ifood_pago"]
+
+    unknown = await server.call("buscar_historico_contratos", {"cnpj": "00000000000000"})
+    assert (unknown["contratos"], unknown["contratos_ativos"]) == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_mutating_historico_does_not_alter_contracts(server):
+    """Test responses hold copies, so callers cannot change the stored contracts or index."""
+    result = await server.call("buscar_historico_contratos", {"cnpj": CNPJ})
+
+    result["contratos"][0]["status"] = "cancelado"
+    result["contratos"].clear()
+    result["contratos_ativos"][1]["produto_id"] = "maquinona"
+    result["contratos_ativos"].clear()
+
+    again = await server.call("buscar_historico_contratos", {"cnpj": CNPJ})
+    assert [c["status"] for c in again["contratos"]] == ["ativo", "ativo"]
+    assert [c["id"] for c in again["contratos_ativos"]] == ["contrato_001", "contrato_002"]
+    assert again["produtos_contratados"] == ["ifood_delivery", "ifood_pago"]
+    renovacoes = await server.call("verificar_renovacoes_pendentes", {"cnpj": CNPJ})
+    assert renovacoes["total_oportunidades"] == 1
+
+
+@pytest.mark.asyncio
+async def test_renovacoes_use_active_contracts_index(server):
+    """Test only active contracts ending within 90 days are pending renewal."""
+    now = datetime.utcnow()
+    server._contracts[CNPJ] = [
+        {
+            "id": "contrato_curto",
+            "cnpj": CNPJ,
+            "produto_id": "maquinona",
+            "status": "ativo",
+            "data_fim": (now + timedelta(days=30, hours=1)).isoformat(),
+        },
+        {
+            "id": "contrato_longo",
+            "cnpj": CNPJ,
+            "produto_id": "ifood_pago",
+            "status": "ativo",
+            "data_fim": (now + timedelta(days=200)).isoformat(),
+        },
+        {
+            "id": "contrato_cancelado",
+            "cnpj": CNPJ,
+            "produto_id": "ifood_delivery",
+            "status": "cancelado",
+            "data_fim": (now + timedelta(days=10)).isoformat(),
+        },
+        {"id": "contrato_sem_fim", "cnpj": CNPJ, "produto_id": "x", "status": "ativo"},
+    ]
+    server._index_contracts()
+
+    result = await server.call("verificar_renovacoes_pendentes", {"cnpj": CNPJ})
+
+    assert [r["id"] for r in result["renovacoes_pendentes"]] == ["contrato_curto"]
+    assert result["renovacoes_pendentes"][0]["dias_restantes"] == 30
+    # Maquinona is already contracted, so there is nothing to upsell
+    assert result["oportunidades_upsell"] == []
+
+
+@pytest.mark.asyncio
+async def test_contracts_without_product_or_with_tz_aware_end_dates(server):
+    """Test contracts without produto_id are not products and tz-aware ends are read as UTC."""
+    now = datetime.utcnow()
+    server._contracts[CNPJ] = [
+        {"id": "contrato_sem_produto", "cnpj": CNPJ, "produto_id": None, "status": "ativo"},
+        {
+            "id": "contrato_tz",
+            "cnpj": CNPJ,
+            "produto_id": "maquinona",
+            "status": "ativo",
+            # 10 days and 2 hours from now, written in UTC-03:00
+            "data_fim": (now + timedelta(days=10, hours=-1)).isoformat() + "-03:00",
+        },
+        {
+            "id": "contrato_z",
+            "cnpj": CNPJ,
+            "produto_id": "ifood_pago",
+            "status": "ativo",
+            "data_fim": (now + timedelta(days=20, hours=2)).isoformat() + "Z",
+        },
+    ]
+    server._index_contracts()
+
+    historico = await server.call("buscar_historico_contratos", {"cnpj": CNPJ})
+    renovacoes = await server.call("verificar_renovacoes_pendentes", {"cnpj": CNPJ})
+
+    assert historico["produtos_contratados"] == ["maquinona", "ifood_pago"]
+    assert len(historico["contratos_ativos"]) == 3
+    assert server._data_fim_by_id["contrato_tz"].tzinfo is None
+    assert [(r["id"], r["dias_restantes"]) for r in renovacoes["renovacoes_pendentes"]] == [
+        ("contrato_tz", 10),
+        ("contrato_z", 20),
+    ]
@@ -0,0 +1,54 @@
+"""Unit tests for SemanticCache."""
+
+import pytest
+
+from src.utils.semantic_cache import SemanticCache, cosine_similarity, embed_text
+
+
+def test_embed_text_ignores_case_and_accents():
+    """Test that embeddings are normalized."""
+    assert embed_text("Qual o PREÇO?") == embed_text("qual o preco")
+
+
+def test_cosine_similarity_bounds():
+    """Test cosine similarity of identical and disjoint texts."""
+    vector = embed_text("quais produtos vocês têm")
+    assert cosine_similarity(vector, vector) == pytest.approx(1.0)
+    assert cosine_similarity(vector, embed_text("desconto")) == 0.0
+
+
+def test_cache_hit_and_miss():
+    """Test lookups respect stage and threshold."""
+    cache = SemanticCache(threshold=0.95)
+    result = {"response": "Temos a Maquinona"}
+    cache.put("faq", "Quais produtos vocês têm?", result)
+
+    assert cache.get("faq", "quais produtos voces tem") == result
+    assert cache.get("qualification", "Quais produtos vocês têm?") is None
+    assert cache.get("faq", "Qual o preço da Maquinona?") is None
+
+
+def test_sqlite_backend_persists(tmp_path):
+    """Test entries survive across cache instances."""
+    path = tmp_path / "cache.db"
+    cache = SemanticCache(backend="sqlite", path=path)
+    cache.put("faq", "Olá", {"response": "Oi!"})
+    cache.close()
+
+    reloaded = SemanticCache(backend="sqlite", path=path)
+    assert reloaded.get("faq", "olá") == {"response": "Oi!"}
+    assert len(reloaded) == 1
+    reloaded.close()
+
+
+def test_expired_entries_are_evicted(monkeypatch):
+    """Test entries older than the TTL are no longer returned."""
+    now = [1000.0]
+    monkeypatch.setattr("src.utils.semantic_cache.time.monotonic", lambda: now[0])
+    cache = SemanticCache(ttl=60)
+    cache.put("faq", "Oi", {"response": "Olá!"})
+
+    assert cache.get("faq", "oi") == {"response": "Olá!"}
+    now[0] += 61
+    assert cache.get("faq", "oi") is None
+    assert len(cache) == 0
@@ -0,0 +1,407 @@
+"""Unit tests for SwarmSalesAgent helpers."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+from unittest.mock import MagicMock
+
+import httpx
+import openai
+import pytest
+from strands.agent import AgentResult
+from strands.multiagent import Status
+
+from src.agents import swarm_sales_agent
+from src.agents.swarm_sales_agent import (
+    SwarmSalesAgent,
+    _IDENTIFIER_RE,
+    _called_tools,
+    _extract_text,
+)
+
+
+def _transient_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+
+def _swarm_result(text: str = "Olá!") -> SimpleNamespace:
+    """Completed single-node Swarm result replying with ``text``."""
+    node_result = SimpleNamespace(status=Status.COMPLETED, result=text)
+    return SimpleNamespace(
+        status=Status.COMPLETED,
+        node_history=[SimpleNamespace(node_id="sales_agent")],
+        results={"sales_agent": node_result},
+    )
+
+
+class FakeSwarm:
+    """Swarm stub driven by ``(delay, outcome)`` steps.
+
+    ``invoke_async()`` runs one step per call: after ``delay`` seconds the
+    outcome is raised if it is an exception and returned otherwise.
+    ``stream_async()`` yields every step's outcome as an event, in order.
+    """
+
+    def __init__(self, *steps: Tuple[float, Any]) -> None:
+        self.steps = list(steps)
+        self.calls = 0
+
+    async def stream_async(self, task: str):
+        self.calls += 1
+        for delay, event in self.steps:
+            await asyncio.sleep(delay)
+            yield event
+
+    async def invoke_async(self, task: str) -> Any:
+        self.calls += 1
+        delay, outcome = self.steps.pop(0)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _agent(swarm: Any, timeout: float = 5.0) -> SwarmSalesAgent:
+    """SwarmSalesAgent around a fake swarm, without building agents or clients."""
+    agent = SwarmSalesAgent.__new__(SwarmSalesAgent)
+    agent.settings = SimpleNamespace(swarm_execution_timeout=timeout)
+    agent.swarm = swarm
+    agent._swarm_lock = asyncio.Lock()
+    agent._semantic_cache = None
+    return agent
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Retry without waiting between attempts."""
+    monkeypatch.setattr(swarm_sales_agent, "_RETRY_INITIAL_DELAY", 0.0)
+
+
+def test_extract_text_from_agent_result():
+    """Test reply text is read from the agent's final message."""
+    agent_result = AgentResult(
+        stop_reason="end_turn",
+        message={"role": "assistant", "content": [{"text": "Olá, tudo bem?"}]},
+        metrics=MagicMock(),
+        state={},
+    )
+
+    assert _extract_text(agent_result) == "Olá, tudo bem?"
+    assert _extract_text("Resposta direta") == "Resposta direta"
+    assert _extract_text(RuntimeError("falhou")) == ""
+
+
+def test_customer_identifiers_are_not_cacheable():
+    """Test messages with CNPJs, phones or e-mails are kept out of the cache."""
+    assert _IDENTIFIER_RE.search("Meu CNPJ é 12345678000190, quais contratos tenho?")
+    assert _IDENTIFIER_RE.search("Pode me ligar no (11) 91234-5678")
+    assert _IDENTIFIER_RE.search("Meu e-mail é joao.silva@restaurante.com.br")
+    assert not _IDENTIFIER_RE.search("Quais produtos vocês têm?")
+
+
+def test_called_tools_reads_node_tool_metrics():
+    """Test a Swarm result counts as having called tools if any node did."""
+    def node(tool_metrics):
+        metrics = SimpleNamespace(tool_metrics=tool_metrics)
+        return SimpleNamespace(result=SimpleNamespace(metrics=metrics))
+
+    def swarm_result(**nodes):
+        return SimpleNamespace(results=nodes)
+
+    assert not _called_tools(swarm_result(faq_agent=node({})))
+    assert _called_tools(
+        swarm_result(faq_agent=node({}), sales_agent=node({"buscar_dados_cliente": 1}))
+    )
+    assert not _called_tools(swarm_result(faq_agent=SimpleNamespace(result=RuntimeError())))
+
+
+@pytest.mark.asyncio
+async def test_process_retries_transient_error(no_backoff):
+    """Test a turn that hits a transient connection error is run again."""
+    swarm = FakeSwarm((0, _transient_error()), (0, _swarm_result("Olá de novo!")))
+
+    response = await _agent(swarm).process("oi")
+
+    assert swarm.calls == 2
+    assert response["status"] == "completed"
+    assert response["response"] == "Olá de novo!"
+
+
+@pytest.mark.asyncio
+async def test_process_gives_up_after_retry_attempts(no_backoff):
+    """Test persistent transient errors fail the turn after the last attempt."""
+    swarm = FakeSwarm(
+        *((0, _transient_error()) for _ in range(swarm_sales_agent._RETRY_ATTEMPTS))
+    )
+
+    response = await _agent(swarm).process("oi")
+
+    assert swarm.calls == swarm_sales_agent._RETRY_ATTEMPTS
+    assert response["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_process_timeout_applies_per_attempt(no_backoff):
+    """Test a slow failed attempt does not use up the retry's time budget."""
+    swarm = FakeSwarm((0.06, _transient_error()), (0.06, _swarm_result()))
+
+    response = await _agent(swarm, timeout=0.1).process("oi")
+
+    assert swarm.calls == 2
+    assert response["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_process_times_out_stuck_attempt():
+    """Test an attempt running past the timeout fails the turn without a retry."""
+    swarm = FakeSwarm((1.0, _swarm_result()), (0, _swarm_result()))
+
+    response = await _agent(swarm, timeout=0.05).process("oi")
+
+    assert swarm.calls == 1
+    assert response["status"] == "failed"
+    assert "Timeout" in response["error"]
+
+
+def _text(node_id: str, text: str) -> dict:
+    return {"type": "multiagent_node_stream", "node_id": node_id, "event": {"data": text}}
+
+
+def _node_start(node_id: str) -> dict:
+    return {"type": "multiagent_node_start", "node_id": node_id}
+
+
+@pytest.mark.asyncio
+async def test_stream_merges_text_chunks_in_order():
+    """Test text chunks are merged per agent and control events keep their order."""
+    raw_chunk = {"type": "multiagent_node_stream", "node_id": "sales_agent", "event": {"event": {}}}
+    swarm = FakeSwarm(
+        (0, _node_start("sales_agent")),
+        (0, _text("sales_agent", "Ol")),
+        (0, raw_chunk),
+        (0, _text("sales_agent", "á!")),
+        (0, {"type": "multiagent_handoff", "to_node_ids": ["researcher"]}),
+        (0, _text("researcher", "Um ")),
+        (0, _text("researcher", "momento.")),
+        (0, {"type": "multiagent_result", "result": _swarm_result("Um momento.")}),
+    )
+
+    events = [event async for event in _agent(swarm).stream("oi")]
+
+    assert events[:4] == [
+        _node_start("sales_agent"),
+        _text("sales_agent", "Olá!"),
+        {"type": "multiagent_handoff", "to_node_ids": ["researcher"]},
+        _text("researcher", "Um momento."),
+    ]
+    assert events[4]["type"] == "result"
+    assert events[4]["response"] == "Um momento."
+    assert len(events) == 5
+
+
+@pytest.mark.asyncio
+async def test_stream_flushes_text_after_coalescing_window():
+    """Test chunks further apart than the coalescing window are sent separately."""
+    gap = swarm_sales_agent._STREAM_COALESCE_NS / 1e9 * 3
+    swarm = FakeSwarm((0, _text("sales_agent", "Olá")), (gap, _text("sales_agent", "!")))
+
+    events = [event async for event in _agent(swarm).stream("oi")]
+
+    assert events == [_text("sales_agent", "Olá"), _text("sales_agent", "!")]
+
+
+@pytest.mark.asyncio
+async def test_stream_bounds_events_read_ahead():
+    """Test a slow consumer holds back the Swarm at the queue bound."""
+    produced = []
+
+    class CountingSwarm:
+        async def stream_async(self, task):
+            for i in range(swarm_sales_agent._STREAM_QUEUE_SIZE * 4):
+                produced.append(i)
+                yield _node_start(f"node_{i}")
+
+    stream = _agent(CountingSwarm()).stream("oi")
+    assert await stream.__anext__() == _node_start("node_0")
+    await asyncio.sleep(0.01)
+
+    assert len(produced) <= swarm_sales_agent._STREAM_QUEUE_SIZE + 2
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_early_close_leaves_no_pending_tasks():
+    """Test closing the stream early cancels the Swarm and leaves no tasks behind."""
+    closed = []
+
+    class BlockingSwarm:
+        async def stream_async(self, task):
+            try:
+                yield _node_start("sales_agent")
+                await asyncio.Event().wait()
+            finally:
+                closed.append(True)
+
+    before = asyncio.all_tasks()
+    stream = _agent(BlockingSwarm()).stream("oi")
+
+    assert await stream.__anext__() == _node_start("sales_agent")
+    await stream.aclose()
+
+    assert closed == [True]
+    assert asyncio.all_tasks() == before
+
+
+class FakeBatchClient:
+    """OpenAI client stub for the files and batches endpoints used by process_batch()."""
+
+    def __init__(self, outputs: List[dict], errors: List[dict]) -> None:
+        self.requests: List[dict] = []
+        self._contents = {
+            "output": "\n".join(json.dumps(r) for r in outputs),
+            "error": "\n".join(json.dumps(r) for r in errors),
+        }
+        self._statuses = ["in_progress", "completed"]
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._batch, retrieve=self._batch)
+
+    async def _create_file(self, file, purpose):
+        self.requests = [json.loads(line) for line in file[1].decode("utf-8").splitlines()]
+        return SimpleNamespace(id="input")
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text=self._contents[file_id])
+
+    async def _batch(self, *args, **kwargs):
+        return SimpleNamespace(
+            id="batch_1",
+            status=self._statuses.pop(0),
+            request_counts=None,
+            output_file_id="output",
+            error_file_id="error",
+        )
+
+
+def _batch_output(custom_id: str, text: str) -> dict:
+    body = {"choices": [{"message": {"content": text}}]}
+    return {"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None}
+
+
+@pytest.mark.asyncio
+async def test_process_batch_results_align_with_inputs():
+    """Test each result matches its input item, whether it succeeded, failed or is missing."""
+    items = [
+        ("11111111000111", "Quais produtos vocês têm?"),
+        ("22222222000122", "Quero contratar"),
+        ("11111111000111", "Quais produtos vocês têm?"),
+        ("33333333000133", "Qual o prazo?"),
+    ]
+    client = FakeBatchClient(
+        # Output records come back in any order
+        outputs=[
+            _batch_output("11111111000111:2", "Resposta 2"),
+            _batch_output("11111111000111:0", "Resposta 0"),
+        ],
+        errors=[
+            {
+                "custom_id": "22222222000122:1",
+                "response": {"status_code": 429, "body": {"error": "rate limit"}},
+                "error": None,
+            },
+        ],
+    )
+    agent = _agent(None)
+    agent.settings = SimpleNamespace(model_name="gpt-4o-mini", max_tokens=100, temperature=0.0)
+    agent.openai_client = client
+
+    results = await agent.process_batch(items, poll_interval=0)
+
+    assert [(r["cnpj"], r["message"]) for r in results] == items
+    assert [r["status"] for r in results] == ["completed", "failed", "completed", "failed"]
+    assert results[0]["response"] == "Resposta 0"
+    assert results[2]["response"] == "Resposta 2"
+    assert "rate limit" in results[1]["error"]
+    assert results[3]["error"] == "Sem resultado (batch completed)"
+    # Each request carries the system prompt built for its own CNPJ
+    assert [r["custom_id"] for r in client.requests] == [
+        f"{cnpj}:{index}" for index, (cnpj, _) in enumerate(items)
+    ]
+    assert "22222222000122" in client.requests[1]["body"]["messages"][0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_shared_swarm_runs_one_turn_at_a_time():
+    """Test concurrent turns on one instance never overlap on its Swarm."""
+    running = []
+    overlaps = []
+
+    class ExclusiveSwarm:
+        async def invoke_async(self, task):
+            overlaps.append(bool(running))
+            running.append(task)
+            await asyncio.sleep(0.01)
+            running.remove(task)
+            return _swarm_result(task)
+
+        async def stream_async(self, task):
+            yield {"type": "multiagent_result", "result": await self.invoke_async(task)}
+
+    agent = _agent(ExclusiveSwarm())
+
+    async def streamed(message):
+        return [event async for event in agent.stream(message)][-1]
+
+    responses = await asyncio.gather(
+        agent.process("a"), streamed("b"), agent.process("c"), streamed("d")
+    )
+
+    assert [r["response"] for r in responses] == ["a", "b", "c", "d"]
+    assert overlaps == [False] * 4
+
+
+@pytest.fixture
+def shared_instances(monkeypatch):
+    """Empty instance registry, with construction and closing replaced by stubs."""
+    closed: List[SwarmSalesAgent] = []
+
+    def init(self, settings, default_cnpj=None):
+        self.settings = settings
+        self.default_cnpj = default_cnpj
+
+    async def aclose(self):
+        closed.append(self)
+
+    monkeypatch.setattr(SwarmSalesAgent, "_instances", {})
+    monkeypatch.setattr(SwarmSalesAgent, "_refcounts", {})
+    monkeypatch.setattr(SwarmSalesAgent, "__init__", init)
+    monkeypatch.setattr(SwarmSalesAgent, "aclose", aclose)
+    return closed
+
+
+@pytest.mark.asyncio
+async def test_shared_instance_closes_on_last_release(shared_instances):
+    """Test callers share one instance, closed only when the last one releases it."""
+    settings = SimpleNamespace(model_name="gpt-4o-mini", default_client_cnpj="12345678000190")
+
+    first = SwarmSalesAgent.get_or_create(settings)
+    second = SwarmSalesAgent.get_or_create(settings)
+    other_cnpj = SwarmSalesAgent.get_or_create(settings, default_cnpj="98765432000110")
+    assert first is second
+    assert other_cnpj is not first
+
+    await first.release()
+    assert shared_instances == []
+
+    await second.release()
+    assert shared_instances == [first]
+    assert SwarmSalesAgent._refcounts == {("gpt-4o-mini", "98765432000110"): 1}
+
+    # A closed instance is never handed out again
+    recreated = SwarmSalesAgent.get_or_create(settings)
+    assert recreated is not first
+    await recreated.release()
+    await other_cnpj.release()
+    assert shared_instances == [first, recreated, other_cnpj]
+    assert SwarmSalesAgent._instances == {}
+    assert SwarmSalesAgent._refcounts == {}